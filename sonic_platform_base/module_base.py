@@ -674,7 +674,8 @@ class ModuleBase(device_base.DeviceBase):
                         sys.stderr.write("Transition already in progress for module: {}\n".format(module_name))
                         return False
             except Exception as e:
-                sys.stderr.write("Error setting transition flag for module {}: {}\n".format(module_name, str(e)))
+                sys.stderr.write("Error setting transition flag for module {}: {} ({})\n".format(
+                    module_name, str(e), type(e).__name__))
                 return False
 
     def _clear_transition_fields(self, module_name):
@@ -691,7 +692,8 @@ class ModuleBase(device_base.DeviceBase):
             state_db.hdel(module_key, "transition_start_time")
             return True
         except Exception as e:
-            sys.stderr.write("Error clearing transition flag for module {}: {}\n".format(module_name, str(e)))
+            sys.stderr.write("Error clearing transition flag for module {}: {} ({})\n".format(
+                module_name, str(e), type(e).__name__))
             return False
 
     def clear_module_state_transition(self, module_name):
@@ -737,6 +739,8 @@ class ModuleBase(device_base.DeviceBase):
 
                 return current_flag == "True"
             except Exception as e:
+                sys.stderr.write("Error getting transition flag for module {}: {} ({})\n".format(
+                    module_name, str(e), type(e).__name__))
                 return False
 
     ##############################################
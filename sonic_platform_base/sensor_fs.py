@@ -7,7 +7,10 @@
 from sonic_platform_base.sensor_base import SensorBase
 from sonic_platform_base.sensor_base import VoltageSensorBase
 from sonic_platform_base.sensor_base import CurrentSensorBase
+from concurrent.futures import ThreadPoolExecutor
+import array
 import logging
+import os
 
 
 class SensorFs(SensorBase):
@@ -141,3 +144,110 @@ class CurrentSensorFs(SensorFs, CurrentSensorBase):
 
     def __init__(self, **kw):
         super(CurrentSensorFs, self).__init__(self.DEVICE_TYPE, **kw)
+
+
+class SensorFsGroup(object):
+    """Samples a group of file system based sensors, e.g. all voltage and
+    current sensors of a chassis or module, in one call. The sensor files are
+    kept open and re-read with pread at offset 0, and the last, minimum and
+    maximum recorded values are held in arrays indexed like the sensors."""
+
+    READ_SIZE = 64
+
+    def __init__(self, sensors, max_workers=0):
+        """
+        Args:
+            sensors: list of SensorFs objects
+            max_workers: number of threads reading the sensors, 0 reads them
+                         in the calling thread
+        """
+        self.sensors = list(sensors)
+        count = len(self.sensors)
+        self.paths = [None] * count
+        self.fds = [None] * count
+        self.values = array.array('q', [0] * count)
+        self.minimum = array.array('q', [0] * count)
+        self.maximum = array.array('q', [0] * count)
+        # per sensor flags: last value valid, min/max recorded
+        self.valid = bytearray(count)
+        self.recorded = bytearray(count)
+        self.executor = ThreadPoolExecutor(max_workers=max_workers) if max_workers > 0 else None
+
+        for idx, sensor in enumerate(self.sensors):
+            if sensor.minimum_sensor is not None and sensor.maximum_sensor is not None:
+                self.minimum[idx] = sensor.minimum_sensor
+                self.maximum[idx] = sensor.maximum_sensor
+                self.recorded[idx] = 1
+
+    def _close_fd(self, idx):
+        if self.fds[idx] is not None:
+            try:
+                os.close(self.fds[idx])
+            except OSError:
+                pass
+            self.fds[idx] = None
+
+    def _read(self, idx):
+        path = self.sensors[idx].sensor
+        try:
+            if self.fds[idx] is None or self.paths[idx] != path:
+                self._close_fd(idx)
+                self.fds[idx] = os.open(path, os.O_RDONLY)
+                self.paths[idx] = path
+            return int(os.pread(self.fds[idx], self.READ_SIZE, 0).split(b'\n', 1)[0])
+        except (OSError, ValueError):
+            self._close_fd(idx)
+            return None
+
+    def sample(self):
+        """
+        Reads all sensors and updates their minimum and maximum recorded
+        values
+
+        Returns:
+            A list of the sensor measurements, None for a sensor which could
+            not be read
+        """
+        indices = range(len(self.sensors))
+        if self.executor is not None:
+            results = list(self.executor.map(self._read, indices))
+        else:
+            results = [self._read(idx) for idx in indices]
+
+        for idx, value in enumerate(results):
+            if value is None:
+                self.valid[idx] = 0
+                continue
+            self.values[idx] = value
+            self.valid[idx] = 1
+            if not self.recorded[idx]:
+                self.minimum[idx] = self.maximum[idx] = value
+                self.recorded[idx] = 1
+            elif value < self.minimum[idx]:
+                self.minimum[idx] = value
+            elif value > self.maximum[idx]:
+                self.maximum[idx] = value
+            sensor = self.sensors[idx]
+            sensor.minimum_sensor = self.minimum[idx]
+            sensor.maximum_sensor = self.maximum[idx]
+        return results
+
+    def get_value(self, idx):
+        """Returns the last sampled measurement of the sensor at idx"""
+        return self.values[idx] if self.valid[idx] else None
+
+    def get_minimum_recorded(self, idx):
+        """Returns the minimum recorded measurement of the sensor at idx"""
+        return self.minimum[idx] if self.recorded[idx] else None
+
+    def get_maximum_recorded(self, idx):
+        """Returns the maximum recorded measurement of the sensor at idx"""
+        return self.maximum[idx] if self.recorded[idx] else None
+
+    def close(self):
+        """Closes the sensor files and stops the reader threads"""
+        for idx in range(len(self.fds)):
+            self._close_fd(idx)
+        if self.executor is not None:
+            self.executor.shutdown()
+            self.executor = None
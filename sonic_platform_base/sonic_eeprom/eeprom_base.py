@@ -12,14 +12,21 @@ from __future__ import print_function
 
 try:
     import binascii
+    import hashlib
+    import json
+    import mmap
     import os
     import io
     import sys
     import struct
     import fcntl
+    import tempfile
 except ImportError as e:
     raise ImportError (str(e) + "- required module not found")
 
+# Suffix of the metadata file describing the cached image of an EEPROM device
+IMAGE_CACHE_META_SUFFIX = '.meta'
+
 
 class EepromDecoder(object):
     def __init__(self, path, format, start, status, readonly):
@@ -33,6 +40,9 @@ class EepromDecoder(object):
         self.cache_name = None
         self.cache_update_needed = False
         self.lock_file = None
+        # Shared raw EEPROM image cache, see set_image_cache_dir()
+        self.image_cache_dir = None
+        self._image_cache = None
 
     def check_status(self):
         if self.u != '':
@@ -53,12 +63,175 @@ class EepromDecoder(object):
         # Warning: this method is deprecated, the parsed EEPROM data is stored in the
         # Redis STATE_DB, cached data should be fetched from STATE_DB.EEPROM_INFO. 
 
-        # before accessing the eeprom we acquire an exclusive lock on the eeprom file.
-        # this will prevent a race condition where multiple instances of this app
-        # could try to update the cache at the same time
+        # before accessing the eeprom we acquire a shared lock on the eeprom file,
+        # so that any number of instances of this app can read it concurrently.
+        # The lock is upgraded to an exclusive one only to update the cache, see
+        # write_cache(), which prevents a race between instances updating it.
         self.cache_name = name
         self.lock_file = open(self.p, 'r')
-        fcntl.flock(self.lock_file, fcntl.LOCK_EX)
+        fcntl.flock(self.lock_file, fcntl.LOCK_SH)
+
+    def set_image_cache_dir(self, cache_dir):
+        '''
+        Enable the shared cache of the raw EEPROM image in cache_dir.
+
+        The image is stored in a content-addressed, read-only file named after
+        its SHA-256 digest, next to a metadata file recording the fingerprint
+        of the EEPROM content (see image_cache_fingerprint()) and the CRC-32 of
+        the image. Readers mmap the image and serve read_eeprom_bytes() from it,
+        without locking and reading only the few fingerprint bytes from the
+        EEPROM device, as long as the fingerprint and the image CRC still match.
+        Files are replaced atomically, so any number of processes can share the
+        cache. Only decoders implementing image_cache_fingerprint() use the cache.
+        '''
+        self.image_cache_dir = cache_dir
+        self._image_cache = None
+
+    def image_cache_size(self):
+        '''
+        Number of bytes, from the beginning of the EEPROM device, kept in the
+        image cache. Sub-classes with a variable sized layout should override it.
+        '''
+        sizeof_info = 0
+        for I in self.f or []:
+            sizeof_info += I[2]
+        return self.s + sizeof_info
+
+    def image_cache_fingerprint(self, F):
+        '''
+        Returns bytes read from F, the EEPROM device or its image opened from
+        offset 0, which change whenever the EEPROM content changes (e.g. its
+        checksum). The mtime of sysfs EEPROM nodes does not change with their
+        content, so the image cache is validated against the fingerprint.
+        Sub-classes whose layout has such fields should override it, the image
+        cache is not used while it returns None.
+        '''
+        return None
+
+    def _image_cache_meta_path(self):
+        name = hashlib.sha256(os.path.realpath(self.p).encode()).hexdigest()
+        return os.path.join(self.image_cache_dir, name + IMAGE_CACHE_META_SUFFIX)
+
+    def _eeprom_fingerprint(self):
+        F = None
+        try:
+            F = io.open(self.p, "rb")
+            fingerprint = self.image_cache_fingerprint(F)
+        finally:
+            if F is not None:
+                F.close()
+        return binascii.hexlify(fingerprint).decode() if fingerprint is not None else None
+
+    def read_image_cache(self):
+        '''
+        Returns a read-only mmap of the cached EEPROM image, or None if the
+        image cache is disabled, empty or stale.
+        '''
+        if not self.image_cache_dir:
+            return None
+        try:
+            with open(self._image_cache_meta_path(), 'r') as F:
+                meta = json.load(F)
+            if meta['path'] != self.p:
+                return None
+            fingerprint = self._eeprom_fingerprint()
+            if fingerprint is None or meta['fingerprint'] != fingerprint:
+                return None
+            if self._image_cache is not None and self._image_cache[0] == meta['digest']:
+                return self._image_cache[1]
+            with open(os.path.join(self.image_cache_dir, meta['digest']), 'rb') as F:
+                image = mmap.mmap(F.fileno(), 0, access=mmap.ACCESS_READ)
+        except (IOError, OSError, ValueError, KeyError):
+            return None
+
+        if len(image) != meta['length'] or (binascii.crc32(image) & 0xffffffff) != meta['crc32']:
+            image.close()
+            return None
+
+        if self._image_cache is not None:
+            self._image_cache[1].close()
+        self._image_cache = (meta['digest'], image)
+        return image
+
+    def update_image_cache(self, image):
+        '''
+        Store a raw image of the EEPROM device, read from offset 0, in the image
+        cache. Errors are ignored, the EEPROM device is read directly when the
+        cache can not be used.
+        '''
+        if not self.image_cache_dir:
+            return
+        image = bytes(image)
+        fingerprint = self.image_cache_fingerprint(io.BytesIO(image))
+        if fingerprint is None:
+            return
+        digest = hashlib.sha256(image).hexdigest()
+        meta = {
+            'path': self.p,
+            'fingerprint': binascii.hexlify(fingerprint).decode(),
+            'digest': digest,
+            'length': len(image),
+            'crc32': binascii.crc32(image) & 0xffffffff
+        }
+        meta_path = self._image_cache_meta_path()
+        try:
+            with open(meta_path, 'r') as F:
+                old_digest = json.load(F).get('digest')
+        except (IOError, OSError, ValueError, AttributeError):
+            old_digest = None
+
+        try:
+            if not os.path.isdir(self.image_cache_dir):
+                os.makedirs(self.image_cache_dir)
+            self._atomic_write(os.path.join(self.image_cache_dir, digest), image, 0o444)
+            self._atomic_write(meta_path, json.dumps(meta).encode(), 0o644)
+            # Readers which already mapped the previous image keep their mapping
+            if old_digest and old_digest != digest:
+                os.remove(os.path.join(self.image_cache_dir, old_digest))
+        except (IOError, OSError):
+            pass
+
+    def invalidate_image_cache(self):
+        '''
+        Drop the cached image of the EEPROM device, the next read goes to the device.
+        '''
+        if self._image_cache is not None:
+            self._image_cache[1].close()
+            self._image_cache = None
+        if not self.image_cache_dir:
+            return
+        try:
+            os.remove(self._image_cache_meta_path())
+        except OSError:
+            pass
+
+    def _atomic_write(self, path, data, mode):
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path))
+        try:
+            with os.fdopen(fd, 'wb') as F:
+                F.write(data)
+            os.chmod(tmp_path, mode)
+            os.rename(tmp_path, path)
+        except Exception:
+            os.remove(tmp_path)
+            raise
+
+    def _read_eeprom_bytes_from_image_cache(self, byteCount, offset):
+        image = self.read_image_cache()
+        if image is None:
+            F = None
+            try:
+                F = io.open(self.p, "rb")
+                image = F.read(self.image_cache_size())
+            finally:
+                if F is not None:
+                    F.close()
+            self.update_image_cache(image)
+
+        start = self.s + offset
+        if start + byteCount > len(image):
+            return None
+        return image[start:start + byteCount]
 
     def is_read_only(self):
         return self.r
@@ -223,7 +396,7 @@ class EepromDecoder(object):
         # Warning: cache file is deprecated, the parsed EEPROM data is stored in the
         # Redis STATE_DB, cached data should be fetched from STATE_DB.EEPROM_INFO. This
         # code need to be adjusted once cache file is completely removing from the system.
-            if os.path.isfile(self.cache_name):
+            if self.cache_name and os.path.isfile(self.cache_name):
                 eeprom_file = self.cache_name
                 using_eeprom = False
         except Exception:
@@ -239,6 +412,14 @@ class EepromDecoder(object):
         return o
 
     def read_eeprom_bytes(self, byteCount, offset=0):
+        if self.image_cache_dir:
+            try:
+                o = self._read_eeprom_bytes_from_image_cache(byteCount, offset)
+            except IOError as e:
+                raise IOError("Failed to read eeprom : %s" % (str(e)))
+            if o is not None:
+                return bytearray(o)
+
         F = None
         try:
             F = self.open_eeprom()
@@ -286,6 +467,7 @@ class EepromDecoder(object):
             if F is not None:
                 F.close()
 
+        self.invalidate_image_cache()
         self.write_cache(e)
 
     def write_cache(self, e):
@@ -293,6 +475,9 @@ class EepromDecoder(object):
         # Redis STATE_DB, cached data should be fetched from STATE_DB.EEPROM_INFO. 
 
         if self.cache_name:
+            if self.lock_file is not None:
+                # readers only hold the shared lock, see set_cache_name()
+                fcntl.flock(self.lock_file, fcntl.LOCK_EX)
             F = None
             try:
                 F = open(self.cache_name, "wb")
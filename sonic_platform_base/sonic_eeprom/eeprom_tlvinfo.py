@@ -11,6 +11,7 @@
 from __future__ import print_function
 
 try:
+    import hashlib
     import sys
 
     import redis
@@ -21,6 +22,15 @@ except ImportError as e:
 
 STATE_DB_INDEX = 6
 
+_redis_connection_pool = None
+
+
+def _get_redis_connection_pool():
+    global _redis_connection_pool
+    if _redis_connection_pool is None:
+        _redis_connection_pool = redis.ConnectionPool(db=STATE_DB_INDEX)
+    return _redis_connection_pool
+
 #
 # TlvInfo Format - This eeprom format was defined by Cumulus Networks
 # and can be found here:
@@ -80,22 +90,24 @@ class TlvInfoDecoder(eeprom_base.EepromDecoder):
         self.eeprom_start = start
         self.eeprom_max_len = max_len
         self._redis_client = None
+        # (content hash, TlvInfoIndex) of the last parsed EEPROM data
+        self._tlv_index_cache = None
 
 
-    def __print_db(self, code, num=0):
+    def __print_db(self, code, fields, num=0):
         if not num:
-            field_name = self._redis_hget('EEPROM_INFO|{}'.format(hex(code)), 'Name')
+            field_name = fields.get('Name')
             if not field_name:
                 pass
             else:
-                field_len = self._redis_hget('EEPROM_INFO|{}'.format(hex(code)), 'Len')
-                field_value = self._redis_hget('EEPROM_INFO|{}'.format(hex(code)), 'Value')
+                field_len = fields.get('Len')
+                field_value = fields.get('Value')
                 print("%-20s 0x%02X %3s %s" % (field_name, code, field_len, field_value))
         else:
             for index in range(num):
-                field_name = self._redis_hget('EEPROM_INFO|{}'.format(hex(code)), 'Name_{}'.format(index))
-                field_len = self._redis_hget('EEPROM_INFO|{}'.format(hex(code)), 'Len_{}'.format(index))
-                field_value = self._redis_hget('EEPROM_INFO|{}'.format(hex(code)), 'Value_{}'.format(index))
+                field_name = fields.get('Name_{}'.format(index))
+                field_len = fields.get('Len_{}'.format(index))
+                field_value = fields.get('Value_{}'.format(index))
                 print("%-20s 0x%02X %3s %s" % (field_name, code, field_len, field_value))
 
 
@@ -197,6 +209,29 @@ class TlvInfoDecoder(eeprom_base.EepromDecoder):
         return new_e
 
 
+    def image_cache_size(self):
+        '''
+        The image cache keeps the largest TlvInfo EEPROM this decoder can read.
+        '''
+        return self.eeprom_start + min(self._TLV_INFO_MAX_LEN, self.eeprom_max_len)
+
+
+    def image_cache_fingerprint(self, F):
+        '''
+        The TlvInfo header and the last bytes of the TLV area, which hold the
+        CRC TLV covering the whole EEPROM content.
+        '''
+        if not self._TLV_HDR_ENABLED:
+            return None
+        F.seek(self.eeprom_start)
+        header = F.read(self._TLV_INFO_HDR_LEN)
+        if not self.is_valid_tlvinfo_header(header):
+            return None
+        total_len = (header[9] << 8) | header[10]
+        F.seek(self.eeprom_start + self._TLV_INFO_HDR_LEN + max(total_len - 6, 0))
+        return header + F.read(6)
+
+
     def is_valid_tlvinfo_header(self, e):
         '''
         Perform sanity checks on the first 11 bytes of the TlvInfo EEPROM
@@ -280,34 +315,42 @@ class TlvInfoDecoder(eeprom_base.EepromDecoder):
         '''
         Print out the contents of the EEPROM from database
         '''
-        db_state = self._redis_hget('EEPROM_INFO|State', 'Initialized')
+        tlv_codes = list(range(self._TLV_CODE_PRODUCT_NAME, self._TLV_CODE_SERVICE_TAG + 1)) + \
+                    [self._TLV_CODE_VENDOR_EXT, self._TLV_CODE_CRC_32]
+        keys = ['EEPROM_INFO|State', 'EEPROM_INFO|TlvHeader', 'EEPROM_INFO|Checksum'] + \
+               ['EEPROM_INFO|{}'.format(hex(code)) for code in tlv_codes]
+        db = self._redis_hgetall_many(keys)
+
+        db_state = db['EEPROM_INFO|State'].get('Initialized')
         if db_state != '1':
             return -1
-        tlv_version = self._redis_hget('EEPROM_INFO|TlvHeader', 'Version')
+        tlv_header = db['EEPROM_INFO|TlvHeader']
+        tlv_version = tlv_header.get('Version')
         if tlv_version:
             print("TlvInfo Header:")
-            print("   Id String:    %s" % self._redis_hget('EEPROM_INFO|TlvHeader', 'Id String'))
+            print("   Id String:    %s" % tlv_header.get('Id String'))
             print("   Version:      %s" % tlv_version)
-            print("   Total Length: %s" % self._redis_hget('EEPROM_INFO|TlvHeader', 'Total Length'))
+            print("   Total Length: %s" % tlv_header.get('Total Length'))
 
         print("TLV Name             Code Len Value")
         print("-------------------- ---- --- -----")
 
         for index in range(self._TLV_CODE_PRODUCT_NAME, self._TLV_CODE_SERVICE_TAG + 1):
-            self.__print_db(index)
+            self.__print_db(index, db['EEPROM_INFO|{}'.format(hex(index))])
 
+        vendor_ext_fields = db['EEPROM_INFO|{}'.format(hex(self._TLV_CODE_VENDOR_EXT))]
         try:
-            num_vendor_ext = int(self._redis_hget('EEPROM_INFO|{}'.format(hex(self._TLV_CODE_VENDOR_EXT)), 'Num_vendor_ext'))
+            num_vendor_ext = int(vendor_ext_fields.get('Num_vendor_ext'))
         except (ValueError, TypeError):
             pass
         else:
-            self.__print_db(self._TLV_CODE_VENDOR_EXT, num_vendor_ext)
+            self.__print_db(self._TLV_CODE_VENDOR_EXT, vendor_ext_fields, num_vendor_ext)
 
-        self.__print_db(self._TLV_CODE_CRC_32)
+        self.__print_db(self._TLV_CODE_CRC_32, db['EEPROM_INFO|{}'.format(hex(self._TLV_CODE_CRC_32))])
 
         print("")
 
-        is_valid = self._redis_hget('EEPROM_INFO|Checksum', 'Valid')
+        is_valid = db['EEPROM_INFO|Checksum'].get('Valid')
         if is_valid != '1':
             print("(*** checksum invalid)")
         else:
@@ -335,23 +378,66 @@ class TlvInfoDecoder(eeprom_base.EepromDecoder):
         item is a 3 element list with the type (int), length (int),
         and value (bytearray) of the requested TLV.
         '''
-        (is_valid, valid_crc) = self.is_checksum_valid(e)
-        if not is_valid:
+        tlv_info_index = self.get_tlv_info_index(e)
+        if not tlv_info_index.crc_valid:
             return (False, None)
-        if self._TLV_HDR_ENABLED:
+        tlv = tlv_info_index.get_tlv(code)
+        if tlv is None:
+            return (False, None)
+        return (True, [tlv[0], tlv[1], tlv[2:]])
+
+
+    def get_tlv_info_index(self, e, tlvs_only=False):
+        '''
+        Returns a TlvInfoIndex of the provided EEPROM bytearray. The EEPROM
+        data is parsed once and the result is memoized against the hash of
+        its content, so that subsequent lookups on the same data do not
+        rescan the TLV area. See parse_tlv_info for tlvs_only.
+        '''
+        key = (hashlib.sha256(bytes(e)).digest(), tlvs_only)
+        if self._tlv_index_cache is not None and self._tlv_index_cache[0] == key:
+            return self._tlv_index_cache[1]
+
+        tlv_info_index = self.parse_tlv_info(e, tlvs_only)
+        self._tlv_index_cache = (key, tlv_info_index)
+        return tlv_info_index
+
+
+    def parse_tlv_info(self, e, tlvs_only=False):
+        '''
+        Parse the TLV area of the provided EEPROM bytearray in one pass and
+        return a TlvInfoIndex. Parsing stops at the end of the TLV area or at
+        the first invalid TLV, whose offset is recorded in the index.
+        If tlvs_only is True, e holds just TLV fields (no TlvInfo header and
+        no CRC check), as built by set_eeprom, and is parsed from offset 0
+        to its end; header_valid and crc_valid are then False.
+        '''
+        header_valid = False if tlvs_only else self.is_valid_tlvinfo_header(e)
+        tlvs = []
+        invalid_offset = None
+        if tlvs_only:
+            tlv_index = 0
+            tlv_end = len(e)
+        elif self._TLV_HDR_ENABLED:
+            if not header_valid:
+                return TlvInfoIndex(header_valid, False, tlvs, invalid_offset)
             tlv_index = self._TLV_INFO_HDR_LEN
             tlv_end = ((e[9] << 8) | e[10]) + self._TLV_INFO_HDR_LEN
         else:
             tlv_index = self.eeprom_start
             tlv_end = self._TLV_INFO_MAX_LEN
-        while tlv_index < len(e) and tlv_index < tlv_end:
-            if not self.is_valid_tlv(e[tlv_index:]):
-                return (False, None)
-            if e[tlv_index] == code:
-                return (True, [e[tlv_index], e[tlv_index+1], \
-                               e[tlv_index+2:tlv_index+2+e[tlv_index+1]]])
-            tlv_index += e[tlv_index+1] + 2
-        return (False, None)
+
+        with memoryview(e) as view:
+            while tlv_index < len(e) and tlv_index < tlv_end:
+                if not self.is_valid_tlv(view[tlv_index:]):
+                    invalid_offset = tlv_index
+                    break
+                tlv_len = e[tlv_index + 1]
+                tlvs.append((tlv_index, e[tlv_index:tlv_index + 2 + tlv_len]))
+                tlv_index += tlv_len + 2
+
+        crc_valid = False if tlvs_only else self.is_checksum_valid(e)[0]
+        return TlvInfoIndex(header_valid, crc_valid, tlvs, invalid_offset)
 
 
     def get_tlv_index(self, e, code):
@@ -363,14 +449,10 @@ class TlvInfoDecoder(eeprom_base.EepromDecoder):
         if True, the second item is the index in the supplied EEPROM bytearray
         of the matching type code.
         '''
-        tlv_index = 0
-        while tlv_index < len(e):
-            if not self.is_valid_tlv(e[tlv_index:]):
-                return (False, 0)
-            if e[tlv_index] == code:
-                return (True, tlv_index)
-            tlv_index += e[tlv_index+1] + 2
-        return (False, 0)
+        tlv_index = self.get_tlv_info_index(e, tlvs_only=True).get_tlv_offset(code)
+        if tlv_index is None:
+            return (False, 0)
+        return (True, tlv_index)
 
 
     def base_mac_addr(self, e):
@@ -620,12 +702,14 @@ class TlvInfoDecoder(eeprom_base.EepromDecoder):
     @property
     def redis_client(self):
         """Handy property to get a redis client. Make sure only create the redis client once.
+        The client is backed by a connection pool shared by all decoder instances of the process,
+        so the connection is reused across calls.
 
         Returns:
             A redis client instance
         """
         if not self._redis_client:
-            self._redis_client = redis.Redis(db=STATE_DB_INDEX)
+            self._redis_client = redis.Redis(connection_pool=_get_redis_connection_pool())
         return self._redis_client
 
     def _redis_hget(self, key, field):
@@ -634,6 +718,23 @@ class TlvInfoDecoder(eeprom_base.EepromDecoder):
             value = value.decode().rstrip('\0')
         return value
 
+    def _redis_hgetall_many(self, keys):
+        """Fetch several hashes with pipelined HGETALL, in a single round trip.
+
+        Args:
+            keys: list of redis keys
+
+        Returns:
+            A dict of key to a dict of the decoded fields of that key, a missing key maps to an empty dict
+        """
+        pipe = self.redis_client.pipeline(transaction=False)
+        for key in keys:
+            pipe.hgetall(key)
+        result = {}
+        for key, fvs in zip(keys, pipe.execute()):
+            result[key] = {field.decode(): value.decode().rstrip('\0') for field, value in fvs.items()}
+        return result
+
     def visit_eeprom(self, e, visitor):
         """Visit the content of EEPROM data.
 
@@ -647,29 +748,86 @@ class TlvInfoDecoder(eeprom_base.EepromDecoder):
                 return
 
             total_len = (e[9] << 8) | e[10]
-            tlv_index = self._TLV_INFO_HDR_LEN
-            tlv_end   = self._TLV_INFO_HDR_LEN + total_len
             visitor.visit_header(e[0:7].decode("ascii"), int(e[8]), total_len)
         else :
-            tlv_index = self.eeprom_start
-            tlv_end   = self._TLV_INFO_MAX_LEN
             visitor.visit_header(None, None, None)
 
-        while (tlv_index + 2) < len(e) and tlv_index < tlv_end:
-            if not self.is_valid_tlv(e[tlv_index:]):
-                visitor.set_error('Invalid TLV field starting at EEPROM offset %d' % tlv_index)
+        tlv_info_index = self.get_tlv_info_index(e)
+        for tlv_index, tlv in tlv_info_index.tlvs:
+            if (tlv_index + 2) >= len(e):
                 break
-            tlv = e[tlv_index:tlv_index + 2 + e[tlv_index + 1]]
             name, value = self.decoder(None, tlv)
             visitor.visit_tlv(name, tlv[0], tlv[1], value)
 
-            if e[tlv_index] == self._TLV_CODE_QUANTA_CRC or \
-               e[tlv_index] == self._TLV_CODE_CRC_32:
+            if tlv[0] == self._TLV_CODE_QUANTA_CRC or \
+               tlv[0] == self._TLV_CODE_CRC_32:
                 break
-            tlv_index += e[tlv_index+1] + 2
+        else:
+            invalid_offset = tlv_info_index.invalid_offset
+            if invalid_offset is not None and (invalid_offset + 2) < len(e):
+                visitor.set_error('Invalid TLV field starting at EEPROM offset %d' % invalid_offset)
         visitor.visit_end(e)
 
 
+class TlvInfoIndex(object):
+    """Result of a one-pass parse of the TLV area of an EEPROM, see
+    TlvInfoDecoder.parse_tlv_info. Each TLV is kept as the raw bytes of the
+    whole field (type, length and value) together with its EEPROM offset.
+    """
+    def __init__(self, header_valid, crc_valid, tlvs, invalid_offset):
+        self.header_valid = header_valid
+        self.crc_valid = crc_valid
+        self.tlvs = tlvs
+        self.invalid_offset = invalid_offset
+        # code -> (offset, raw TLV), the first TLV with a given code wins
+        self._tlvs_by_code = {}
+        for offset, tlv in tlvs:
+            self._tlvs_by_code.setdefault(tlv[0], (offset, tlv))
+
+    def get_tlv(self, code):
+        """Get the raw TLV of a type code
+
+        Args:
+            code (int): TLV type code
+
+        Returns:
+            The first TLV of the given code, or None if there is no such TLV
+        """
+        entry = self._tlvs_by_code.get(code)
+        return entry[1] if entry is not None else None
+
+    def get_tlv_offset(self, code):
+        """Get the EEPROM offset of a type code
+
+        Args:
+            code (int): TLV type code
+
+        Returns:
+            The offset of the first TLV of the given code, or None if there is no such TLV
+        """
+        entry = self._tlvs_by_code.get(code)
+        return entry[0] if entry is not None else None
+
+    def get_tlvs(self, code):
+        """Get all the raw TLVs of a type code, in EEPROM order
+
+        Args:
+            code (int): TLV type code
+
+        Returns:
+            A list of TLVs
+        """
+        return [tlv for _, tlv in self.tlvs if tlv[0] == code]
+
+    def get_vendor_extensions(self):
+        """Get all the Vendor Extension TLVs, in EEPROM order
+
+        Returns:
+            A list of TLVs
+        """
+        return self.get_tlvs(TlvInfoDecoder._TLV_CODE_VENDOR_EXT)
+
+
 class EepromDefaultVisitor:
     def visit_header(self, eeprom_id, version, header_length):
         """Visit EEPROM header. If EEPROM header is not present, this method is still called, 
@@ -728,9 +886,15 @@ class EepromDecodeVisitor(EepromDefaultVisitor):
 
 
 class EepromRedisVisitor(EepromDefaultVisitor):
+    """Write the decoded EEPROM to STATE_DB. All the fields are queued in one
+    transactional pipeline which is executed when the visit ends, so the
+    whole EEPROM is written in a single round trip and readers never observe
+    a partially written EEPROM_INFO table.
+    """
     def __init__(self, eeprom_object):
         self.eeprom_object = eeprom_object
         self.redis_client = eeprom_object.redis_client
+        self.pipeline = self.redis_client.pipeline(transaction=True)
         self.vendor_ext_tlv_num = 0
         self.fvs = {}
         self.error = None
@@ -740,7 +904,7 @@ class EepromRedisVisitor(EepromDefaultVisitor):
             self.fvs['Id String'] = eeprom_id
             self.fvs['Version'] = version
             self.fvs['Total Length'] = header_length
-            self.redis_client.hmset("EEPROM_INFO|TlvHeader", self.fvs)
+            self.pipeline.hmset("EEPROM_INFO|TlvHeader", self.fvs)
             self.fvs.clear()
 
     def visit_tlv(self, name, code, length, value):
@@ -754,13 +918,13 @@ class EepromRedisVisitor(EepromDefaultVisitor):
             self.fvs['Name'] = name
             self.fvs['Len'] = length
             self.fvs['Value'] = value
-        self.redis_client.hmset('EEPROM_INFO|{}'.format(hex(code)), self.fvs)
+        self.pipeline.hmset('EEPROM_INFO|{}'.format(hex(code)), self.fvs)
         self.fvs.clear()
 
     def visit_end(self, eeprom_data):
         if self.vendor_ext_tlv_num > 0:
             self.fvs['Num_vendor_ext'] = str(self.vendor_ext_tlv_num)
-            self.redis_client.hmset('EEPROM_INFO|{}'.format(hex(self.eeprom_object._TLV_CODE_VENDOR_EXT)), self.fvs)
+            self.pipeline.hmset('EEPROM_INFO|{}'.format(hex(self.eeprom_object._TLV_CODE_VENDOR_EXT)), self.fvs)
             self.fvs.clear()
 
         (is_valid, _) = self.eeprom_object.is_checksum_valid(eeprom_data)
@@ -769,11 +933,14 @@ class EepromRedisVisitor(EepromDefaultVisitor):
         else:
             self.fvs['Valid'] = '0'
 
-        self.redis_client.hmset('EEPROM_INFO|Checksum', self.fvs)
+        self.pipeline.hmset('EEPROM_INFO|Checksum', self.fvs)
         self.fvs.clear()
 
         self.fvs['Initialized'] = '1'
-        self.redis_client.hmset('EEPROM_INFO|State', self.fvs)
+        self.pipeline.hmset('EEPROM_INFO|State', self.fvs)
+        self.fvs.clear()
+
+        self.pipeline.execute()
 
     def set_error(self, error):
         self.error = error
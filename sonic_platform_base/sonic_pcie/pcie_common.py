@@ -7,6 +7,7 @@ import yaml
 import subprocess
 import re
 import sys
+import time
 from copy import deepcopy
 try:
     from .pcie_base import PcieBase
@@ -16,10 +17,23 @@ except ImportError as e:
 
 class PcieUtil(PcieBase):
     """Platform-specific PCIEutil class"""
+    PCIE_SYSFS_PATH = '/sys/bus/pci/devices'
+    PCIE_SYSFS_ATTRS = ('vendor', 'device', 'class')
+    PCIE_BDF_PATTERN = re.compile(r'^([0-9a-fA-F]{4}):([0-9a-fA-F]{2}):([0-9a-fA-F]{2})\.([0-7])$')
+    AER_SEVERITY_FILES = (('correctable', 'aer_dev_correctable'),
+                          ('fatal', 'aer_dev_fatal'),
+                          ('non_fatal', 'aer_dev_nonfatal'))
+
     # got the config file path
     def __init__(self, path):
         self.config_path = path
         self._conf_rev = None
+        # AER collector state: open sysfs fds, last counters and sample time
+        self._aer_fds = {}
+        self._aer_counters = {}
+        # BDF -> inode of the sysfs device directory, for devices without AER
+        self._aer_unsupported = {}
+        self._aer_sample_time = None
 
     # load the config file
     def load_config_file(self):
@@ -82,28 +96,60 @@ class PcieUtil(PcieBase):
 
     # check the sysfs tree for each PCIe device
     def check_pcie_sysfs(self, domain=0, bus=0, device=0, func=0):
-        dev_path = os.path.join('/sys/bus/pci/devices', '%04x:%02x:%02x.%d' % (domain, bus, device, func))
+        dev_path = os.path.join(self.PCIE_SYSFS_PATH, '%04x:%02x:%02x.%d' % (domain, bus, device, func))
         if os.path.exists(dev_path):
             return True
         return False
 
+    # walk the sysfs tree once and index the present PCIe devices by
+    # (domain, bus, dev, fn); with attrs the vendor/device/class IDs are read too
+    def get_pcie_sysfs_devices(self, attrs=True):
+        devices = {}
+        try:
+            entries = os.listdir(self.PCIE_SYSFS_PATH)
+        except OSError:
+            return devices
+
+        for entry in entries:
+            match = self.PCIE_BDF_PATTERN.match(entry)
+            if not match:
+                continue
+            domain, bus, dev, fn = (int(group, base=16) for group in match.groups())
+            device = {"bus": "%02x" % bus, "dev": "%02x" % dev, "fn": "%d" % fn}
+            if attrs:
+                for attr in self.PCIE_SYSFS_ATTRS:
+                    try:
+                        with open(os.path.join(self.PCIE_SYSFS_PATH, entry, attr)) as fh:
+                            device[attr] = fh.read().strip().replace("0x", "", 1)
+                    except IOError:
+                        device[attr] = None
+                device["id"] = device["device"]
+            devices[(domain, bus, dev, fn)] = device
+        return devices
+
     # check the current PCIe device with config file and return the result
     def get_pcie_check(self):
         self.load_config_file()
+        # platforms overriding the per-device probe keep their own semantics
+        if type(self).check_pcie_sysfs is not PcieUtil.check_pcie_sysfs:
+            present = None
+        else:
+            present = self.get_pcie_sysfs_devices(attrs=False)
         for item_conf in self.confInfo:
-            bus_conf = item_conf["bus"]
-            dev_conf = item_conf["dev"]
-            fn_conf = item_conf["fn"]
-            if self.check_pcie_sysfs(bus=int(bus_conf, base=16), device=int(dev_conf, base=16), func=int(fn_conf, base=16)):
-                item_conf["result"] = "Passed"
+            bus_conf = int(item_conf["bus"], base=16)
+            dev_conf = int(item_conf["dev"], base=16)
+            fn_conf = int(item_conf["fn"], base=16)
+            if present is None:
+                found = self.check_pcie_sysfs(bus=bus_conf, device=dev_conf, func=fn_conf)
             else:
-                item_conf["result"] = "Failed"
+                found = (0, bus_conf, dev_conf, fn_conf) in present
+            item_conf["result"] = "Passed" if found else "Failed"
         return self.confInfo
 
     # return AER stats of PCIe device
     def get_pcie_aer_stats(self, domain=0, bus=0, dev=0, func=0):
         aer_stats = {'correctable': {}, 'fatal': {}, 'non_fatal': {}}
-        dev_path = os.path.join('/sys/bus/pci/devices', '%04x:%02x:%02x.%d' % (domain, bus, dev, func))
+        dev_path = os.path.join(self.PCIE_SYSFS_PATH, '%04x:%02x:%02x.%d' % (domain, bus, dev, func))
 
         # construct AER sysfs filepath
         correctable_path = os.path.join(dev_path, "aer_dev_correctable")
@@ -136,6 +182,108 @@ class PcieUtil(PcieBase):
 
         return aer_stats
 
+    # read the AER counters of a device through persistent fds as integers,
+    # {(severity, field): count}; None once the device is gone
+    def _read_aer_counters(self, domain, bus, dev, func):
+        bdf = '%04x:%02x:%02x.%d' % (domain, bus, dev, func)
+        dev_path = os.path.join(self.PCIE_SYSFS_PATH, bdf)
+        # a device without AER files is not probed again until it is re-enumerated,
+        # which creates a new sysfs directory
+        if bdf in self._aer_unsupported:
+            try:
+                dev_ino = os.stat(dev_path).st_ino
+            except OSError:
+                del self._aer_unsupported[bdf]
+                return None
+            if dev_ino == self._aer_unsupported[bdf]:
+                return {}
+            del self._aer_unsupported[bdf]
+
+        counters = {}
+        supported = False
+        for severity, file_name in self.AER_SEVERITY_FILES:
+            path = os.path.join(self.PCIE_SYSFS_PATH, bdf, file_name)
+            content = None
+            fd = self._aer_fds.get(path)
+            if fd is not None:
+                try:
+                    content = os.pread(fd, 4096, 0).decode()
+                except OSError:
+                    # a stale fd, e.g. the device was removed and added back since
+                    # the last sample: reopen the file before giving up on it
+                    os.close(self._aer_fds.pop(path))
+            try:
+                if content is None:
+                    fd = self._aer_fds[path] = os.open(path, os.O_RDONLY)
+                    content = os.pread(fd, 4096, 0).decode()
+            except OSError:
+                if path in self._aer_fds:
+                    os.close(self._aer_fds.pop(path))
+                if not os.path.isdir(os.path.dirname(path)):
+                    for _, other_file in self.AER_SEVERITY_FILES:
+                        other_fd = self._aer_fds.pop(os.path.join(self.PCIE_SYSFS_PATH, bdf, other_file), None)
+                        if other_fd is not None:
+                            os.close(other_fd)
+                    return None
+                # device without AER support
+                continue
+            supported = True
+            for line in content.splitlines():
+                try:
+                    field, value = line.split()
+                    counters[(severity, field)] = int(value)
+                except ValueError:
+                    # not a "<field> <count>" line
+                    continue
+
+        if not supported:
+            try:
+                self._aer_unsupported[bdf] = os.stat(dev_path).st_ino
+            except OSError:
+                return None
+        return counters
+
+    # return the AER counter increments of all (or the given) PCIe devices since
+    # the previous sample, keyed by BDF string and limited to non-zero deltas:
+    #   {'0000:01:00.0': {'correctable': {'RxErr': 2}}}
+    # a device seen for the first time reports its counters in full. If called
+    # again within min_interval seconds nothing is sampled and None is returned
+    def get_pcie_aer_deltas(self, devices=None, min_interval=0):
+        now = time.monotonic()
+        if self._aer_sample_time is not None and now - self._aer_sample_time < min_interval:
+            return None
+        self._aer_sample_time = now
+
+        if devices is None:
+            devices = sorted(self.get_pcie_sysfs_devices(attrs=False))
+
+        deltas = {}
+        for domain, bus, dev, func in devices:
+            bdf = '%04x:%02x:%02x.%d' % (domain, bus, dev, func)
+            counters = self._read_aer_counters(domain, bus, dev, func)
+            if counters is None:
+                self._aer_counters.pop(bdf, None)
+                continue
+            last = self._aer_counters.get(bdf, {})
+            for (severity, field), value in counters.items():
+                delta = value - last.get((severity, field), 0)
+                # a counter going backwards was reset, e.g. by a device reset
+                if delta < 0:
+                    delta = value
+                if delta:
+                    deltas.setdefault(bdf, {}).setdefault(severity, {})[field] = delta
+            self._aer_counters[bdf] = counters
+        return deltas
+
+    # close the fds held by the AER collector and forget the last sample
+    def close_aer_collector(self):
+        for fd in self._aer_fds.values():
+            os.close(fd)
+        self._aer_fds.clear()
+        self._aer_counters.clear()
+        self._aer_unsupported.clear()
+        self._aer_sample_time = None
+
     # generate the config file with current pci device
     def dump_conf_yaml(self):
         curInfo = self.get_pcie_device()
@@ -0,0 +1,248 @@
+#
+# pcie_hotplug.py
+# Event driven PCIe hotplug monitoring for SONIC
+#
+
+try:
+    import errno
+    import select
+    import socket
+    import threading
+    from sonic_py_common import syslogger
+except ImportError as e:
+    raise ImportError(str(e) + "- required module not found")
+
+NETLINK_KOBJECT_UEVENT = 15
+UEVENT_KERNEL_GROUP = 1
+UEVENT_BUFFER_SIZE = 64 * 1024
+
+PCIE_HOTPLUG_ADD = "add"
+PCIE_HOTPLUG_REMOVE = "remove"
+PCIE_HOTPLUG_CHANGE = "change"
+
+
+def format_bdf(key):
+    """Formats a (domain, bus, dev, fn) key as a "DDDD:BB:SS.F" string"""
+    return '%04x:%02x:%02x.%d' % key
+
+
+def parse_uevent(data):
+    """
+    Parses a kernel uevent message
+
+    Args:
+        data: the raw netlink message, "ACTION@DEVPATH\\0KEY=VALUE\\0..."
+
+    Returns:
+        A dict of the uevent environment, or None for messages which are not
+        kernel uevents (e.g. the ones re-broadcast by udevd)
+    """
+    fields = data.split(b'\0')
+    if b'@' not in fields[0]:
+        return None
+    uevent = {}
+    for field in fields[1:]:
+        key, sep, value = field.partition(b'=')
+        if sep:
+            uevent[key.decode(errors='replace')] = value.decode(errors='replace')
+    return uevent
+
+
+class NetlinkUeventSource(object):
+    """Kernel uevent netlink socket"""
+
+    def __init__(self):
+        self.sock = socket.socket(socket.AF_NETLINK, socket.SOCK_DGRAM | socket.SOCK_CLOEXEC,
+                                  NETLINK_KOBJECT_UEVENT)
+        self.sock.bind((0, UEVENT_KERNEL_GROUP))
+
+    def recv(self, timeout=None):
+        """
+        Receives one uevent message
+
+        Returns:
+            The raw message, or None if nothing arrived within timeout seconds
+        """
+        ready, _, _ = select.select([self.sock], [], [], timeout)
+        if not ready:
+            return None
+        return self.sock.recv(UEVENT_BUFFER_SIZE)
+
+    def close(self):
+        self.sock.close()
+
+
+class PcieHotplugMonitor(object):
+    """
+    Keeps a table of the present PCIe devices up to date from kernel uevents
+    and notifies registered callbacks of PCI add, remove and change events.
+    The table is indexed by (domain, bus, dev, fn) like
+    PcieUtil.get_pcie_sysfs_devices(). When the kernel drops uevents because
+    the socket buffer overflowed, the table is re-scanned from sysfs.
+    """
+
+    def __init__(self, pcieutil=None, source=None):
+        """
+        Constructor
+
+        Args:
+            pcieutil: PcieUtil used to seed, and re-scan after a uevent overflow,
+                      the device table from sysfs, None starts with an empty
+                      table which is not re-scanned
+            source: uevent source providing recv(timeout) and close(), the
+                    kernel netlink socket by default
+        """
+        self.log_identifier = "PcieHotplugMonitor"
+        self.log = syslogger.SysLogger(self.log_identifier)
+        self.pcieutil = pcieutil
+        self.source = source if source is not None else NetlinkUeventSource()
+        self.devices = pcieutil.get_pcie_sysfs_devices() if pcieutil is not None else {}
+        self._callbacks = []
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    def register_callback(self, callback, bdfs=None):
+        """
+        Registers a callback invoked as callback(action, bdf, device) for each
+        PCI uevent, device being the table entry (the removed entry for a
+        remove event)
+
+        Args:
+            callback: the callable
+            bdfs: optional list of "DDDD:BB:SS.F" (or "BB:SS.F") strings, e.g.
+                  from ModuleBase.get_pci_bus_info(), limiting the callback to
+                  those devices
+        """
+        if bdfs is not None:
+            bdfs = set(bdf if bdf.count(':') == 2 else '0000:' + bdf for bdf in bdfs)
+        self._callbacks.append((callback, bdfs))
+
+    def get_devices(self):
+        """
+        Returns:
+            A copy of the device table
+        """
+        with self._lock:
+            return dict(self.devices)
+
+    def handle_uevent(self, data):
+        """
+        Applies one raw uevent to the device table and runs the callbacks
+
+        Returns:
+            (action, bdf) for a PCI event, None if the message was ignored
+        """
+        uevent = parse_uevent(data)
+        if not uevent or uevent.get('SUBSYSTEM') != 'pci':
+            return None
+        action = uevent.get('ACTION')
+        bdf = uevent.get('PCI_SLOT_NAME', '').lower()
+        try:
+            domain, bus, devfn = bdf.split(':')
+            dev, fn = devfn.split('.')
+            key = (int(domain, 16), int(bus, 16), int(dev, 16), int(fn, 16))
+        except ValueError:
+            return None
+
+        with self._lock:
+            if action == PCIE_HOTPLUG_REMOVE:
+                device = self.devices.pop(key, None)
+            elif action in (PCIE_HOTPLUG_ADD, PCIE_HOTPLUG_CHANGE):
+                device = {"bus": bus, "dev": dev, "fn": fn}
+                vendor, _, device_id = uevent.get('PCI_ID', ':').lower().partition(':')
+                device["vendor"] = vendor or None
+                device["device"] = device_id or None
+                device["class"] = "%06x" % int(uevent['PCI_CLASS'], 16) if 'PCI_CLASS' in uevent else None
+                device["id"] = device["device"]
+                self.devices[key] = device
+            else:
+                return None
+
+        self._notify(action, bdf, device)
+        return (action, bdf)
+
+    def _notify(self, action, bdf, device):
+        for callback, bdfs in self._callbacks:
+            if bdfs is not None and bdf not in bdfs:
+                continue
+            try:
+                callback(action, bdf, device)
+            except Exception as e:
+                self.log.log_error("PCIe hotplug callback failed for {} {}: {}".format(action, bdf, str(e)))
+
+    def resync(self):
+        """
+        Re-scans the device table from sysfs and runs the callbacks for the
+        devices added, removed or changed since the table was last updated
+
+        Returns:
+            A list of the (action, bdf) applied, None if there is no PcieUtil
+            to scan sysfs with
+        """
+        if self.pcieutil is None:
+            return None
+        devices = self.pcieutil.get_pcie_sysfs_devices()
+        events = []
+        with self._lock:
+            old_devices = self.devices
+            self.devices = dict(devices)
+        for key in sorted(set(old_devices) | set(devices)):
+            if key not in devices:
+                events.append((PCIE_HOTPLUG_REMOVE, key, old_devices[key]))
+            elif key not in old_devices:
+                events.append((PCIE_HOTPLUG_ADD, key, devices[key]))
+            elif devices[key] != old_devices[key]:
+                events.append((PCIE_HOTPLUG_CHANGE, key, devices[key]))
+        for action, key, device in events:
+            self._notify(action, format_bdf(key), device)
+        return [(action, format_bdf(key)) for action, key, _ in events]
+
+    def poll(self, timeout=None):
+        """
+        Waits up to timeout seconds for one uevent and handles it
+
+        Returns:
+            (action, bdf) for a PCI event, None otherwise
+        """
+        try:
+            data = self.source.recv(timeout)
+        except OSError as e:
+            if e.errno != errno.ENOBUFS:
+                raise
+            # uevents were dropped, the table may have missed adds and removes
+            self.log.log_warning("PCIe hotplug uevents overflowed, re-scanning the PCIe devices")
+            self.resync()
+            return None
+        if not data:
+            return None
+        return self.handle_uevent(data)
+
+    def start(self, poll_interval=1):
+        """
+        Starts handling uevents in a background thread
+        """
+        if self._thread is not None:
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, args=(poll_interval,), name="pcie-hotplug")
+        self._thread.daemon = True
+        self._thread.start()
+
+    def _run(self, poll_interval):
+        while not self._stop_event.is_set():
+            try:
+                self.poll(poll_interval)
+            except Exception as e:
+                self.log.log_error("PCIe hotplug monitor error: {}".format(str(e)))
+                self._stop_event.wait(poll_interval)
+
+    def stop(self):
+        """
+        Stops the background thread and closes the uevent source
+        """
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self.source.close()
@@ -13,6 +13,8 @@ try:
     import time
     import socket
     import re
+    import threading
+    import contextlib
 except ImportError as e:
     raise ImportError (str(e) + "- required module not found")
 
@@ -75,7 +77,7 @@ class bcmshell (object):
 
         if logfileobj is None:
             self.logfileobj = None
-        elif type(logfileobj) is not file:
+        elif not hasattr(logfileobj, 'write'):
             raise TypeError("bcmshell.logfileobj must be a file object not %s" %
                             type(logfileobj))
         elif 'w' not in logfileobj.mode:
@@ -87,6 +89,10 @@ class bcmshell (object):
         self.socketobj = None
         self.buffer = ''
 
+        # register layouts, {reg: {module: [field, ...]}}, learnt from getreg
+        #
+        self.reg_layouts = dict()
+
         # text editing tools
         #
         self.re_oneline          = re.compile('\n\s+')
@@ -206,7 +212,37 @@ class bcmshell (object):
              'lb0:'[{'PG_MIN':0}, {'PG_MIN':0},... {'PG_MIN':0}]}
         """
         
-        # make sure everything is sane and read the register
+        return self.__parse_getreg__(reg, self.run(self.__getreg_cmd__(reg, fields)), fields)
+
+    #---------------
+    #
+    def getregs(self, regs, fields=False):
+
+        """Get several device registers in a single round trip to the diag
+        shell.  Returns a dict of register name to the value getreg() would
+        return for that register."""
+
+        regs = list(regs)
+        t = self.run_batch([self.__getreg_cmd__(R, fields) for R in regs])
+        return dict([(R, self.__parse_getreg__(R, T, fields)) for R, T in zip(regs, t)])
+
+    #---------------
+    #
+    def getreg_layout(self, reg):
+
+        """Return the layout of a register as a dict of module name to the list
+        of field names.  Layouts are cached, the diag shell is only queried the
+        first time a register is seen."""
+
+        if reg not in self.reg_layouts:
+            self.getreg(reg, True)
+        return self.reg_layouts[reg]
+
+    #---------------
+    #
+    def __getreg_cmd__(self, reg, fields):
+
+        # make sure everything is sane
         #
         if type(reg) is not str:
             raise TypeError("expecting string argument to bmcdiag.getreg(reg)")
@@ -216,9 +252,12 @@ class bcmshell (object):
             raise ValueError("unexpected whitespace in bmcdiag.getreg(%s)" % reg)
 
         if fields:
-            t = self.run('getreg ' + reg)
-        else:
-            t = self.run('getreg raw ' + reg)
+            return 'getreg ' + reg
+        return 'getreg raw ' + reg
+
+    #---------------
+    #
+    def __parse_getreg__(self, reg, t, fields):
 
         if 'Syntax error parsing' in t:
             raise RuntimeError('\"%s\" is not a register' % reg)
@@ -250,6 +289,11 @@ class bcmshell (object):
             else:
                 d[I[0]] = [I[1]]
 
+        # remember the layout of the register
+        #
+        if fields:
+            self.reg_layouts[reg] = dict([(I, sorted(d[I][0].keys())) for I in d])
+
         # now optimize the return
         #
         for I in iter(d):
@@ -257,7 +301,7 @@ class bcmshell (object):
                 d[I] = d[I][0]
 
         if len(d) == 1:
-            return d.values()[0]
+            return list(d.values())[0]
         else:
             return d
 
@@ -283,6 +327,53 @@ class bcmshell (object):
              {'HIGIG2': 0, 'PORT_TYPE': 0}]
         """
         
+        cmd = self.__gettable_cmd__(table, fields, start, entries)
+        return self.__parse_gettable__(table, self.run(cmd), fields, start, entries)
+
+    #---------------
+    #
+    def gettables(self, tables, fields=False):
+
+        """Get several device tables in a single round trip to the diag shell.
+        Returns a dict of table name to the list gettable() would return for
+        that table."""
+
+        tables = list(tables)
+        t = self.run_batch([self.__gettable_cmd__(T, fields) for T in tables])
+        return dict([(T, self.__parse_gettable__(T, O, fields)) for T, O in zip(tables, t)])
+
+    #---------------
+    #
+    def itertable(self, table, fields=False, start=None, entries=None):
+
+        """Generator version of gettable().  Table entries are parsed and
+        yielded as the dump is received from the diag shell, so large tables
+        are never buffered as a whole.  The connection must not be used for
+        anything else until the generator is exhausted."""
+
+        cmd = self.__gettable_cmd__(table, fields, start, entries)
+        pending = ''
+        for chunk in self.__run_stream__(cmd):
+            pending += chunk
+
+            # an entry is complete once the next one has started, continuation
+            # lines of an entry are indented
+            #
+            complete = [M.start() for M in re.finditer(r'\n(?=\S)', pending)]
+            if not complete:
+                continue
+            text, pending = pending[:complete[-1] + 1], pending[complete[-1] + 1:]
+            for v in self.__parse_gettable__(table, text, fields, start, entries):
+                yield v
+
+        if pending.strip():
+            for v in self.__parse_gettable__(table, pending, fields, start, entries):
+                yield v
+
+    #---------------
+    #
+    def __gettable_cmd__(self, table, fields, start=None, entries=None):
+
         if type(table) is not str:
             raise TypeError("bcmshell.gettable(table) expects string not %s" %
                             type(table))
@@ -300,8 +391,11 @@ class bcmshell (object):
         if start != None or entries != None:
             cmd += " %d" % (start or 0)
             cmd += " %d" % (entries or 1)
-        
-        t = self.run(cmd)
+        return cmd
+
+    #---------------
+    #
+    def __parse_gettable__(self, table, t, fields, start=None, entries=None):
 
         if 'Unknown option or memory' in t:
             raise RuntimeError('\"%s\" is not a table' % table)
@@ -397,38 +491,110 @@ class bcmshell (object):
         we detect the prompt.  cmd must be a string and must not include a
         newline, i.e. we expect a single command to be run per call."""
 
+        return self.run_batch([cmd])[0]
+
+    #---------------
+    #
+    def run_batch(self, cmds):
+
+        """Issue a list of commands to the diag shell in a single write and
+        collect the output of each of them.  The diag shell runs the commands
+        in order and prints the prompt after each of them, the outputs are
+        split on those prompts.  Returns the list of outputs, in command
+        order."""
+
+        cmds = list(cmds)
+        for cmd in cmds:
+            if type(cmd) is not str:
+                raise TypeError("expecting string argument to bmcdiag.run(cmd)")
+            elif cmd.find('\n') >= 0:
+                raise ValueError("unexpected newline in bmcdiag.run(cmd)")
+        if not cmds:
+            return []
+
+        self.__send__(''.join([C + '\n' for C in cmds]))
+
+        self.buffer = ''
+        outputs = []
+        pos = 0
+        quitting_time = time.time() + self.timeout
+        while len(outputs) < len(cmds):
+            self.buffer += self.__recv__(4096)
+            while len(outputs) < len(cmds):
+                found = self.re_prompt.search(self.buffer, pos)
+                if not found:
+                    break
+                outputs.append(self.buffer[pos:found.start(0)].lstrip('\r\n') if outputs
+                               else self.buffer[pos:found.start(0)])
+                pos = found.end(0)
+            if len(outputs) < len(cmds) and time.time() > quitting_time:
+                raise RuntimeError("accepting input for %d seconds" % self.timeout)
+
+        if pos != len(self.buffer):
+            raise RuntimeError("prompt detected in the middle of input")
+
+        if not self.keepopen:
+            self.close()
+        return outputs
+
+    #---------------
+    #
+    def __run_stream__(self, cmd):
+
+        """Issue the command to the diag shell and yield its output in chunks,
+        as it is received, up to the prompt."""
+
         if type(cmd) is not str:
             raise TypeError("expecting string argument to bmcdiag.run(cmd)")
         elif cmd.find('\n') >= 0:
             raise ValueError("unexpected newline in bmcdiag.run(cmd)")
 
-        self.__open__()
-        try:
-            self.socketobj.sendall(cmd + '\n')
-        except socket.error as err:
-            (errno, errstr) = err.args
-            raise IOError("unable to send command \"%s\", %s" % (cmd, errstr))
+        self.__send__(cmd + '\n')
 
+        # hold back enough input to recognize a prompt split across reads
+        #
         self.buffer = ''
-        self.socketobj.settimeout(self.timeout)
         quitting_time = time.time() + self.timeout
         while True:
-            try:
-                self.buffer += self.socketobj.recv(4096)
-            except socket.timeout:
-                raise RuntimeError("recv stalled for %d seconds" % self.timeout)
+            self.buffer += self.__recv__(4096)
             found = self.re_prompt.search(self.buffer)
             if found:
                 break
+            cut = self.buffer.rfind('\n')
+            if cut >= 0:
+                yield self.buffer[:cut + 1]
+                self.buffer = self.buffer[cut + 1:]
+                quitting_time = time.time() + self.timeout
             if time.time() > quitting_time:
                 raise RuntimeError("accepting input for %d seconds" % self.timeout)
 
         if found.end(0) != len(self.buffer):
             raise RuntimeError("prompt detected in the middle of input")
-        
+
         if not self.keepopen:
             self.close()
-        return self.buffer[:found.start(0)]
+        yield self.buffer[:found.start(0)]
+
+    #---------------
+    #
+    def __send__(self, data):
+        self.__open__()
+        try:
+            self.socketobj.sendall(data.encode())
+        except socket.error as err:
+            raise IOError("unable to send command \"%s\", %s" % (data.strip(), err))
+
+    #---------------
+    #
+    def __recv__(self, size):
+        self.socketobj.settimeout(self.timeout)
+        try:
+            data = self.socketobj.recv(size)
+        except socket.timeout:
+            raise RuntimeError("recv stalled for %d seconds" % self.timeout)
+        if not data:
+            raise RuntimeError("connection to %s closed by peer" % self.socketname)
+        return data.decode(errors='replace')
 
     #---------------
     #
@@ -475,12 +641,12 @@ class bcmshell (object):
 
             # flush out the socket in case it was left dirty
             try:
-                self.socketobj.sendall('echo bcmshell\n')
+                self.socketobj.sendall(b'echo bcmshell\n')
                 quitting_time = time.time() + self.timeout
                 buf = ''
                 while True:
                     try:
-                        buf += self.socketobj.recv(1024)
+                        buf += self.socketobj.recv(1024).decode(errors='replace')
                     except socket.timeout:
                         raise IOError("unable to receive data from %s for %d seconds" %
                                       (self.socketname, self.timeout))
@@ -496,6 +662,122 @@ class bcmshell (object):
                 (errno, errstr) = err.args
                 raise IOError("Socket error: unable to flush %s on open: %s" % (self.socketname, errstr))
             except IOError as e:
-                raise IOError("unable to flush %s on open: %s" % (self.socketname, e.message))
+                raise IOError("unable to flush %s on open: %s" % (self.socketname, str(e)))
             except Exception:
                 raise IOError("unable to flush %s on open" % self.socketname)
+
+
+#-------------------------------------------------------------------------------
+#
+
+class bcmshellpool (object):
+
+    """Thread safe pool of persistent bcmshell connections.  Opening the diag
+    shell socket costs a full command exchange, so callers with a steady
+    stream of register or table reads borrow an already open connection
+    instead of creating a bcmshell per call.  Register layouts learnt by a
+    connection are kept along with it.
+
+        pool = bcmshellpool(size=2)
+        with pool.connection() as shell:
+            regs = shell.getregs(['XLPORT_MODE_REG.xlport0', 'XLPORT_CONFIG.xe0'])
+        pool.close_all()"""
+
+    #---------------
+    #
+    def __init__(self, size=1, timeout=10,
+                 socketname="/var/run/docker-syncd/sswsyncd.socket", prompt=r'^drivshell>\s*$'):
+
+        """Constructor:
+
+        size - the maximum number of connections held open by the pool.  A
+        caller asking for a connection while all of them are in use waits for
+        one to be released.
+
+        timeout, socketname, prompt - passed to each bcmshell"""
+
+        if size <= 0:
+            raise ValueError("bcmshellpool.size must be > 0")
+
+        self.size = size
+        self.timeout = timeout
+        self.socketname = socketname
+        self.prompt = prompt
+        self.idle = []
+        self.created = 0
+        self.cond = threading.Condition()
+
+    #---------------
+    #
+    def acquire(self):
+
+        """Borrow a connection from the pool, creating one if the pool is not
+        yet full.  The connection must be handed back with release()"""
+
+        with self.cond:
+            while not self.idle and self.created >= self.size:
+                self.cond.wait()
+            if self.idle:
+                return self.idle.pop()
+            self.created += 1
+
+        try:
+            return bcmshell(keepopen=True, timeout=self.timeout, opennow=True,
+                            socketname=self.socketname, prompt=self.prompt)
+        except Exception:
+            with self.cond:
+                self.created -= 1
+                self.cond.notify()
+            raise
+
+    #---------------
+    #
+    def release(self, shell, discard=False):
+
+        """Hand a connection back to the pool.  A connection that failed in
+        the middle of a command is in an unknown state and is discarded"""
+
+        if discard:
+            try:
+                shell.close()
+            except Exception:
+                pass
+        with self.cond:
+            if discard:
+                self.created -= 1
+            else:
+                self.idle.append(shell)
+            self.cond.notify()
+
+    #---------------
+    #
+    @contextlib.contextmanager
+    def connection(self):
+
+        """Context manager around acquire() and release()"""
+
+        shell = self.acquire()
+        try:
+            yield shell
+        except Exception:
+            self.release(shell, discard=True)
+            raise
+        else:
+            self.release(shell)
+
+    #---------------
+    #
+    def close_all(self):
+
+        """Close all idle connections, e.g. to let other applications use the
+        diag shell.  The pool reopens connections on demand"""
+
+        with self.cond:
+            idle, self.idle = self.idle, []
+            self.created -= len(idle)
+            self.cond.notify_all()
+        for shell in idle:
+            try:
+                shell.close()
+            except Exception:
+                pass
@@ -11,6 +11,7 @@ try:
     import re
     import sys
     from collections import OrderedDict
+    from concurrent.futures import ThreadPoolExecutor
 
     from natsort import natsorted
     from portconfig import get_port_config
@@ -103,6 +104,18 @@ SFP_MODULE_THRESHOLD_WIDTH = 5
 SFP_CHANNL_THRESHOLD_OFFSET = 112
 SFP_CHANNL_THRESHOLD_WIDTH = 6
 
+# EEPROM regions (offset, width) captured by a transceiver EEPROM snapshot.
+# They cover every field read by the transceiver info, DOM and DOM threshold dicts.
+OSFP_SNAPSHOT_REGIONS = ((0, 256),)
+# QSFP lower page and upper page 0, followed by the upper page 3 thresholds
+QSFP_SNAPSHOT_REGIONS = ((0, 256), (512, 128))
+# SFP A0h identity data; A2h DOM data is exposed at offset 256
+SFP_A0_SNAPSHOT_REGIONS = ((0, 128),)
+SFP_A2_SNAPSHOT_REGIONS = ((256, 128),)
+
+# Default number of ports whose EEPROM snapshot is read concurrently
+SNAPSHOT_MAX_WORKERS = 8
+
 qsfp_cable_length_tup = ('Length(km)', 'Length OM3(2m)',
                          'Length OM2(m)', 'Length OM1(m)',
                          'Length Cable Assembly(m)')
@@ -142,6 +155,60 @@ class DeviceTreeError(SfpUtilError):
         return repr(self.value)
 
 
+class SfpEepromSnapshot(object):
+    """In-memory image of the EEPROM regions of one port.
+
+    The regions are read from sysfs once and then served to the transceiver
+    dict builders through file-like objects, so that building the info, DOM
+    and threshold dicts does not touch the hardware again."""
+
+    def __init__(self, port_num):
+        self.port_num = port_num
+        # device address -> list of (offset, raw bytes)
+        self._regions = {}
+
+    def add_region(self, devid, offset, raw):
+        self._regions.setdefault(devid, []).append((offset, bytes(raw)))
+
+    def has_device(self, devid):
+        return devid in self._regions
+
+    def read(self, devid, offset, num_bytes):
+        """Returns the bytes cached at [offset, offset + num_bytes) for devid.
+        The result is truncated where the range is not covered by the snapshot,
+        like a short read on the sysfs file."""
+        for region_offset, raw in self._regions.get(devid, []):
+            if region_offset <= offset < region_offset + len(raw):
+                start = offset - region_offset
+                return raw[start:start + num_bytes]
+        return b''
+
+    def get_eeprom_file(self, devid):
+        if devid not in self._regions:
+            return None
+        return _SnapshotEepromFile(self, devid)
+
+
+class _SnapshotEepromFile(object):
+    """Minimal read-only file object over one device of an SfpEepromSnapshot"""
+
+    def __init__(self, snapshot, devid):
+        self._snapshot = snapshot
+        self._devid = devid
+        self._pos = 0
+
+    def seek(self, offset):
+        self._pos = offset
+
+    def read(self, num_bytes):
+        raw = self._snapshot.read(self._devid, self._pos, num_bytes)
+        self._pos += len(raw)
+        return raw
+
+    def close(self):
+        pass
+
+
 class SfpUtilBase(object):
     """ Abstract base class for SFP utility. This class
     provides base EEPROM read attributes and methods common
@@ -406,6 +473,45 @@ class SfpUtilBase(object):
 
         return True
 
+    # Read all the given (offset, width) regions with a single open of the EEPROM file
+    def _read_eeprom_regions(self, file_path, regions):
+        if not self._sfp_eeprom_present(file_path, regions[0][0]):
+            return None
+
+        result = []
+        try:
+            with open(file_path, mode="rb", buffering=0) as sysfsfile_eeprom:
+                for offset, num_bytes in regions:
+                    sysfsfile_eeprom.seek(offset)
+                    raw = bytearray()
+                    # sysfs may return less than requested, keep reading till the region is complete
+                    while len(raw) < num_bytes:
+                        chunk = sysfsfile_eeprom.read(num_bytes - len(raw))
+                        if not chunk:
+                            break
+                        raw += chunk
+                    result.append((offset, raw))
+        except IOError:
+            print("Error: reading sysfs file %s" % file_path)
+            return None
+
+        return result
+
+    # Open the EEPROM of a port for reading, either from sysfs or from a snapshot
+    def _open_port_eeprom(self, port_num, devid, snapshot=None):
+        if snapshot is not None:
+            return snapshot.get_eeprom_file(devid)
+
+        file_path = self._get_port_eeprom_path(port_num, devid)
+        if not self._sfp_eeprom_present(file_path, 0):
+            return None
+
+        try:
+            return open(file_path, mode="rb", buffering=0)
+        except IOError:
+            print("Error: reading sysfs file %s" % file_path)
+            return None
+
     def _is_valid_port(self, port_num):
         if port_num >= self.port_start and port_num <= self.port_end:
             return True
@@ -815,7 +921,7 @@ class SfpUtilBase(object):
             return sfp_data
 
     # Read out SFP type, vendor name, PN, REV, SN from eeprom.
-    def get_transceiver_info_dict(self, port_num):
+    def get_transceiver_info_dict(self, port_num, snapshot=None):
         transceiver_info_dict = {}
         compliance_code_dict = {}
         dom_capability_dict = {}
@@ -832,15 +938,9 @@ class SfpUtilBase(object):
                 print("Error: sfp_object open failed")
                 return None
 
-            file_path = self._get_port_eeprom_path(port_num, self.IDENTITY_EEPROM_ADDR)
-            if not self._sfp_eeprom_present(file_path, 0):
-                print("Error, file not exist %s" % file_path)
-                return None
-
-            try:
-                sysfsfile_eeprom = open(file_path, mode="rb", buffering=0)
-            except IOError:
-                print("Error: reading sysfs file %s" % file_path)
+            sysfsfile_eeprom = self._open_port_eeprom(port_num, self.IDENTITY_EEPROM_ADDR, snapshot)
+            if sysfsfile_eeprom is None:
+                print("Error, unable to read EEPROM of port %d" % port_num)
                 return None
 
             sfp_type_raw = self._read_eeprom_specific_bytes(sysfsfile_eeprom, (offset + OSFP_TYPE_OFFSET), XCVR_TYPE_WIDTH)
@@ -882,7 +982,7 @@ class SfpUtilBase(object):
             try:
                 sysfsfile_eeprom.close()
             except IOError:
-                print("Error: closing sysfs file %s" % file_path)
+                print("Error: closing EEPROM file of port %d" % port_num)
                 return None
 
             transceiver_info_dict['type'] = sfp_type_data['data']['type']['value']
@@ -906,15 +1006,9 @@ class SfpUtilBase(object):
             transceiver_info_dict['dom_capability'] = '{}'
 
         else:
-            file_path = self._get_port_eeprom_path(port_num, self.IDENTITY_EEPROM_ADDR)
-            if not self._sfp_eeprom_present(file_path, 0):
-                print("Error, file not exist %s" % file_path)
-                return None
-
-            try:
-                sysfsfile_eeprom = open(file_path, mode="rb", buffering=0)
-            except IOError:
-                print("Error: reading sysfs file %s" % file_path)
+            sysfsfile_eeprom = self._open_port_eeprom(port_num, self.IDENTITY_EEPROM_ADDR, snapshot)
+            if sysfsfile_eeprom is None:
+                print("Error, unable to read EEPROM of port %d" % port_num)
                 return None
 
             if port_num in self.qsfp_ports:
@@ -999,7 +1093,7 @@ class SfpUtilBase(object):
             try:
                 sysfsfile_eeprom.close()
             except IOError:
-                print("Error: closing sysfs file %s" % file_path)
+                print("Error: closing EEPROM file of port %d" % port_num)
                 return None
 
             transceiver_info_dict['type'] = sfp_interface_bulk_data['data']['type']['value']
@@ -1055,7 +1149,7 @@ class SfpUtilBase(object):
 
         return transceiver_info_dict
 
-    def get_transceiver_dom_info_dict(self, port_num):
+    def get_transceiver_dom_info_dict(self, port_num, snapshot=None):
         transceiver_dom_info_dict = {}
 
         dom_info_dict_keys = ['temperature', 'voltage',  'rx1power',
@@ -1086,14 +1180,8 @@ class SfpUtilBase(object):
         elif port_num in self.qsfp_ports:
             offset = 0
             offset_xcvr = 128
-            file_path = self._get_port_eeprom_path(port_num, self.IDENTITY_EEPROM_ADDR)
-            if not self._sfp_eeprom_present(file_path, 0):
-                return None
-
-            try:
-                sysfsfile_eeprom = open(file_path, mode="rb", buffering=0)
-            except IOError:
-                print("Error: reading sysfs file %s" % file_path)
+            sysfsfile_eeprom = self._open_port_eeprom(port_num, self.IDENTITY_EEPROM_ADDR, snapshot)
+            if sysfsfile_eeprom is None:
                 return None
 
             sfpd_obj = sff8436Dom()
@@ -1166,7 +1254,7 @@ class SfpUtilBase(object):
             try:
                 sysfsfile_eeprom.close()
             except IOError:
-                print("Error: closing sysfs file %s" % file_path)
+                print("Error: closing EEPROM file of port %d" % port_num)
                 return None
 
             transceiver_dom_info_dict['temperature'] = dom_temperature_data['data']['Temperature']['value']
@@ -1182,14 +1270,8 @@ class SfpUtilBase(object):
 
         else:
             offset = 256
-            file_path = self._get_port_eeprom_path(port_num, self.DOM_EEPROM_ADDR)
-            if not self._sfp_eeprom_present(file_path, 0):
-                return None
-
-            try:
-                sysfsfile_eeprom = open(file_path, mode="rb", buffering=0)
-            except IOError:
-                print("Error: reading sysfs file %s" % file_path)
+            sysfsfile_eeprom = self._open_port_eeprom(port_num, self.DOM_EEPROM_ADDR, snapshot)
+            if sysfsfile_eeprom is None:
                 return None
 
             sfpd_obj = sff8472Dom()
@@ -1216,7 +1298,7 @@ class SfpUtilBase(object):
             try:
                 sysfsfile_eeprom.close()
             except IOError:
-                print("Error: closing sysfs file %s" % file_path)
+                print("Error: closing EEPROM file of port %d" % port_num)
                 return None
 
             transceiver_dom_info_dict['temperature'] = dom_temperature_data['data']['Temperature']['value']
@@ -1235,7 +1317,8 @@ class SfpUtilBase(object):
             transceiver_dom_info_dict['tx4power'] = 'N/A'
 
         return transceiver_dom_info_dict
-    def get_transceiver_dom_threshold_info_dict(self, port_num):
+
+    def get_transceiver_dom_threshold_info_dict(self, port_num, snapshot=None):
         transceiver_dom_threshold_info_dict = {}
 
         dom_info_dict_keys = ['temphighalarm',    'temphighwarning',
@@ -1256,14 +1339,8 @@ class SfpUtilBase(object):
             return transceiver_dom_threshold_info_dict
 
         elif port_num in self.qsfp_ports:
-            file_path = self._get_port_eeprom_path(port_num, self.IDENTITY_EEPROM_ADDR)
-            if not self._sfp_eeprom_present(file_path, 0):
-                return None
-
-            try:
-                sysfsfile_eeprom = open(file_path, mode="rb", buffering=0)
-            except IOError:
-                print("Error: reading sysfs file %s" % file_path)
+            sysfsfile_eeprom = self._open_port_eeprom(port_num, self.IDENTITY_EEPROM_ADDR, snapshot)
+            if sysfsfile_eeprom is None:
                 return None
 
             sfpd_obj = sff8436Dom()
@@ -1294,7 +1371,7 @@ class SfpUtilBase(object):
             try:
                 sysfsfile_eeprom.close()
             except IOError:
-                print("Error: closing sysfs file %s" % file_path)
+                print("Error: closing EEPROM file of port %d" % port_num)
                 return None
 
             # Threshold Data
@@ -1317,14 +1394,8 @@ class SfpUtilBase(object):
 
         else:
             offset = 256
-            file_path = self._get_port_eeprom_path(port_num, self.DOM_EEPROM_ADDR)
-            if not self._sfp_eeprom_present(file_path, 0):
-                return None
-
-            try:
-                sysfsfile_eeprom = open(file_path, mode="rb", buffering=0)
-            except IOError:
-                print("Error: reading sysfs file %s" % file_path)
+            sysfsfile_eeprom = self._open_port_eeprom(port_num, self.DOM_EEPROM_ADDR, snapshot)
+            if sysfsfile_eeprom is None:
                 return None
 
             sfpd_obj = sff8472Dom()
@@ -1350,7 +1421,7 @@ class SfpUtilBase(object):
             try:
                 sysfsfile_eeprom.close()
             except IOError:
-                print("Error: closing sysfs file %s" % file_path)
+                print("Error: closing EEPROM file of port %d" % port_num)
                 return None
 
             # Threshold Data
@@ -1377,6 +1448,86 @@ class SfpUtilBase(object):
 
         return transceiver_dom_threshold_info_dict
 
+    def get_transceiver_eeprom_snapshot(self, port_num):
+        """
+        Reads the EEPROM regions needed by get_transceiver_info_dict,
+        get_transceiver_dom_info_dict and get_transceiver_dom_threshold_info_dict
+        with a single open per EEPROM file.
+        :param port_num: Integer, index of physical port
+        :returns: SfpEepromSnapshot, or None if the EEPROM could not be read
+        """
+        snapshot = SfpEepromSnapshot(port_num)
+
+        if port_num in self.osfp_ports:
+            reads = [((self.IDENTITY_EEPROM_ADDR,), OSFP_SNAPSHOT_REGIONS)]
+        elif port_num in self.qsfp_ports:
+            reads = [((self.IDENTITY_EEPROM_ADDR,), QSFP_SNAPSHOT_REGIONS)]
+        else:
+            id_path = self._get_port_eeprom_path(port_num, self.IDENTITY_EEPROM_ADDR)
+            dom_path = self._get_port_eeprom_path(port_num, self.DOM_EEPROM_ADDR)
+            if id_path == dom_path:
+                # A0h and A2h are exposed by the same file, read both at once
+                reads = [((self.IDENTITY_EEPROM_ADDR, self.DOM_EEPROM_ADDR),
+                          SFP_A0_SNAPSHOT_REGIONS + SFP_A2_SNAPSHOT_REGIONS)]
+            else:
+                reads = [((self.IDENTITY_EEPROM_ADDR,), SFP_A0_SNAPSHOT_REGIONS),
+                         ((self.DOM_EEPROM_ADDR,), SFP_A2_SNAPSHOT_REGIONS)]
+
+        for devids, regions in reads:
+            file_path = self._get_port_eeprom_path(port_num, devids[0])
+            if file_path is None:
+                continue
+            raw_regions = self._read_eeprom_regions(file_path, regions)
+            if raw_regions is None:
+                continue
+            for devid in devids:
+                for offset, raw in raw_regions:
+                    snapshot.add_region(devid, offset, raw)
+
+        if not snapshot.has_device(self.IDENTITY_EEPROM_ADDR):
+            return None
+
+        return snapshot
+
+    def get_transceiver_bulk_info_dict(self, port_num):
+        """
+        Builds the transceiver info, DOM and DOM threshold dicts of a port from
+        one EEPROM snapshot.
+        :param port_num: Integer, index of physical port
+        :returns: dict with keys 'info', 'dom' and 'dom_threshold', each holding
+         the result of the corresponding get_transceiver_*_dict method, or None
+         if the EEPROM could not be read
+        """
+        snapshot = self.get_transceiver_eeprom_snapshot(port_num)
+        if snapshot is None:
+            return None
+
+        return {
+            'info': self.get_transceiver_info_dict(port_num, snapshot),
+            'dom': self.get_transceiver_dom_info_dict(port_num, snapshot),
+            'dom_threshold': self.get_transceiver_dom_threshold_info_dict(port_num, snapshot)
+        }
+
+    def get_all_transceiver_bulk_info_dict(self, port_list=None, max_workers=SNAPSHOT_MAX_WORKERS):
+        """
+        Multi-port variant of get_transceiver_bulk_info_dict. EEPROM snapshots of
+        different ports are read concurrently.
+        :param port_list: Iterable of physical port indices, defaults to the keys
+         of port_to_eeprom_mapping
+        :param max_workers: Integer, maximum number of ports read in parallel
+        :returns: dict where key = physical port index, value = result of
+         get_transceiver_bulk_info_dict for that port
+        """
+        if port_list is None:
+            port_list = self.port_to_eeprom_mapping.keys()
+        port_list = list(port_list)
+        if not port_list:
+            return {}
+
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(port_list)))) as executor:
+            results = executor.map(self.get_transceiver_bulk_info_dict, port_list)
+            return dict(zip(port_list, results))
+
     @abc.abstractmethod
     def get_presence(self, port_num):
         """
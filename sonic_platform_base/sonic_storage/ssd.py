@@ -14,6 +14,8 @@
 
 try:
     import re
+    import json
+    import time
     import subprocess
 
     from .storage_common import StorageCommon
@@ -23,6 +25,8 @@ except ImportError as e:
 
 
 SMARTCTL = "smartctl {} -a"
+# JSON report which also carries the plain text report in smartctl.output
+SMARTCTL_JSON = "smartctl {} -a --json=o"
 INNODISK = "iSmart -d {}"
 VIRTIUM  = "SmartCmd -m {}"
 
@@ -76,8 +80,18 @@ class SsdUtil(StorageCommon):
     disk_io_reads = NOT_AVAILABLE
     disk_io_writes = NOT_AVAILABLE
     reserved_blocks = NOT_AVAILABLE
+    ssd_json = None
 
-    def __init__(self, diskdev):
+    def __init__(self, diskdev, info_ttl=None):
+        """
+        Constructor
+
+        Args:
+            diskdev: Block device path of the SSD
+            info_ttl: Seconds after which the getters re-collect the disk
+                      information on their next call, None to collect it
+                      once at construction only
+        """
 
         self.log_identifier = "SsdUtil"
         self.log = syslogger.SysLogger(self.log_identifier)
@@ -96,12 +110,18 @@ class SsdUtil(StorageCommon):
         }
 
         self.dev = diskdev
+        # Cleared once smartctl is found not to support --json for this disk
+        self.smartctl_json_supported = True
+        self.info_ttl = info_ttl
+        self.info_timestamp = None
         self.fetch_parse_info(diskdev)
 
         StorageCommon.__init__(self, diskdev)
 
     def fetch_parse_info(self, diskdev):
 
+        self.info_timestamp = time.monotonic()
+
         # Generic part
         self.fetch_generic_ssd_info(diskdev)
         self.parse_generic_ssd_info()
@@ -154,9 +174,75 @@ class SsdUtil(StorageCommon):
         else:
             return None
 
+    def _refresh_info(self):
+        if self.info_ttl is not None and time.monotonic() - self.info_timestamp >= self.info_ttl:
+            self.fetch_parse_info(self.dev)
+
     def fetch_generic_ssd_info(self, diskdev):
+        self.ssd_json = None
+        if self.smartctl_json_supported:
+            output = self._execute_shell(SMARTCTL_JSON.format(diskdev))
+            try:
+                self.ssd_json = json.loads(output)
+                self.ssd_info = "\n".join(self.ssd_json["smartctl"]["output"]) + "\n"
+                return
+            except (TypeError, ValueError, KeyError):
+                self.ssd_json = None
+            if "UNRECOGNIZED OPTION" not in (output or ""):
+                # plain text report
+                self.ssd_info = output
+                return
+            self.smartctl_json_supported = False
+
         self.ssd_info = self._execute_shell(self.vendor_ssd_utility["Generic"]["utility"].format(diskdev))
 
+    def _get_ata_attribute_raw(self, attr_id):
+        for attr in self.ssd_json.get("ata_smart_attributes", {}).get("table", []):
+            if attr.get("id") == attr_id:
+                return str(attr.get("raw", {}).get("string", NOT_AVAILABLE)).split()[0]
+        return NOT_AVAILABLE
+
+    def parse_generic_ssd_json(self):
+        """
+        Fills the values the text report did not provide from the smartctl
+        JSON report
+        """
+        if not self.ssd_json:
+            return
+
+        for attr, key in (("model", "model_name"), ("serial", "serial_number"), ("firmware", "firmware_version")):
+            if getattr(self, attr) == NOT_AVAILABLE and key in self.ssd_json:
+                setattr(self, attr, str(self.ssd_json[key]))
+
+        current_temp = self.ssd_json.get("temperature", {}).get("current")
+        if "nvme" in self.dev:
+            health_log = self.ssd_json.get("nvme_smart_health_information_log", {})
+            if self.temperature == NOT_AVAILABLE and current_temp is not None:
+                self.temperature = float(current_temp)
+            if self.health == NOT_AVAILABLE and "percentage_used" in health_log:
+                self.health = 100 - float(health_log["percentage_used"])
+            if self.reserved_blocks == NOT_AVAILABLE and "available_spare" in health_log:
+                self.reserved_blocks = float(health_log["available_spare"])
+            if self.disk_io_reads == NOT_AVAILABLE and "data_units_read" in health_log:
+                self.disk_io_reads = "{:,}".format(health_log["data_units_read"])
+            if self.disk_io_writes == NOT_AVAILABLE and "data_units_written" in health_log:
+                self.disk_io_writes = "{:,}".format(health_log["data_units_written"])
+        else:
+            if self.temperature == NOT_AVAILABLE and current_temp is not None:
+                self.temperature = str(current_temp)
+            for health_id in GENERIC_HEALTH_ID:
+                if self.health != NOT_AVAILABLE:
+                    break
+                self.health = self._get_ata_attribute_raw(health_id)
+            if self.disk_io_reads == NOT_AVAILABLE:
+                self.disk_io_reads = self._get_ata_attribute_raw(GENERIC_IO_READS_ID)
+            if self.disk_io_writes == NOT_AVAILABLE:
+                self.disk_io_writes = self._get_ata_attribute_raw(GENERIC_IO_WRITES_ID)
+            for rbc_id in GENERIC_RESERVED_BLOCKS_ID:
+                if self.reserved_blocks != NOT_AVAILABLE:
+                    break
+                self.reserved_blocks = self._get_ata_attribute_raw(rbc_id)
+
     def parse_nvme_ssd_info(self):
         self.model = self._parse_re(r'Model Number:\s*(.+?)\n', self.ssd_info)
 
@@ -227,6 +313,8 @@ class SsdUtil(StorageCommon):
         self.serial = self._parse_re(r'Serial Number:\s*(.+?)\n', self.ssd_info)
         self.firmware = self._parse_re(r'Firmware Version:\s*(.+?)\n', self.ssd_info)
 
+        self.parse_generic_ssd_json()
+
     def parse_innodisk_info(self):
         if self.vendor_ssd_info:
             if self.health == NOT_AVAILABLE: self.health = self._parse_re(r'Health:\s*(.+?)%', self.vendor_ssd_info)
@@ -374,6 +462,11 @@ class SsdUtil(StorageCommon):
             self.health = NOT_AVAILABLE if health_raw == NOT_AVAILABLE else health_raw.split()[-1]
 
     def fetch_vendor_ssd_info(self, diskdev, model):
+        # smartctl based vendors reuse the generic report instead of running
+        # smartctl a second time
+        if self.vendor_ssd_utility[model]["utility"] == SMARTCTL and self.ssd_info:
+            self.vendor_ssd_info = self.ssd_info
+            return
         self.vendor_ssd_info = self._execute_shell(self.vendor_ssd_utility[model]["utility"].format(diskdev))
 
     def parse_vendor_ssd_info(self, model):
@@ -387,6 +480,7 @@ class SsdUtil(StorageCommon):
             A float number of current ssd health
             e.g. 83.5
         """
+        self._refresh_info()
         return self.health
 
     def get_temperature(self):
@@ -397,6 +491,7 @@ class SsdUtil(StorageCommon):
             A float number of current temperature in Celsius
             e.g. 40.1
         """
+        self._refresh_info()
         return self.temperature
 
     def get_model(self):
@@ -406,6 +501,7 @@ class SsdUtil(StorageCommon):
         Returns:
             A string holding disk model as provided by the manufacturer
         """
+        self._refresh_info()
         return self.model
 
     def get_firmware(self):
@@ -415,6 +511,7 @@ class SsdUtil(StorageCommon):
         Returns:
             A string holding disk firmware version as provided by the manufacturer
         """
+        self._refresh_info()
         return self.firmware
 
     def get_serial(self):
@@ -424,6 +521,7 @@ class SsdUtil(StorageCommon):
         Returns:
             A string holding disk serial number as provided by the manufacturer
         """
+        self._refresh_info()
         return self.serial
 
     def get_disk_io_reads(self):
@@ -433,6 +531,7 @@ class SsdUtil(StorageCommon):
         Returns:
             An integer value of the total number of I/O reads
         """
+        self._refresh_info()
         return self.disk_io_reads
 
     def get_disk_io_writes(self):
@@ -442,6 +541,7 @@ class SsdUtil(StorageCommon):
         Returns:
             An integer value of the total number of I/O writes
         """
+        self._refresh_info()
         return self.disk_io_writes
 
     def get_reserved_blocks(self):
@@ -451,6 +551,7 @@ class SsdUtil(StorageCommon):
         Returns:
             An integer value of the total number of reserved blocks
         """
+        self._refresh_info()
         return self.reserved_blocks
 
     def get_vendor_output(self):
@@ -460,6 +561,7 @@ class SsdUtil(StorageCommon):
         Returns:
             A string holding some vendor specific disk information
         """
+        self._refresh_info()
         return self.vendor_ssd_info
 
     def parse_id_number(self, id, buffer):
@@ -8,12 +8,131 @@
 try:
     import os
     import sys
-    import psutil
+    import time
+    import array
+    import threading
     from sonic_py_common import syslogger
     from .storage_base import StorageBase
 except ImportError as e:
     raise ImportError (str(e) + "- required module not found")
 
+DISKSTATS_PATH = "/proc/diskstats"
+# Interval, in seconds, during which one /proc/diskstats sample serves all disks
+DISKSTATS_INTERVAL = 1
+DISKSTATS_SECTOR_SIZE = 512
+
+# /proc/diskstats field indices, after major, minor and device name, of the
+# counters kept by the sampler, in column order
+DISKSTATS_FIELDS = (0, 2, 4, 6)
+DISKSTATS_READ_COUNT = 0
+DISKSTATS_READ_SECTORS = 1
+DISKSTATS_WRITE_COUNT = 2
+DISKSTATS_WRITE_SECTORS = 3
+
+
+class DiskStatsSampler(object):
+    """
+    Samples /proc/diskstats at most once per interval on behalf of all
+    StorageCommon instances. The counters of a sample are held in one flat
+    array, DISKSTATS_FIELDS columns per disk, and the previous sample is kept
+    to compute rates. Like psutil's disk_io_counters(nowrap=True), a counter
+    going backwards (it wrapped around, 32 bits on 32-bit kernels) is
+    compensated so that the sampled counters never decrease.
+    """
+
+    def __init__(self, path=DISKSTATS_PATH, interval=DISKSTATS_INTERVAL):
+        self.path = path
+        self.interval = interval
+        self.lock = threading.Lock()
+        self.index = {}
+        self.counters = array.array('Q')
+        self.timestamp = None
+        self.prev_index = {}
+        self.prev_counters = array.array('Q')
+        self.prev_timestamp = None
+        # counters as read, indexed like counters, and per disk the amounts
+        # added to its columns to compensate wrap arounds
+        self.raw_counters = array.array('Q')
+        self.offsets = {}
+
+    def sample(self, force=False):
+        """
+        Reads /proc/diskstats unless the current sample is younger than the
+        interval
+        """
+        with self.lock:
+            now = time.monotonic()
+            if not force and self.timestamp is not None and now - self.timestamp < self.interval:
+                return
+            index = {}
+            raw_counters = array.array('Q')
+            with open(self.path) as diskstats:
+                for line in diskstats:
+                    fields = line.split()
+                    if len(fields) < 3 + len(DISKSTATS_FIELDS) or fields[2] in index:
+                        continue
+                    index[fields[2]] = len(index)
+                    raw_counters.extend(int(fields[3 + field]) for field in DISKSTATS_FIELDS)
+
+            width = len(DISKSTATS_FIELDS)
+            counters = array.array('Q')
+            offsets = {}
+            for disk, position in index.items():
+                disk_offsets = list(self.offsets.get(disk, (0,) * width))
+                last = self.index.get(disk)
+                for column in range(width):
+                    value = raw_counters[position * width + column]
+                    if last is not None:
+                        last_value = self.raw_counters[last * width + column]
+                        if value < last_value:
+                            disk_offsets[column] += last_value
+                    counters.append(value + disk_offsets[column])
+                offsets[disk] = disk_offsets
+
+            self.prev_index, self.prev_counters, self.prev_timestamp = self.index, self.counters, self.timestamp
+            self.index, self.counters, self.timestamp = index, counters, now
+            self.raw_counters, self.offsets = raw_counters, offsets
+
+    def get_counter(self, disk, column):
+        """
+        Returns:
+            The DISKSTATS_FIELDS column of the disk in the current sample
+
+        Raises:
+            KeyError if the disk is not in /proc/diskstats
+        """
+        self.sample()
+        with self.lock:
+            return self.counters[self.index[disk] * len(DISKSTATS_FIELDS) + column]
+
+    def get_rates(self, disk):
+        """
+        Returns:
+            A dict of the read/write IOPS and bytes per second of the disk
+            between the two latest samples, None until two samples of the disk
+            are available
+        """
+        self.sample()
+        with self.lock:
+            if disk not in self.index or disk not in self.prev_index or self.timestamp <= self.prev_timestamp:
+                return None
+            width = len(DISKSTATS_FIELDS)
+            cur = self.index[disk] * width
+            prev = self.prev_index[disk] * width
+            elapsed = self.timestamp - self.prev_timestamp
+            delta = [max(self.counters[cur + column] - self.prev_counters[prev + column], 0)
+                     for column in range(width)]
+        return {
+            "read_iops": delta[DISKSTATS_READ_COUNT] / elapsed,
+            "write_iops": delta[DISKSTATS_WRITE_COUNT] / elapsed,
+            "read_bytes_per_sec": delta[DISKSTATS_READ_SECTORS] * DISKSTATS_SECTOR_SIZE / elapsed,
+            "write_bytes_per_sec": delta[DISKSTATS_WRITE_SECTORS] * DISKSTATS_SECTOR_SIZE / elapsed,
+        }
+
+
+diskstats_sampler = DiskStatsSampler()
+
+
 class StorageCommon(StorageBase, object):
     def __init__(self, diskdev):
         """
@@ -40,7 +159,7 @@ class StorageCommon(StorageBase, object):
 
         fsstats_reads = 0
         try:
-            fsstats_reads = int(psutil.disk_io_counters(perdisk=True, nowrap=True)[self.storage_disk].read_count)
+            fsstats_reads = diskstats_sampler.get_counter(self.storage_disk, DISKSTATS_READ_COUNT)
         except Exception as ex:
             self.log.log_warning("get_fs_io_reads exception: {}".format(ex))
             pass
@@ -60,9 +179,28 @@ class StorageCommon(StorageBase, object):
 
         fsstats_writes = 0
         try:
-            fsstats_writes = psutil.disk_io_counters(perdisk=True, nowrap=True)[self.storage_disk].write_count
+            fsstats_writes = diskstats_sampler.get_counter(self.storage_disk, DISKSTATS_WRITE_COUNT)
         except Exception as ex:
             self.log.log_warning("get_fs_io_writes exception: {}".format(ex))
             pass
 
         return fsstats_writes
+
+    def get_fs_io_rates(self):
+        """
+        Function to get the disk I/O rates from consecutive /proc/diskstats samples
+
+        Returns:
+            A dict with the read_iops, write_iops, read_bytes_per_sec and
+            write_bytes_per_sec of the disk, None until two samples are available
+
+        Args:
+            N/A
+        """
+
+        try:
+            return diskstats_sampler.get_rates(self.storage_disk)
+        except Exception as ex:
+            self.log.log_warning("get_fs_io_rates exception: {}".format(ex))
+
+        return None
@@ -9,6 +9,7 @@
 try:
     import os
     import sys
+    from concurrent.futures import ThreadPoolExecutor
     from sonic_py_common import syslogger
     from sonic_platform_base.sonic_storage.ssd import SsdUtil
     from sonic_platform_base.sonic_storage.emmc import EmmcUtil
@@ -27,6 +28,8 @@ BASE_PATH = "/sys/block"
 BLKDEV_BASE_PATH = "/dev"
 ssdutil_compatible_keys = ('sd', 'nvme')
 ssdutil_compatible_paths_strings = ('ata', 'nvme')
+# Storage device objects collect their disk information at construction
+STORAGE_DEVICES_MAX_WORKERS = 8
 
 class StorageDevices:
     def __init__(self):
@@ -47,13 +50,15 @@ class StorageDevices:
         Returns: N/A
 
         """
-        fdlist = os.listdir(BASE_PATH)
-        for fd in fdlist:
-            if 'boot' in fd or 'loop' in fd:
-                continue
-            else:
-                # Populate value for each key in dictionary with corresponding storage class object
-                self.devices[fd] = self._storage_device_object_factory(fd)
+        fdlist = [fd for fd in os.listdir(BASE_PATH) if 'boot' not in fd and 'loop' not in fd]
+        if not fdlist:
+            return
+
+        # Populate value for each key in dictionary with corresponding storage class object,
+        # the disks are queried in parallel
+        with ThreadPoolExecutor(max_workers=min(len(fdlist), STORAGE_DEVICES_MAX_WORKERS)) as executor:
+            for fd, device in zip(fdlist, executor.map(self._storage_device_object_factory, fdlist)):
+                self.devices[fd] = device
 
     def _storage_device_object_factory(self, key):
         """
@@ -12,3 +12,20 @@ class ThermalPolicyConditionBase(ThermalJsonObject):
         :return: True if condition matched else False.
         """
         raise NotImplementedError
+
+    def get_info_dependencies(self):
+        """
+        Get the thermal information types this condition reads. A condition declaring its dependencies
+        is only re-evaluated by a compiled policy run when one of them changed.
+        :return: An iterable of info type names, None if unknown and the condition must be evaluated every time.
+        """
+        return None
+
+    def is_stateless(self):
+        """
+        Indicate if the result of this condition only depends on its configuration and the thermal
+        information. A compiled policy run shares one evaluation between equal stateless conditions,
+        other conditions are evaluated separately for each policy using them.
+        :return: True if stateless else False.
+        """
+        return False
@@ -1,3 +1,5 @@
+import copy
+
 from .thermal_json_object import ThermalJsonObject
 
 
@@ -13,3 +15,37 @@ class ThermalPolicyInfoBase(object):
         """
         raise NotImplementedError
 
+    def is_changed(self):
+        """
+        Indicate if the information changed in the last collect. Conditions depending on unchanged
+        information are not re-evaluated by a compiled policy run. The default compares the attributes
+        of the object with those seen by the previous call, override it if the information is not held
+        in attributes, e.g. if it is read from the chassis by the conditions.
+        :return: True if changed or unknown, else False.
+        """
+        state = {}
+        for name, value in vars(self).items():
+            if name == '_last_collected_state':
+                continue
+            state[name] = copy.copy(value) if isinstance(value, (dict, list, set)) else value
+
+        last_state = getattr(self, '_last_collected_state', None)
+        self._last_collected_state = state
+        try:
+            return last_state is None or bool(state != last_state)
+        except Exception:
+            # attributes which cannot be compared
+            return True
+
+    def snapshot(self):
+        """
+        Copy the information for the policies to use while a new collection is running. The default
+        copies the object and its dict, list and set attributes, override it if collect mutates
+        deeper structures in place.
+        :return: A thermal information object.
+        """
+        clone = copy.copy(self)
+        for name, value in vars(self).items():
+            if isinstance(value, (dict, list, set)):
+                setattr(clone, name, copy.copy(value))
+        return clone
@@ -1,6 +1,14 @@
-import json
+try:
+    import json
+    import time
+    from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+    from sonic_py_common import syslogger
+except ImportError as e:
+    raise ImportError(str(e) + "- required module not found")
+
 from .thermal_policy import ThermalPolicy
 from .thermal_json_object import ThermalJsonObject
+from .thermal_profiler import ThermalControlProfiler
 
 
 class ThermalManagerBase(object):
@@ -15,6 +23,7 @@ class ThermalManagerBase(object):
     JSON_FIELD_FAN_SPEED_WHEN_SUSPEND = "fan_speed_when_suspend"
     JSON_FIELD_RUN_AT_BOOT_UP = "run_at_boot_up"
     JSON_FIELD_INTERVAL = "interval"
+    JSON_FIELD_INFO_REFRESH_INTERVAL = "refresh_interval"
 
     # Dictionary of ThermalPolicy objects.
     _policy_dict = {}
@@ -30,6 +39,65 @@ class ThermalManagerBase(object):
 
     _running = True
 
+    # Number of threads collecting thermal information concurrently, 0 collects serially.
+    _info_collect_workers = 0
+
+    # Seconds each collector may run in a concurrent collection, None waits for all collectors.
+    _info_collect_timeout = None
+
+    # Collector timeouts overriding _info_collect_timeout, keyed by info type name.
+    _info_collect_timeouts = {}
+
+    _info_collect_executor = None
+
+    # Collections still running after a timeout, keyed by info type name.
+    _info_collect_pending = {}
+
+    # Copies of the thermal information objects taken before their collection, handed to the policies
+    # while a timed out collector is still running, keyed by info type name.
+    _info_snapshots = {}
+
+    _log = None
+
+    # Refresh interval in seconds of info types which are not collected every cycle, keyed by info type name.
+    _info_refresh_interval = {}
+
+    # Time of the last collection of each info type.
+    _info_last_collect = {}
+
+    # Duration in seconds of the last collection of each info type.
+    _info_collect_time = {}
+
+    # Evaluate policies through the compiled condition graph.
+    _policy_compiled = False
+
+    # Compiled policies, a list of (policy, [condition index]), None until compiled.
+    _compiled_policies = None
+
+    # Distinct conditions of all policies, indexed by the compiled policies.
+    _compiled_conditions = []
+
+    # Info type names each compiled condition depends on, None if unknown.
+    _compiled_dependencies = []
+
+    # Whether each compiled condition is stateless, its result is then shared within a cycle.
+    _compiled_stateless = []
+
+    # Memoized condition results, condition index to (info generations, result).
+    _condition_results = {}
+
+    # Counter of the compiled policy runs.
+    _policy_cycle = 0
+
+    # Results of the stateless conditions in a policy run, condition index to (policy cycle, result).
+    _cycle_results = {}
+
+    # Counter of the changes of each info type.
+    _info_generation = {}
+
+    # ThermalControlProfiler recording the time spent in each step of the control loop, None if disabled.
+    _profiler = None
+
     @classmethod
     def initialize(cls):
         """
@@ -55,6 +123,9 @@ class ThermalManagerBase(object):
         :return:
         """
         cls._running = False
+        if cls._info_collect_executor is not None:
+            cls._info_collect_executor.shutdown(wait=False)
+            cls._info_collect_executor = None
 
     @classmethod
     def start_thermal_control_algorithm(cls):
@@ -87,6 +158,10 @@ class ThermalManagerBase(object):
             },
             {
               "type": "psu_info" # collect psu information for each iteration
+            },
+            {
+              "type": "sfp_info", # collect sfp information at most every 300 seconds
+              "refresh_interval": "300"
             }
           ],
           "policies": [
@@ -139,6 +214,9 @@ class ThermalManagerBase(object):
                     info_type = ThermalJsonObject.get_type(json_info)
                     info_obj = info_type()
                     cls._thermal_info_dict[json_info[ThermalJsonObject.JSON_FIELD_TYPE]] = info_obj
+                    if cls.JSON_FIELD_INFO_REFRESH_INTERVAL in json_info:
+                        cls._info_refresh_interval[json_info[ThermalJsonObject.JSON_FIELD_TYPE]] = \
+                            float(json_info[cls.JSON_FIELD_INFO_REFRESH_INTERVAL])
 
             if cls.JSON_FIELD_THERMAL_ALGORITHM in json_obj:
                 json_thermal_algorithm_config = json_obj[cls.JSON_FIELD_THERMAL_ALGORITHM]
@@ -171,6 +249,7 @@ class ThermalManagerBase(object):
             policy.load_from_json(json_policy)
             policy.validate_duplicate_policy(cls._policy_dict.values())
             cls._policy_dict[name] = policy
+            cls._compiled_policies = None
         else:
             raise Exception('{} not found in policy'.format(cls.JSON_FIELD_POLICY_NAME))
 
@@ -184,13 +263,214 @@ class ThermalManagerBase(object):
         if not cls._policy_dict:
             return
 
+        cycle_start = time.monotonic()
         cls._collect_thermal_information(chassis)
 
+        if cls._policy_compiled:
+            cls._run_compiled_policy()
+        else:
+            for policy in cls._policy_dict.values():
+                if not cls._running:
+                    return
+                if cls._match_policy(policy):
+                    cls._do_policy_action(policy)
+
+        if cls._profiler is not None:
+            cls._profiler.end_cycle(time.monotonic() - cycle_start, cls.get_interval())
+
+    @classmethod
+    def _get_policy_info_dict(cls):
+        """
+        Get the thermal information the policies are evaluated on. A collector still running after
+        its timeout is represented by the copy taken before it started.
+        :return: A dictionary of info type name to thermal information object.
+        """
+        if not cls._info_snapshots:
+            return cls._thermal_info_dict
+        info_dict = dict(cls._thermal_info_dict)
+        info_dict.update(cls._info_snapshots)
+        return info_dict
+
+    @classmethod
+    def _get_logger(cls):
+        """
+        Get the logger of the thermal manager, created on first use.
+        :return: A SysLogger.
+        """
+        if cls._log is None:
+            cls._log = syslogger.SysLogger("ThermalManager")
+        return cls._log
+
+    @classmethod
+    def _match_condition(cls, condition):
+        """
+        Evaluate a condition, timing it when profiling.
+        :param condition: The condition object.
+        :return: True if condition matched else False.
+        """
+        if cls._profiler is None:
+            return condition.is_match(cls._get_policy_info_dict())
+
+        start = time.monotonic()
+        try:
+            return condition.is_match(cls._get_policy_info_dict())
+        finally:
+            cls._profiler.record(ThermalControlProfiler.STEP_CONDITION, type(condition).__name__,
+                                 time.monotonic() - start)
+
+    @classmethod
+    def _match_policy(cls, policy):
+        """
+        Indicate if a policy matches, timing each of its conditions when profiling.
+        :param policy: The policy object.
+        :return: True if all conditions matches else False.
+        """
+        if cls._profiler is None:
+            return policy.is_match(cls._get_policy_info_dict())
+        return all(cls._match_condition(condition) for condition in policy.conditions.values())
+
+    @classmethod
+    def _do_policy_action(cls, policy):
+        """
+        Execute the actions of a matched policy, timing each of them when profiling.
+        :param policy: The policy object.
+        :return:
+        """
+        if cls._profiler is None:
+            policy.do_action(cls._get_policy_info_dict())
+            return
+
+        for action in policy.actions.values():
+            start = time.monotonic()
+            try:
+                action.execute(cls._get_policy_info_dict())
+            finally:
+                cls._profiler.record(ThermalControlProfiler.STEP_ACTION, type(action).__name__,
+                                     time.monotonic() - start)
+
+    @classmethod
+    def enable_profiler(cls, window=100, log_interval=None, logger=None):
+        """
+        Start profiling the thermal control loop.
+        :param window: Number of samples kept per step for the percentile summary.
+        :param log_interval: Seconds between two summaries written to logger, None disables logging.
+        :param logger: Callable receiving the summary message.
+        :return: The ThermalControlProfiler.
+        """
+        cls._profiler = ThermalControlProfiler(window, log_interval, logger)
+        return cls._profiler
+
+    @classmethod
+    def disable_profiler(cls):
+        """
+        Stop profiling the thermal control loop.
+        :return:
+        """
+        cls._profiler = None
+
+    @classmethod
+    def get_profile_summary(cls):
+        """
+        Get the per-step timing summary of the thermal control loop.
+        :return: See ThermalControlProfiler.get_summary, None if profiling is disabled.
+        """
+        if cls._profiler is None:
+            return None
+        return cls._profiler.get_summary()
+
+    @classmethod
+    def set_policy_compilation(cls, enabled):
+        """
+        Enable or disable compiled policy evaluation. Compiled evaluation evaluates equal stateless
+        conditions once per run for all the policies using them and re-evaluates a condition declaring
+        its info dependencies only when one of them changed.
+        :param enabled: True to evaluate compiled policies.
+        :return:
+        """
+        cls._policy_compiled = enabled
+        cls._compiled_policies = None
+
+    @classmethod
+    def _compile_policies(cls):
+        """
+        Build the condition dependency graph of the loaded policies.
+        :return: A list of (policy, [condition index]).
+        """
+        conditions = []
+        dependencies = []
+        stateless = []
+        compiled = []
         for policy in cls._policy_dict.values():
+            indices = []
+            for condition in policy.conditions.values():
+                for index, known in enumerate(conditions):
+                    if condition.is_stateless() and known.is_stateless() and \
+                            type(known) is type(condition) and known == condition and \
+                            getattr(known, '__dict__', None) == getattr(condition, '__dict__', None):
+                        break
+                else:
+                    index = len(conditions)
+                    conditions.append(condition)
+                    deps = condition.get_info_dependencies()
+                    dependencies.append(tuple(deps) if deps is not None else None)
+                    stateless.append(condition.is_stateless())
+                indices.append(index)
+            compiled.append((policy, indices))
+
+        cls._compiled_conditions = conditions
+        cls._compiled_dependencies = dependencies
+        cls._compiled_stateless = stateless
+        cls._condition_results = {}
+        cls._cycle_results = {}
+        cls._compiled_policies = compiled
+        return compiled
+
+    @classmethod
+    def _evaluate_condition(cls, index):
+        """
+        Evaluate a compiled condition, reusing its last result if none of its info dependencies changed.
+        A stateless condition is evaluated at most once per policy run, for all the policies sharing it.
+        :param index: Index of the condition.
+        :return: True if condition matched else False.
+        """
+        stateless = cls._compiled_stateless[index]
+        if stateless:
+            memo = cls._cycle_results.get(index)
+            if memo is not None and memo[0] == cls._policy_cycle:
+                return memo[1]
+
+        deps = cls._compiled_dependencies[index]
+        if deps is None:
+            result = cls._match_condition(cls._compiled_conditions[index])
+        else:
+            generations = tuple(cls._info_generation.get(info_type, 0) for info_type in deps)
+            memo = cls._condition_results.get(index)
+            if memo is not None and memo[0] == generations:
+                result = memo[1]
+            else:
+                result = cls._match_condition(cls._compiled_conditions[index])
+                cls._condition_results[index] = (generations, result)
+
+        if stateless:
+            cls._cycle_results[index] = (cls._policy_cycle, result)
+        return result
+
+    @classmethod
+    def _run_compiled_policy(cls):
+        """
+        Run each compiled policy, if one policy matches, execute the policy's action.
+        :return:
+        """
+        compiled = cls._compiled_policies
+        if compiled is None:
+            compiled = cls._compile_policies()
+        cls._policy_cycle += 1
+
+        for policy, indices in compiled:
             if not cls._running:
                 return
-            if policy.is_match(cls._thermal_info_dict):
-                policy.do_action(cls._thermal_info_dict)
+            if all(cls._evaluate_condition(index) for index in indices):
+                cls._do_policy_action(policy)
 
     @classmethod
     def _collect_thermal_information(cls, chassis):
@@ -199,10 +479,142 @@ class ThermalManagerBase(object):
         :param chassis: The chassis object.
         :return:
         """
-        for thermal_info in cls._thermal_info_dict.values():
+        for info_type, pending in list(cls._info_collect_pending.items()):
+            if not pending.done():
+                continue
+            del cls._info_collect_pending[info_type]
+            cls._info_snapshots.pop(info_type, None)
+            if pending.exception() is not None:
+                cls._get_logger().log_error('Thermal information {} collection failed: {}'.format(
+                    info_type, repr(pending.exception())))
+
+        now = time.monotonic()
+        due = []
+        for info_type, thermal_info in cls._thermal_info_dict.items():
+            if info_type in cls._info_collect_pending:
+                continue
+            refresh_interval = cls._info_refresh_interval.get(info_type)
+            last_collect = cls._info_last_collect.get(info_type)
+            if refresh_interval is not None and last_collect is not None and now - last_collect < refresh_interval:
+                continue
+            due.append((info_type, thermal_info))
+
+        if cls._info_collect_workers > 0 and len(due) > 1:
+            cls._collect_thermal_information_concurrently(chassis, due)
+            return
+
+        for info_type, thermal_info in due:
             if not cls._running:
                 return
+            cls._collect_info(info_type, thermal_info, chassis)
+
+    @classmethod
+    def _collect_info(cls, info_type, thermal_info, chassis):
+        """
+        Collect one thermal information object and record the time it took.
+        :param info_type: Type name of the thermal information.
+        :param thermal_info: The thermal information object.
+        :param chassis: The chassis object.
+        :return:
+        """
+        start = time.monotonic()
+        try:
             thermal_info.collect(chassis)
+            cls._info_last_collect[info_type] = start
+            if thermal_info.is_changed():
+                cls._info_generation[info_type] = cls._info_generation.get(info_type, 0) + 1
+        finally:
+            cls._info_collect_time[info_type] = time.monotonic() - start
+            if cls._profiler is not None:
+                cls._profiler.record(ThermalControlProfiler.STEP_INFO, info_type, cls._info_collect_time[info_type])
+
+    @classmethod
+    def _collect_thermal_information_concurrently(cls, chassis, due):
+        """
+        Collect thermal information objects in a bounded thread pool. Each collector has its own
+        deadline counted from the time it started running. A collector still running at its deadline
+        is left running and skipped until it completes, the policies meanwhile see the information
+        it held before. A collector not started before its deadline is cancelled.
+        :param chassis: The chassis object.
+        :param due: List of (info type name, thermal information object) to collect.
+        :return:
+        """
+        if cls._info_collect_executor is None:
+            cls._info_collect_executor = ThreadPoolExecutor(max_workers=cls._info_collect_workers)
+
+        started = {}
+
+        def collect(info_type, thermal_info):
+            started[info_type] = time.monotonic()
+            cls._collect_info(info_type, thermal_info, chassis)
+
+        futures = {}
+        submitted = {}
+        for info_type, thermal_info in due:
+            timeout = cls._info_collect_timeouts.get(info_type, cls._info_collect_timeout)
+            snapshot = thermal_info.snapshot() if timeout is not None else None
+            future = cls._info_collect_executor.submit(collect, info_type, thermal_info)
+            futures[future] = (info_type, timeout, snapshot)
+            submitted[info_type] = time.monotonic()
+
+        done = []
+        not_done = set(futures)
+        while not_done:
+            now = time.monotonic()
+            next_deadline = None
+            for future in list(not_done):
+                info_type, timeout, snapshot = futures[future]
+                if timeout is None:
+                    continue
+                deadline = started.get(info_type, submitted[info_type]) + timeout
+                if now < deadline:
+                    next_deadline = deadline if next_deadline is None else min(next_deadline, deadline)
+                    continue
+                not_done.discard(future)
+                if future.cancel():
+                    cls._get_logger().log_warning('Thermal information {} not started within {} seconds'.format(
+                        info_type, timeout))
+                    continue
+                if future.done():
+                    done.append(future)
+                    continue
+                cls._info_collect_pending[info_type] = future
+                cls._info_snapshots[info_type] = snapshot
+                cls._get_logger().log_warning('Thermal information {} not collected within {} seconds'.format(
+                    info_type, timeout))
+            if not not_done:
+                break
+            wait_time = None if next_deadline is None else max(next_deadline - now, 0)
+            finished, not_done = wait(not_done, timeout=wait_time, return_when=FIRST_COMPLETED)
+            done.extend(finished)
+
+        for future in done:
+            # re-raise collection errors as the serial collection does
+            future.result()
+
+    @classmethod
+    def set_info_collect_concurrency(cls, workers, timeout=None, info_timeouts=None):
+        """
+        Enable or disable the concurrent collection of thermal information.
+        :param workers: Number of collector threads, 0 to collect serially.
+        :param timeout: Seconds each collector may run, None to wait for all of them.
+        :param info_timeouts: Dictionary of info type name to the timeout of its collector, overriding timeout.
+        :return:
+        """
+        if cls._info_collect_executor is not None:
+            cls._info_collect_executor.shutdown(wait=False)
+            cls._info_collect_executor = None
+        cls._info_collect_workers = workers
+        cls._info_collect_timeout = timeout
+        cls._info_collect_timeouts = dict(info_timeouts) if info_timeouts else {}
+
+    @classmethod
+    def get_info_collect_time(cls):
+        """
+        Get the duration of the last collection of each thermal information type.
+        :return: A dictionary of info type name to seconds.
+        """
+        return dict(cls._info_collect_time)
 
     @classmethod
     def init_thermal_algorithm(cls, chassis):
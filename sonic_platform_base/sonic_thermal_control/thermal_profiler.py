@@ -0,0 +1,109 @@
+import time
+from collections import deque
+
+
+class ThermalControlProfiler(object):
+    """
+    Class recording the time spent by each step of the thermal control loop: the collection of each
+    thermal information type, the evaluation of each condition and the execution of each action.
+    Samples are kept in rolling windows and summarized as percentiles.
+    """
+    # Step name prefixes.
+    STEP_INFO = 'info'
+    STEP_CONDITION = 'condition'
+    STEP_ACTION = 'action'
+    STEP_CYCLE = 'cycle'
+
+    DEFAULT_PERCENTILES = (50, 90, 99)
+
+    def __init__(self, window=100, log_interval=None, logger=None):
+        """
+        Constructor.
+        :param window: Number of samples kept per step.
+        :param log_interval: Seconds between two summaries written to logger, None disables logging.
+        :param logger: Callable receiving the summary message, e.g. a SysLogger's log_info.
+        """
+        self.window = window
+        self.log_interval = log_interval
+        self.logger = logger
+        self.reset()
+
+    def reset(self):
+        """
+        Drop all recorded samples and counters.
+        :return:
+        """
+        self.samples = {}
+        self.cycles = 0
+        self.overruns = 0
+        self.last_log = time.monotonic()
+
+    def record(self, step, name, seconds):
+        """
+        Record the duration of a step.
+        :param step: One of the STEP_* prefixes.
+        :param name: Name of the info type, condition or action.
+        :param seconds: Duration of the step.
+        :return:
+        """
+        key = '{}.{}'.format(step, name)
+        samples = self.samples.get(key)
+        if samples is None:
+            samples = self.samples[key] = deque(maxlen=self.window)
+        samples.append(seconds)
+
+    def end_cycle(self, seconds, interval):
+        """
+        Record the duration of a whole thermal control cycle and count it as an overrun if it took
+        longer than the policy interval. Writes the summary to the logger when due.
+        :param seconds: Duration of the cycle.
+        :param interval: The thermal manager's interval, see ThermalManagerBase.get_interval().
+        :return:
+        """
+        self.record(self.STEP_CYCLE, 'total', seconds)
+        self.cycles += 1
+        if seconds > interval:
+            self.overruns += 1
+
+        if self.logger is not None and self.log_interval is not None:
+            now = time.monotonic()
+            if now - self.last_log >= self.log_interval:
+                self.last_log = now
+                self.logger(self.format_summary())
+
+    @staticmethod
+    def _percentile(ordered, percentile):
+        # nearest-rank percentile of a sorted list
+        rank = max(int(-(-percentile * len(ordered) // 100)), 1)
+        return ordered[min(rank, len(ordered)) - 1]
+
+    def get_summary(self, percentiles=DEFAULT_PERCENTILES):
+        """
+        Summarize the recorded samples.
+        :param percentiles: Percentiles to compute.
+        :return: A dictionary like
+                 {'cycles': 10, 'overruns': 1,
+                  'steps': {'info.fan_info': {'count': 10, 'last': 0.2, 'max': 0.5, 'p50': 0.2, ...}}}
+        """
+        steps = {}
+        for key, samples in self.samples.items():
+            if not samples:
+                continue
+            ordered = sorted(samples)
+            summary = {'count': len(ordered), 'last': samples[-1], 'max': ordered[-1]}
+            for percentile in percentiles:
+                summary['p{}'.format(percentile)] = self._percentile(ordered, percentile)
+            steps[key] = summary
+        return {'cycles': self.cycles, 'overruns': self.overruns, 'steps': steps}
+
+    def format_summary(self):
+        """
+        Format the summary as a single log line, slowest steps first.
+        :return: A string.
+        """
+        summary = self.get_summary()
+        steps = sorted(summary['steps'].items(), key=lambda item: item[1]['p90'], reverse=True)
+        return 'Thermal control profile: cycles {} overruns {}; {}'.format(
+            summary['cycles'], summary['overruns'],
+            ', '.join('{} p50 {:.3f}s p90 {:.3f}s max {:.3f}s'.format(key, step['p50'], step['p90'], step['max'])
+                      for key, step in steps))
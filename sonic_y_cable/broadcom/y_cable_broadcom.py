@@ -5,7 +5,9 @@
 #   API's for Y cable functionality in SONiC
 #
 #from y_cable_base import YCableBase
-from sonic_y_cable.y_cable_base import YCableBase
+from sonic_y_cable.y_cable_base import YCableBase, firmware_operation
+from sonic_y_cable.y_cable_trace import (TRACE_LOCK_HOLD, TRACE_LOCK_WAIT, TRACE_MCU_CMD, get_trace_stats, record,
+                                         trace_chassis, trace_y_cable_apis)
 
 try:
     import time
@@ -238,39 +240,63 @@ def debug_print(log_msg):
 
 
 class PortLock(object):
-    def __init__(self, port_nbr):
+    def __init__(self, port_nbr, name="lock"):
         self.port_nbr = port_nbr
+        self.name = name
         self.lock = threading.RLock()
+        # nesting depth and time of the outermost acquisition, only
+        # updated by the thread holding the lock
+        self.depth = 0
+        self.acquired_at = 0
+
+    def __acquire_traced(self, timeout=-1):
+        # accounts the time spent waiting for the lock, see y_cable_trace
+        start = time.monotonic()
+        result = self.lock.acquire(timeout=timeout)
+        now = time.monotonic()
+        record(self.port_nbr, TRACE_LOCK_WAIT, self.name, now - start, not result)
+        if result:
+            self.depth += 1
+            if self.depth == 1:
+                self.acquired_at = now
+        return result
+
+    def __release_traced(self):
+        # accounts the time the lock was held, from the outermost acquisition
+        self.depth -= 1
+        if self.depth == 0:
+            record(self.port_nbr, TRACE_LOCK_HOLD, self.name, time.monotonic() - self.acquired_at)
+        self.lock.release()
 
     # def __del__(self):
     #   print("PortLock {} destroyed".format(self.port_nbr))
 
     def __enter__(self):
-        self.lock.acquire()
+        self.__acquire_traced()
         debug_print("(with) acquired lock for port {}".format(self.port_nbr))
 
     def __exit__(self, exc_type, exc_value, traceback):
-        self.lock.release()
+        self.__release_traced()
         debug_print("(with) released lock for port {}".format(self.port_nbr))
 
     @contextmanager
     def acquire_timeout(self, timeout):
-        result = self.lock.acquire(timeout=timeout)
+        result = self.__acquire_traced(timeout)
         debug_print("(with timeout) acquired lock for port {}".format(self.port_nbr))
         yield result
         if result:
-            self.lock.release()
+            self.__release_traced()
             debug_print("(with timeout) released lock for port {}".format(self.port_nbr))
 
     def get_port_nbr(self):
         return self.port_nbr
 
     def acquire(self):
-        self.lock.acquire()
+        self.__acquire_traced()
         debug_print("explicitly acquired lock for port {}".format(self.port_nbr))
 
     def release(self):
-        self.lock.release()
+        self.__release_traced()
         debug_print("explicitly released lock for port {}".format(self.port_nbr))
 
 #
@@ -278,6 +304,7 @@ class PortLock(object):
 #
 
 
+@trace_y_cable_apis
 class YCable(YCableBase):
 
 
@@ -350,6 +377,10 @@ class YCable(YCableBase):
 
     PORT_LOCK_TIMEOUT = 30  # in seconds
 
+    # bounded backoff between two reads of the cable command status
+    CMD_STS_POLL_BACKOFF_MIN = 0.0002  # in seconds
+    CMD_STS_POLL_BACKOFF_MAX = 0.005  # in seconds
+
     # Rollback states
     PERFORM_ROLLBACK = 1
     ALREADY_ROLLED_BACK = 2
@@ -662,10 +693,17 @@ class YCable(YCableBase):
         self.platform_chassis = None
         self.debug_dump_list = {}
         self.sfp = None
-        self.lock = PortLock(port)
-        self.fp_lock = PortLock(port)
-        self.dl_lock = PortLock(port)
-        self.ev_lock = PortLock(port)
+        self.lock = PortLock(port, "lock")
+        self.fp_lock = PortLock(port, "fp_lock")
+        self.dl_lock = PortLock(port, "dl_lock")
+        self.ev_lock = PortLock(port, "ev_lock")
+
+        # cable commands waiting for cable_cmd_queue_flush()
+        self.cmd_queue = []
+        self.cmd_queue_lock = threading.Lock()
+        # last firmware versions read per MCU, returned by get_firmware_version()
+        # while a firmware operation holds dl_lock
+        self.fw_version_cache = {}
 
         # add functions for CLI execution
         self.init_cli_functions()
@@ -674,7 +712,7 @@ class YCable(YCableBase):
         super(YCable, self).__init__(port, logger1)
         try:
             #self.platform_chassis = chassis()
-            self.platform_chassis = sonic_platform.platform.Platform().get_chassis()
+            self.platform_chassis = trace_chassis(sonic_platform.platform.Platform().get_chassis())
             self.sfp = self.platform_chassis.get_sfp(self.port)
 
             logger1.log_info("chassis loaded {}".format(self.platform_chassis))
@@ -976,6 +1014,37 @@ class YCable(YCableBase):
 
         return core_ip, lane_mask, mode
 
+    def __cable_cmd_poll_sts(self, done, timeout_ms):
+        """
+            Internal function, polls the cable command status byte until done(status) is True,
+            sleeping with a bounded exponential backoff between the reads instead of spinning
+
+            Args:
+                done:
+                    callable taking the status byte, returns True when polling is over
+                timeout_ms:
+                    polling timeout in milliseconds
+
+            Returns:
+                a boolean, True if done, False on timeout, None if the eeprom read failed
+                an integer, the last status byte read
+        """
+
+        deadline = time.monotonic() + timeout_ms / 1000.0
+        backoff = self.CMD_STS_POLL_BACKOFF_MIN
+        while True:
+            result = self.platform_chassis.get_sfp(self.port).read_eeprom(self.QSFP_BRCM_CABLE_CTRL_CMD_STS, 1)
+            if result is None:
+                return None, None
+            sta = result[0]
+            if done(sta):
+                return True, sta
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False, sta
+            time.sleep(min(backoff, remaining))
+            backoff = min(backoff * 2, self.CMD_STS_POLL_BACKOFF_MAX)
+
     def __cable_cmd_execute(self, command_id, cmd_hdr, cmd_req_body):
         """
             Internal function, sends command request to MCU and returns the response from MCU
@@ -994,190 +1063,276 @@ class YCable(YCableBase):
                 byte array, cmd_rsp_body containing command response
         """
 
-        start_ts = datetime.utcnow()
+        if self.platform_chassis is None:
+            self.log(self.LOG_ERROR, "platform_chassis is not loaded, failed to check if link is Active on TOR B side")
+            return self.ERROR_PLATFORM_NOT_LOADED, None
+
+        debug_print("Trying for the lock")
+        with self.lock.acquire_timeout(self.PORT_LOCK_TIMEOUT) as result:
+            if not result:
+                self.log(self.LOG_ERROR, "Port lock timed-out!")
+                return self.ERROR_PORT_LOCK_TIMEOUT, None
+            return self.__cable_cmd_execute_locked(command_id, cmd_hdr, cmd_req_body)
+
+    def __cable_cmd_execute_locked(self, command_id, cmd_hdr, cmd_req_body):
+        """
+            Internal function, body of __cable_cmd_execute, the port lock must be held.
+            Records the command latency, see get_cable_cmd_stats().
+        """
+
+        start = time.monotonic()
+        ret_val, cmd_rsp_body = self.__cable_cmd_transact(command_id, cmd_hdr, cmd_req_body)
+        elapsed = time.monotonic() - start
+
+        record(self.port, TRACE_MCU_CMD, "cable_cmd_{}".format(command_id), elapsed, ret_val != 0)
+
+        self.log(self.LOG_DEBUG, "__cable_cmd_execute() command {} completed in {:.3f}ms".format(command_id, elapsed * 1000))
+        return ret_val, cmd_rsp_body
+
+    def __cable_cmd_transact(self, command_id, cmd_hdr, cmd_req_body):
+        """
+            Internal function, performs the command handshake with the MCU
+        """
+
         ts = datetime.utcnow()
-        curr_offset = None
         cmd_rsp_body = None
         ret_val = 0
 
-        if self.platform_chassis is not None:
+        # read cable command and status offsets
+        result = self.platform_chassis.get_sfp(self.port).read_eeprom(self.QSFP_BRCM_CABLE_CMD, 2)
+        if result is None:
+            self.log(self.LOG_ERROR, "read eeprom failed")
+            return self.EEPROM_ERROR, None
 
-            debug_print("Trying for the lock")
-            with self.lock.acquire_timeout(self.PORT_LOCK_TIMEOUT) as result:
-                if result:
-                    ts = self.log_timestamp(ts, "lock acquired")
-                    # read cable command and status offsets
-                    curr_offset = self.QSFP_BRCM_CABLE_CMD
-                    result = self.platform_chassis.get_sfp(self.port).read_eeprom(curr_offset, 2)
-                    if result is None:
-                        self.log(self.LOG_ERROR, "read eeprom failed")
-                        return self.EEPROM_ERROR, None
-
-                    cmd_req = result[0]
-                    cmd_sts = result[1]
-                    ts = self.log_timestamp(ts, "read cmd/sts done")
-
-                    # if command request and status both are 1,
-                    #    write 0 to cmd req and
-                    #    wait for status to go 0
-                    if ((cmd_req & 0x01) == 1) and ((cmd_sts & 0x01) == 1):
-                        cmd_req = 0
-                        curr_offset = self.QSFP_BRCM_CABLE_CMD
-                        buffer1 = bytearray([cmd_req])
-                        result = self.platform_chassis.get_sfp(self.port).write_eeprom(curr_offset, 1, buffer1)
-                        if result is False:
-                            return self.ERROR_WR_EEPROM_FAILED, None
-
-                        # poll command status for 100ms
-                        start = time.monotonic_ns()
-                        ms_elapsed = 0
-                        while (ms_elapsed < 100):
-                            sta = 0
-                            curr_offset = self.QSFP_BRCM_CABLE_CTRL_CMD_STS
-                            result = self.platform_chassis.get_sfp(self.port).read_eeprom(curr_offset, 1)
-                            if result is None:
-                                return self.EEPROM_ERROR, None
-                            sta = result[0]
-
-                            if (sta & 0x01) == 0x0:
-                                break
-                            ms_elapsed = (time.monotonic_ns()//1000000) - (start//1000000)
-                        else:
-                            self.log(self.LOG_ERROR, "CMD_REQ/STS both are stuck at 1")
-                            return self.ERROR_CMD_STS_CHECK_FAILED, None
-                        ts = self.log_timestamp(ts, "resetting cmd to 0 done (error logic)")
-                    self.log(self.LOG_DEBUG, "Currently processing COMMAND ID is {}".format(command_id))
-                    # check if any command is currently being executed
-                    if ((cmd_req & 0x01) == 0) and ((cmd_sts & 0x01) == 0):
-                        #
-                        #    Combine the write of the cable command header
-                        #    - write the request parameter len
-                        #    - write the response parameter len
-                        #    - write the BH lane mask (Client)
-                        #    - write the LW lane mask (Line)
-                        #    - write the core ip value
-                        #
-
-                        # skip sending cmd_hdr for SET_HMUX_CONTEXT_PRI and SET_HMUX_CONTEXT_SEC
-                        if ((command_id < self.CABLE_CMD_ID_SET_HMUX_CONTEXT_PRI) or
-                            (command_id >= self.CABLE_CMD_ID_READ_MCU_RAM)):
-                            curr_offset = self.QSFP_VEN_FE_130_BRCM_DATA_LENGHT_LSB
-                            result = self.platform_chassis.get_sfp(self.port).write_eeprom(curr_offset, 5, cmd_hdr)
-                            if result is False:
-                                self.log(self.LOG_ERROR, "write_eeprom() failed")
-                                return self.ERROR_WRITE_EEPROM_FAILED, None
-                            ts = self.log_timestamp(ts, "writing of cmd_hdr 5 bytes done")
-                        else:
-                            curr_offset = self.QSFP_VEN_FE_130_BRCM_DATA_LENGHT_LSB + 1
-                            cmd_rsp_len = cmd_hdr[1]
-                            buffer1 = bytearray([cmd_rsp_len])
-                            result = self.platform_chassis.get_sfp(self.port).write_eeprom(curr_offset, 1, buffer1)
-                            if result is False:
-                                self.log(self.LOG_ERROR, "write_eeprom() failed")
-                                return self.ERROR_WRITE_EEPROM_FAILED, None
-                            ts = self.log_timestamp(ts, "writing of cmd_hdr (only rsp_len) 1 byte done")
-
-                        # write request data
-                        wr_len = cmd_hdr[0]
-                        if wr_len > 0:
-                            curr_offset = self.CMD_REQ_PARAM_START_OFFSET
-                            result = self.platform_chassis.get_sfp(
-                                self.port).write_eeprom(curr_offset, wr_len, cmd_req_body)
-                            if result is False:
-                                return self.ERROR_WR_EEPROM_FAILED, None
-                        ts = self.log_timestamp(ts, "write request data done - bytes {}".format(wr_len))
-
-                        # write the command request byte now
-                        cmd_req = 1
-                        cmd_req = (cmd_req | (command_id << 1))
-                        curr_offset = self.QSFP_BRCM_CABLE_CMD
-                        buffer1 = bytearray([cmd_req])
-                        result = self.platform_chassis.get_sfp(self.port).write_eeprom(curr_offset, 1, buffer1)
-                        if result is False:
-                            return self.ERROR_WR_EEPROM_FAILED, None
-                        rd = False
-                        ts = self.log_timestamp(ts, "write command request to 1 done")
-
-                        error = 0
-                        start = time.monotonic_ns()
-                        ms_elapsed = 0
-                        while (ms_elapsed < 500):
-                            sta = 0
-                            curr_offset = self.QSFP_BRCM_CABLE_CTRL_CMD_STS
-                            result = self.platform_chassis.get_sfp(self.port).read_eeprom(curr_offset, 1)
-                            if result is None:
-                                return self.EEPROM_ERROR, None
-                            sta = result[0]
-
-                            if (sta & 0x7F) == 0x11:
-                                rd = True
-                                break
+        cmd_req = result[0]
+        cmd_sts = result[1]
+        ts = self.log_timestamp(ts, "read cmd/sts done")
+
+        # if command request and status both are 1,
+        #    write 0 to cmd req and
+        #    wait for status to go 0
+        if ((cmd_req & 0x01) == 1) and ((cmd_sts & 0x01) == 1):
+            cmd_req = 0
+            buffer1 = bytearray([cmd_req])
+            result = self.platform_chassis.get_sfp(self.port).write_eeprom(self.QSFP_BRCM_CABLE_CMD, 1, buffer1)
+            if result is False:
+                return self.ERROR_WR_EEPROM_FAILED, None
+
+            # poll command status for 100ms
+            done, sta = self.__cable_cmd_poll_sts(lambda sta: (sta & 0x01) == 0x0, 100)
+            if done is None:
+                return self.EEPROM_ERROR, None
+            if not done:
+                self.log(self.LOG_ERROR, "CMD_REQ/STS both are stuck at 1")
+                return self.ERROR_CMD_STS_CHECK_FAILED, None
+            ts = self.log_timestamp(ts, "resetting cmd to 0 done (error logic)")
+        self.log(self.LOG_DEBUG, "Currently processing COMMAND ID is {}".format(command_id))
+
+        # check if any command is currently being executed
+        if ((cmd_req & 0x01) != 0) or ((cmd_sts & 0x01) != 0):
+            return self.ERROR_MCU_BUSY, None
+
+        #
+        #    The cable command header is immediately followed by the request
+        #    parameters, so both go out in a single write:
+        #    - the request parameter len
+        #    - the response parameter len
+        #    - the BH lane mask (Client)
+        #    - the LW lane mask (Line)
+        #    - the core ip value
+        #    - the request data
+        #
+        wr_len = cmd_hdr[0]
+        req_body = bytearray(cmd_req_body[:wr_len]) if wr_len > 0 else bytearray()
+
+        # skip sending cmd_hdr for SET_HMUX_CONTEXT_PRI and SET_HMUX_CONTEXT_SEC
+        if ((command_id < self.CABLE_CMD_ID_SET_HMUX_CONTEXT_PRI) or
+            (command_id >= self.CABLE_CMD_ID_READ_MCU_RAM)):
+            buffer1 = bytearray(cmd_hdr[:5]) + req_body
+            result = self.platform_chassis.get_sfp(self.port).write_eeprom(
+                self.QSFP_VEN_FE_130_BRCM_DATA_LENGHT_LSB, len(buffer1), buffer1)
+            if result is False:
+                self.log(self.LOG_ERROR, "write_eeprom() failed")
+                return self.ERROR_WRITE_EEPROM_FAILED, None
+            ts = self.log_timestamp(ts, "writing of cmd_hdr and request data {} bytes done".format(len(buffer1)))
+        else:
+            buffer1 = bytearray([cmd_hdr[1]])
+            result = self.platform_chassis.get_sfp(self.port).write_eeprom(
+                self.QSFP_VEN_FE_130_BRCM_DATA_LENGHT_LSB + 1, 1, buffer1)
+            if result is False:
+                self.log(self.LOG_ERROR, "write_eeprom() failed")
+                return self.ERROR_WRITE_EEPROM_FAILED, None
+            if wr_len > 0:
+                result = self.platform_chassis.get_sfp(self.port).write_eeprom(
+                    self.CMD_REQ_PARAM_START_OFFSET, wr_len, req_body)
+                if result is False:
+                    return self.ERROR_WR_EEPROM_FAILED, None
+            ts = self.log_timestamp(ts, "writing of rsp_len and request data {} bytes done".format(wr_len))
+
+        # write the command request byte now
+        cmd_req = 1
+        cmd_req = (cmd_req | (command_id << 1))
+        buffer1 = bytearray([cmd_req])
+        result = self.platform_chassis.get_sfp(self.port).write_eeprom(self.QSFP_BRCM_CABLE_CMD, 1, buffer1)
+        if result is False:
+            return self.ERROR_WR_EEPROM_FAILED, None
+        ts = self.log_timestamp(ts, "write command request to 1 done")
 
-                            if (sta & 0x7F) == 0x31:
-                                #rd = True
-                                error = 1
-                                self.log(self.LOG_ERROR, "ERROR: NIC command failed")
-                                break
+        error = 0
+        rd = False
+        done, sta = self.__cable_cmd_poll_sts(lambda sta: (sta & 0x7F) in (0x11, 0x31), 500)
+        if done is None:
+            return self.EEPROM_ERROR, None
+        if not done:
+            self.log(self.LOG_ERROR, "CMD_STS never read as 0x11 or 0x31. reg_value: {}".format(hex(sta)))
+            ret_val = self.ERROR_CMD_PROCESSING_FAILED
+        elif (sta & 0x7F) == 0x11:
+            rd = True
+        else:
+            error = 1
+            self.log(self.LOG_ERROR, "ERROR: NIC command failed")
+        ts = self.log_timestamp(ts, "polling for status done")
+
+        # read response data
+        if rd is True:
+            rd_len = cmd_hdr[1]
+            if rd_len > 0:
+                cmd_rsp_body = self.platform_chassis.get_sfp(self.port).read_eeprom(self.CMD_RSP_PARAM_START_OFFSET, rd_len)
+                if cmd_rsp_body is None:
+                    return self.EEPROM_ERROR, None
+            ts = self.log_timestamp(ts, "read cmd response bytes {} done".format(rd_len))
+
+        # set the command request to idle state
+        buffer1 = bytearray([0])
+        result = self.platform_chassis.get_sfp(self.port).write_eeprom(self.QSFP_BRCM_CABLE_CMD, 1, buffer1)
+        if result is False:
+            self.log(self.LOG_ERROR, "write eeprom failed for CMD_req")
+            return self.ERROR_WRITE_EEPROM_FAILED, None
+        ts = self.log_timestamp(ts, "write command request to 0 done")
 
-                            ms_elapsed = (time.monotonic_ns()//1000000) - (start//1000000)
-                        else:
-                            self.log(self.LOG_ERROR, "CMD_STS never read as 0x11 or 0x31. reg_value: {}".format(hex(sta)))
-                            ret_val = self.ERROR_CMD_PROCESSING_FAILED
-                        ts = self.log_timestamp(ts, "polling for status done")
-
-                        # read response data
-                        if rd is True:
-                            rd_len = cmd_hdr[1]
-                            if rd_len > 0:
-                                curr_offset = self.CMD_RSP_PARAM_START_OFFSET
-                                cmd_rsp_body = self.platform_chassis.get_sfp(self.port).read_eeprom(curr_offset, rd_len)
-                                if cmd_rsp_body is None:
-                                    return self.EEPROM_ERROR, None
-                            ts = self.log_timestamp(ts, "read cmd response bytes {} done".format(rd_len))
-
-                        # set the command request to idle state
-                        cmd_req = 0
-                        curr_offset = self.QSFP_BRCM_CABLE_CMD
-                        buffer1 = bytearray([cmd_req])
-                        result = self.platform_chassis.get_sfp(self.port).write_eeprom(curr_offset, 1, buffer1)
-                        if result is False:
-                            self.log(self.LOG_ERROR, "write eeprom failed for CMD_req")
-                            return self.ERROR_WRITE_EEPROM_FAILED, None
-                        ts = self.log_timestamp(ts, "write command request to 0 done")
-
-                        # wait  for MCU response to be pulled down
-                        start = time.monotonic_ns()
-                        ms_elapsed = 0
-                        while (ms_elapsed < 2000):
-                            sta = 0
-                            curr_offset = self.QSFP_BRCM_CABLE_CTRL_CMD_STS
-                            result = self.platform_chassis.get_sfp(self.port).read_eeprom(curr_offset, 1)
-                            if result is None:
-                                return self.EEPROM_ERROR, None
-                            sta = result[0]
-
-                            if (sta & 0x01) == 0x0:
-                                break
-                            ms_elapsed = (time.monotonic_ns()//1000000) - (start//1000000)
-                        else:
-                            ret_val = self.ERROR_MCU_NOT_RELEASED
-                        self.log_timestamp(ts, "poll for MCU response to be puled down - done")
+        # wait  for MCU response to be pulled down
+        done, sta = self.__cable_cmd_poll_sts(lambda sta: (sta & 0x01) == 0x0, 2000)
+        if done is None:
+            return self.EEPROM_ERROR, None
+        if not done:
+            ret_val = self.ERROR_MCU_NOT_RELEASED
+        self.log_timestamp(ts, "poll for MCU response to be puled down - done")
 
-                        if error:
-                            return -1, None
+        if error:
+            return -1, None
 
-                    else:
-                        ret_val = self.ERROR_MCU_BUSY
-                else:
-                    self.log(self.LOG_ERROR, "Port lock timed-out!")
-                    return self.ERROR_PORT_LOCK_TIMEOUT, None
+        return ret_val, cmd_rsp_body
 
-        else:
-            self.log(self.LOG_ERROR, "platform_chassis is not loaded, failed to check if link is Active on TOR B side")
-            return self.ERROR_PLATFORM_NOT_LOADED, None
+    def cable_cmd_queue_add(self, command_id, cmd_hdr, cmd_req_body):
+        """
+            Queues a cable command, to be sent by cable_cmd_queue_flush()
 
-        self.log_timestamp(start_ts, "__cable_cmd_execute() completed")
-        return ret_val, cmd_rsp_body
+            The MCU processes one command at a time, so queued commands are not
+            in flight together; they are sent back to back while the port lock
+            is held once, without other threads interleaving commands or lock
+            handovers between them.
+
+            Args:
+                command_id:
+                    Command ID
+                cmd_hdr
+                    command header containing details of the command
+                cmd_req_body
+                    command request payload, to be sent to MCU
+        """
+
+        with self.cmd_queue_lock:
+            self.cmd_queue.append((command_id, cmd_hdr, cmd_req_body))
+
+    def cable_cmd_queue_flush(self, stop_on_error=True):
+        """
+            Sends the queued cable commands to the MCU in order
+
+            Args:
+                stop_on_error:
+                    a boolean, if True the commands following a failed command are dropped
+
+            Returns:
+                a list of (ret_val, cmd_rsp_body) tuples, one per command sent, as
+                returned by __cable_cmd_execute
+        """
+
+        with self.cmd_queue_lock:
+            commands = list(self.cmd_queue)
+            self.cmd_queue.clear()
+
+        results = []
+        if not commands:
+            return results
+
+        if self.platform_chassis is None:
+            self.log(self.LOG_ERROR, "platform_chassis is not loaded, failed to send the queued cable commands")
+            return [(self.ERROR_PLATFORM_NOT_LOADED, None)]
+
+        with self.lock.acquire_timeout(self.PORT_LOCK_TIMEOUT) as result:
+            if not result:
+                self.log(self.LOG_ERROR, "Port lock timed-out!")
+                return [(self.ERROR_PORT_LOCK_TIMEOUT, None)]
+            for command_id, cmd_hdr, cmd_req_body in commands:
+                ret_val, cmd_rsp_body = self.__cable_cmd_execute_locked(command_id, cmd_hdr, cmd_req_body)
+                results.append((ret_val, cmd_rsp_body))
+                if ret_val != 0 and stop_on_error:
+                    break
+
+        return results
+
+    def get_cable_cmd_stats(self, reset=False):
+        """
+            Retrieves the latency statistics of the cable commands sent on this port,
+            as recorded by y_cable_trace
+
+            Args:
+                reset:
+                    a boolean, if True the statistics are cleared after being read
+
+            Returns:
+                a dictionary of command id to a dictionary with keys
+                'count', 'errors', 'bytes', 'total_time', 'max_time', 'last_time' and
+                'avg_time', times in seconds
+        """
+
+        stats = get_trace_stats(self.port, reset, (TRACE_MCU_CMD,)).get(self.port, {}).get(TRACE_MCU_CMD, {})
+        return {int(name[len("cable_cmd_"):]): cmd_stats for name, cmd_stats in stats.items()
+                if name.startswith("cable_cmd_")}
+
+    def get_port_lock_stats(self, reset=False):
+        """
+            Retrieves the wait and hold time statistics of the port locks of this port
+
+            Args:
+                reset:
+                    a boolean, if True the statistics are cleared after being read
+
+            Returns:
+                a dictionary with keys 'lock_wait' and 'lock_hold', each a dictionary of
+                lock name ('lock', 'fp_lock', 'dl_lock', 'ev_lock') to a dictionary with keys
+                'count', 'errors', 'total_time', 'max_time', 'last_time' and 'avg_time',
+                times in seconds. 'errors' counts the acquisitions which timed out.
+        """
+
+        stats = get_trace_stats(self.port, reset, (TRACE_LOCK_WAIT, TRACE_LOCK_HOLD)).get(self.port, {})
+        return {TRACE_LOCK_WAIT: stats.get(TRACE_LOCK_WAIT, {}), TRACE_LOCK_HOLD: stats.get(TRACE_LOCK_HOLD, {})}
+
+    @contextmanager
+    def telemetry_session(self):
+        """
+            Holds the port lock for a whole telemetry snapshot, the cable commands
+            issued by the snapshot queries re-enter it instead of contending for it
+            once per command
+
+            Yields:
+                a boolean, True if the port lock was acquired
+        """
+
+        with self.lock.acquire_timeout(self.PORT_LOCK_TIMEOUT) as result:
+            if not result:
+                self.log(self.LOG_ERROR, "Port lock timed-out!")
+            yield result
 
     def __validate_read_data(self, result, size, message):
         '''
@@ -2570,298 +2725,129 @@ class YCable(YCableBase):
             self.__handle_error_abort(upgrade_info, 1)
             return ret_val
 
-    def parse_image(self, upgrade_head, destination, fwfile):
+    def __fw_image_next_header(self, fwdata, image_offset):
+        """
+        This API is internally used to find the header of the image following
+        the image whose header is at image_offset in the firmware file
+        """
+        image_compressed = struct.unpack_from('<I', fwdata, image_offset + 0x10)[0]
+        if image_compressed:
+            # compressed image size
+            image_size = struct.unpack_from('<I', fwdata, image_offset + 0x14)[0]
+        else:
+            image_size = struct.unpack_from('<I', fwdata, image_offset)[0]
+        return image_offset + 0x28 + image_size
+
+    def __fw_image_parse(self, upgrade_head, fwdata, image_offset):
+        """
+        This API is internally used to fill upgrade_head from the image
+        whose header is at image_offset in the firmware file
+        """
+        image_info = upgrade_head.cable_up_info.image_info
+        (image_info.image_size,
+         version_minor, version_major, api_version_minor, api_version_major, image_crc32,
+         upgrade_head.compression, upgrade_head.compressed_size, upgrade_head.compressed_crc32,
+         upgrade_head.add_size, upgrade_head.add_crc32,
+         upgrade_head.header_crc32) = struct.unpack_from('<I4HI6I', fwdata, image_offset)
+
+        # image words following the header, the rest of the buffer is zeroed
+        data_offset = image_offset + 0x28
+        nwords = min(image_info.image_size, (len(fwdata) - data_offset) // 4, self.MUX_FW_IMG_SIZE)
+        fw_up_buff = array.array('I', bytes(4 * self.MUX_FW_IMG_SIZE))
+        fw_up_buff[:nwords] = array.array('I', struct.unpack_from('<{}I'.format(nwords), fwdata, data_offset))
 
-        File_seek = 0
-        image_compressed = 0
-        image_offset = 0
-        fw_up_buff = array.array('I', [])
+        image_info.image_fw_version.image_version_major = version_major
+        image_info.image_fw_version.image_version_minor = version_minor
+        image_info.image_api_version.image_version_minor = api_version_minor
+        image_info.image_api_version.image_version_major = api_version_major
+        image_info.image_crc32 = image_crc32
+        image_info.image_ptr = fw_up_buff
 
+    def read_fw_image(self, fwfile):
+        """
+        Reads the whole firmware file, so that it can be parsed for all the
+        destinations with parse_image() without reopening it
+
+        Returns:
+            a bytes object with the file content, None if the file could not be read
+        """
         if (os.path.isfile(fwfile) != True):
             self.log(self.LOG_ERROR, "ERROR : Fwfile {} is not present".format(fwfile))
-            return self.RR_ERROR
-
-        self.log(self.LOG_DEBUG, "parse_image for destination {} fwfile {}".format(destination, fwfile))
-        for i in range(self.MUX_FW_IMG_SIZE):
-            fw_up_buff.append(0)
+            return None
 
-        file1 = open(fwfile, 'rb')
-        if file1 is None:
-            self.log(self.LOG_ERROR, "File {} failed to open".format(fwfile))
-            return self.RR_ERROR
+        try:
+            with open(fwfile, 'rb') as file1:
+                return file1.read()
+        except (IOError, OSError) as e:
+            self.log(self.LOG_ERROR, "File {} failed to open: {}".format(fwfile, str(e)))
+            return None
 
-        if (destination == self.TOR_MCU_SELF) or (destination == self.TOR_MCU_PEER):
-            # Check TOR current bank to find which TOR image to download
-            self.log(self.LOG_DEBUG, "Check TOR current bank to find which TOR image to download")
-            upgrade_head.cable_up_info.destination = destination
-            if (self.cable_fw_get_status(upgrade_head.cable_up_info, True) != self.RR_SUCCESS):
-                file1.close()
-                return self.RR_ERROR
-            if upgrade_head.cable_up_info.status_info.current_bank == 1:
-                # Select TOR bank 2 image
-                # First read TOR bank 1 image header to find header location of TOR bank2 image header
-                self.log(self.LOG_INFO, "First read TOR bank 1 image header to find header location of TOR bank2 image header")
-                file1.seek(image_offset + 0x10)
-                image_compressed = struct.unpack('I', file1.read(4))[0]
-                if image_compressed:
-                    # Read compressed image size
-                    File_seek = struct.unpack('I', file1.read(4))[0]
-                    file1.seek(image_offset)
-                else:
-                    # Read image size
-                    file1.seek(image_offset)
-                    File_seek = struct.unpack('I', file1.read(4))[0]
-                # Next set TOR bank2 image header location
-                File_seek += (image_offset + 0x28)
-            else:
-                File_seek = image_offset
-            # Parse TOR image now
-            self.log(self.LOG_INFO, "Parse TOR image now")
-            file1.seek(File_seek)
-            upgrade_head.cable_up_info.image_info.image_size = struct.unpack('I', file1.read(4))[0]
-
-            fw_version_array = array.array('I', [])
-            for i in range(self.FW_IMG_INFO_SIZE):
-                if i < 4:
-                    byte_val = file1.read(2)
-                    fw_version_array.append(0)
-                    fw_version_array[i] = struct.unpack('H', byte_val)[0]
-                else:
-                    byte_val = file1.read(4)
-                    fw_version_array.append(0)
-                    fw_version_array[i] = struct.unpack('I', byte_val)[0]
-                    break
+    def parse_image(self, upgrade_head, destination, fwfile, fwdata=None):
 
-            upgrade_head.compression = struct.unpack('I', file1.read(4))[0]
-            upgrade_head.compressed_size = struct.unpack('I', file1.read(4))[0]
-            upgrade_head.compressed_crc32 = struct.unpack('I', file1.read(4))[0]
-            upgrade_head.add_size = struct.unpack('I', file1.read(4))[0]
-            upgrade_head.add_crc32 = struct.unpack('I', file1.read(4))[0]
-            upgrade_head.header_crc32 = struct.unpack('I', file1.read(4))[0]
-
-            for i in range(upgrade_head.cable_up_info.image_info.image_size):
-                byte_val = file1.read(4)
-                if len(byte_val) == 4:
-                    fw_up_buff[i] = struct.unpack('I', byte_val)[0]
-
-            upgrade_head.cable_up_info.image_info.image_fw_version.image_version_major = fw_version_array[1]
-            upgrade_head.cable_up_info.image_info.image_fw_version.image_version_minor = fw_version_array[0]
-            upgrade_head.cable_up_info.image_info.image_api_version.image_version_minor = fw_version_array[2]
-            upgrade_head.cable_up_info.image_info.image_api_version.image_version_major = fw_version_array[3]
-            upgrade_head.cable_up_info.image_info.image_crc32 = fw_version_array[4]
-            upgrade_head.cable_up_info.image_info.image_ptr = fw_up_buff
-
-            if destination == self.TOR_MCU_SELF:
-                upgrade_head.cable_up_info.destination = self.TOR_MCU_SELF
-            else:
-                upgrade_head.cable_up_info.destination = self.TOR_MCU_PEER
-
-        elif destination == self.NIC_MCU:
-            # Parse NIC image
-            self.log(self.LOG_INFO, "Parse NIC image")
-            # Seek to location of NIC bank1 image
-            file1.seek(0x10)
-            image_compressed = struct.unpack('I', file1.read(4))[0]
-            if image_compressed:
-                # Read compressed image size
-                image_offset = struct.unpack('I', file1.read(4))[0]
-                file1.seek(0)
-            else:
-                # Read image size
-                file1.seek(0)
-                image_offset = struct.unpack('I', file1.read(4))[0]
-
-            image_offset += 0x28
-            # Seek to TOR bank2 image
-            file1.seek(image_offset)
-            # Read TOR bank 2 image header to find header location of NIC bank1 image header
-            file1.seek((image_offset + 0x10))
-            image_compressed = struct.unpack('I', file1.read(4))[0]
-            if image_compressed:
-                # Read compressed image size
-                File_seek = struct.unpack('I', file1.read(4))[0]
-                file1.seek(image_offset)
-            else:
-                # Read image size
-                file1.seek(image_offset)
-                File_seek = struct.unpack('I', file1.read(4))[0]
-
-            # Seek to NIC bank1 image
-            File_seek += (image_offset + 0x28)
-            file1.seek(File_seek)
-            image_offset = File_seek
-
-            # Check NIC current bank to find which NIC image to download
-            upgrade_head.cable_up_info.destination = destination
-            if (self.cable_fw_get_status(upgrade_head.cable_up_info, True) != self.RR_SUCCESS):
-                file1.close()
+        if fwdata is None:
+            fwdata = self.read_fw_image(fwfile)
+            if fwdata is None:
                 return self.RR_ERROR
 
-            if upgrade_head.cable_up_info.status_info.current_bank == 1:
-                # Select NIC bank 2 image
-                # First read NIC bank 1 image header to find header location of NIC bank2 image header
-                file1.seek((image_offset + 0x10))
-                image_compressed = struct.unpack('I', file1.read(4))[0]
+        self.log(self.LOG_DEBUG, "parse_image for destination {} fwfile {}".format(destination, fwfile))
 
-                if image_compressed:
-                    # Read compressed image size
-                    File_seek = struct.unpack('I', file1.read(4))[0]
-                    file1.seek(image_offset)
+        # The file holds the images back to back, each preceded by a 0x28 bytes header:
+        # TOR bank 1, TOR bank 2, NIC bank 1, NIC bank 2 and MUX chip
+        try:
+            if (destination == self.TOR_MCU_SELF) or (destination == self.TOR_MCU_PEER):
+                # Check TOR current bank to find which TOR image to download
+                self.log(self.LOG_DEBUG, "Check TOR current bank to find which TOR image to download")
+                upgrade_head.cable_up_info.destination = destination
+                if (self.cable_fw_get_status(upgrade_head.cable_up_info, True) != self.RR_SUCCESS):
+                    return self.RR_ERROR
+                image_offset = 0
+                if upgrade_head.cable_up_info.status_info.current_bank == 1:
+                    # Select TOR bank 2 image
+                    self.log(self.LOG_INFO, "First read TOR bank 1 image header to find header location of TOR bank2 image header")
+                    image_offset = self.__fw_image_next_header(fwdata, image_offset)
+                # Parse TOR image now
+                self.log(self.LOG_INFO, "Parse TOR image now")
+                self.__fw_image_parse(upgrade_head, fwdata, image_offset)
+
+                if destination == self.TOR_MCU_SELF:
+                    upgrade_head.cable_up_info.destination = self.TOR_MCU_SELF
                 else:
-                    # Read image size
-                    file1.seek(image_offset)
-                    File_seek = struct.unpack('I', file1.read(4))[0]
+                    upgrade_head.cable_up_info.destination = self.TOR_MCU_PEER
 
-                # Next set NIC bank2 image header location
-                File_seek += (image_offset + 0x28)
-            else:
-                File_seek = image_offset
+            elif destination == self.NIC_MCU:
+                # Parse NIC image
+                self.log(self.LOG_INFO, "Parse NIC image")
+                # Skip TOR bank 1 and TOR bank 2 images to get to the NIC bank1 image
+                image_offset = self.__fw_image_next_header(fwdata, 0)
+                image_offset = self.__fw_image_next_header(fwdata, image_offset)
 
-            file1.seek(File_seek)
-            upgrade_head.cable_up_info.image_info.image_size = struct.unpack('I', file1.read(4))[0]
+                # Check NIC current bank to find which NIC image to download
+                upgrade_head.cable_up_info.destination = destination
+                if (self.cable_fw_get_status(upgrade_head.cable_up_info, True) != self.RR_SUCCESS):
+                    return self.RR_ERROR
 
-            fw_version_array = array.array('I', [])
-            for i in range(self.FW_IMG_INFO_SIZE):
-                if i < 4:
-                    byte_val = file1.read(2)
-                    fw_version_array.append(0)
-                    fw_version_array[i] = struct.unpack('H', byte_val)[0]
-                else:
-                    byte_val = file1.read(4)
-                    fw_version_array.append(0)
-                    fw_version_array[i] = struct.unpack('I', byte_val)[0]
-                    break
+                if upgrade_head.cable_up_info.status_info.current_bank == 1:
+                    # Select NIC bank 2 image
+                    image_offset = self.__fw_image_next_header(fwdata, image_offset)
 
-            upgrade_head.compression = struct.unpack('I', file1.read(4))[0]
-            upgrade_head.compressed_size = struct.unpack('I', file1.read(4))[0]
-            upgrade_head.compressed_crc32 = struct.unpack('I', file1.read(4))[0]
-            upgrade_head.add_size = struct.unpack('I', file1.read(4))[0]
-            upgrade_head.add_crc32 = struct.unpack('I', file1.read(4))[0]
-            upgrade_head.header_crc32 = struct.unpack('I', file1.read(4))[0]
-
-            upgrade_head.cable_up_info.destination = self.NIC_MCU
-
-            for i in range(upgrade_head.cable_up_info.image_info.image_size):
-                byte_val = file1.read(4)
-                if len(byte_val) == 4:
-                    fw_up_buff[i] = struct.unpack('I', byte_val)[0]
-
-            upgrade_head.cable_up_info.image_info.image_fw_version.image_version_major = fw_version_array[1]
-            upgrade_head.cable_up_info.image_info.image_fw_version.image_version_minor = fw_version_array[0]
-            upgrade_head.cable_up_info.image_info.image_api_version.image_version_minor = fw_version_array[2]
-            upgrade_head.cable_up_info.image_info.image_api_version.image_version_major = fw_version_array[3]
-            upgrade_head.cable_up_info.image_info.image_crc32 = fw_version_array[4]
-            upgrade_head.cable_up_info.image_info.image_ptr = fw_up_buff
-            upgrade_head.cable_up_info.destination = self.NIC_MCU
-
-        elif destination == self.MUX_CHIP:
-            # Parse MUX CHIP image
-            # Seek to location of NIC bank1 image
-            file1.seek(0x10)
-            image_compressed = struct.unpack('I', file1.read(4))[0]
-            if image_compressed:
-                # Read compressed image size
-                image_offset = struct.unpack('I', file1.read(4))[0]
-                file1.seek(0)
-            else:
-                # Read image size
-                file1.seek(0)
-                image_offset = struct.unpack('I', file1.read(4))[0]
-
-            image_offset += 0x28
-            # Seek to TOR bank2 image
-            file1.seek(image_offset)
-
-            # Read TOR bank 2 image header to find header location of NIC bank1 image header
-            file1.seek(image_offset + 0x10)
-            image_compressed = struct.unpack('I', file1.read(4))[0]
-
-            if image_compressed:
-                # Read compressed image size
-                File_seek = struct.unpack('I', file1.read(4))[0]
-                file1.seek(image_offset)
-            else:
-                # Read image size
-                file1.seek(image_offset)
-                File_seek = struct.unpack('I', file1.read(4))[0]
-
-            # Seek to NIC bank1 image
-            File_seek += (image_offset + 0x28)
-            file1.seek(File_seek)
-            image_offset = File_seek
-
-            # Read NIC bank 1 image header to find header location of N
-            file1.seek(image_offset + 0x10)
-            image_compressed = struct.unpack('I', file1.read(4))[0]
-            if image_compressed:
-                # Read compressed image size
-                File_seek = struct.unpack('I', file1.read(4))[0]
-                file1.seek(image_offset)
-            else:
-                # Read image size
-                file1.seek(image_offset)
-                File_seek = struct.unpack('I', file1.read(4))[0]
+                self.__fw_image_parse(upgrade_head, fwdata, image_offset)
+                upgrade_head.cable_up_info.destination = self.NIC_MCU
 
-            # Next set NIC bank2 image header location
-            File_seek += (image_offset + 0x28)
-            image_offset = File_seek
+            elif destination == self.MUX_CHIP:
+                # Parse MUX CHIP image, it follows the TOR and NIC bank 1 and bank 2 images
+                image_offset = 0
+                for _ in range(4):
+                    image_offset = self.__fw_image_next_header(fwdata, image_offset)
 
-            file1.seek(File_seek + 0x10)
-            image_compressed = struct.unpack('I', file1.read(4))[0]
+                self.__fw_image_parse(upgrade_head, fwdata, image_offset)
+                upgrade_head.cable_up_info.destination = self.MUX_CHIP
 
-            if image_compressed:
-                # Read compressed image size
-                File_seek = struct.unpack('I', file1.read(4))[0]
-                file1.seek(image_offset)
             else:
-                # Read image size
-                file1.seek(image_offset)
-                File_seek = struct.unpack('I', file1.read(4))[0]
-
-            File_seek += (image_offset + 0x28)
-            file1.seek(File_seek)
-            #image_offset = File_seek
-
-            upgrade_head.cable_up_info.image_info.image_size = struct.unpack('I', file1.read(4))[0]
-
-            fw_version_array = array.array('I', [])
-            for i in range(self.FW_IMG_INFO_SIZE):
-                if i < 4:
-                    byte_val = file1.read(2)
-                    fw_version_array.append(0)
-                    fw_version_array[i] = struct.unpack('H', byte_val)[0]
-                else:
-                    byte_val = file1.read(4)
-                    fw_version_array.append(0)
-                    fw_version_array[i] = struct.unpack('I', byte_val)[0]
-                    break
-
-            upgrade_head.compression = struct.unpack('I', file1.read(4))[0]
-            upgrade_head.compressed_size = struct.unpack('I', file1.read(4))[0]
-            upgrade_head.compressed_crc32 = struct.unpack('I', file1.read(4))[0]
-            upgrade_head.add_size = struct.unpack('I', file1.read(4))[0]
-            upgrade_head.add_crc32 = struct.unpack('I', file1.read(4))[0]
-            upgrade_head.header_crc32 = struct.unpack('I', file1.read(4))[0]
-
-            upgrade_head.cable_up_info.destination = self.MUX_CHIP
-
-            for i in range(upgrade_head.cable_up_info.image_info.image_size):
-                byte_val = file1.read(4)
-                if len(byte_val) == 4:
-                    fw_up_buff[i] = struct.unpack('I', byte_val)[0]
-
-            upgrade_head.cable_up_info.image_info.image_fw_version.image_version_major = fw_version_array[1]
-            upgrade_head.cable_up_info.image_info.image_fw_version.image_version_minor = fw_version_array[0]
-            upgrade_head.cable_up_info.image_info.image_api_version.image_version_minor = fw_version_array[2]
-            upgrade_head.cable_up_info.image_info.image_api_version.image_version_major = fw_version_array[3]
-            upgrade_head.cable_up_info.image_info.image_crc32 = fw_version_array[4]
-            upgrade_head.cable_up_info.image_info.image_ptr = fw_up_buff
-
-        else:
-            file1.close()
+                return self.RR_ERROR
+        except struct.error as e:
+            self.log(self.LOG_ERROR, "ERROR : Fwfile {} is truncated: {}".format(fwfile, str(e)))
             return self.RR_ERROR
 
-        file1.close()
         return self.RR_SUCCESS
 
     def __cable_fw_mcu_reset(self, upgrade_info):
@@ -3259,6 +3245,10 @@ class YCable(YCableBase):
                 remain_page_size = tmp_image_size % self.FW_UP_PACKET_SIZE
                 image_to_page_size = tmp_image_size - remain_page_size
 
+                # a packet is built from the image words in one pack
+                packet_words = self.FW_UP_PACKET_SIZE // 4
+                packet_format = '<{}I'.format(packet_words)
+
                 # MCU is now ready for firmware upgrade, Start the loop to transfre the data
                 self.log(self.LOG_DEBUG, "MCU is now ready for firmware upgrade, Start the loop to transfer the data")
                 dat[0] = self.FW_UP_PACKET_SIZE
@@ -3268,12 +3258,8 @@ class YCable(YCableBase):
                 self.log(self.LOG_DEBUG, "Writing packet to page_loc {} fw_up_packet_size : {}".format(
                     page_loc, self.FW_UP_PACKET_SIZE))
 
-                for i in range(0, self.FW_UP_PACKET_SIZE, 4):
-                    dat[0 + i] = tmp_image_ptr[count] & 0xFF
-                    dat[1 + i] = (tmp_image_ptr[count] >> 8) & 0xFF
-                    dat[2 + i] = (tmp_image_ptr[count] >> 16) & 0xFF
-                    dat[3 + i] = (tmp_image_ptr[count] >> 24) & 0xFF
-                    count += 1
+                struct.pack_into(packet_format, dat, 0, *tmp_image_ptr[count:count + packet_words])
+                count += packet_words
 
                 if self.platform_chassis.get_sfp(self.port).write_eeprom((page_loc*128) + self.QSFP_BRCM_FW_UPGRADE_DATA_START, self.FW_UP_PACKET_SIZE, dat) is False:
                     return self.ERROR_WR_EEPROM_FAILED
@@ -3294,12 +3280,8 @@ class YCable(YCableBase):
                         page_loc == self.QSFP_BRCM_FW_UPGRADE_DATA_PAGE_2) else self.QSFP_BRCM_FW_UPGRADE_DATA_PAGE_2
 
                     # prepare packet data
-                    for i in range(0, self.FW_UP_PACKET_SIZE, 4):
-                        dat[0 + i] = tmp_image_ptr[count] & 0xFF
-                        dat[1 + i] = (tmp_image_ptr[count] >> 8) & 0xFF
-                        dat[2 + i] = (tmp_image_ptr[count] >> 16) & 0xFF
-                        dat[3 + i] = (tmp_image_ptr[count] >> 24) & 0xFF
-                        count += 1
+                    struct.pack_into(packet_format, dat, 0, *tmp_image_ptr[count:count + packet_words])
+                    count += packet_words
 
                     # write packet
                     if self.platform_chassis.get_sfp(self.port).write_eeprom((page_loc*128) + self.QSFP_BRCM_FW_UPGRADE_DATA_START, self.FW_UP_PACKET_SIZE, dat) is False:
@@ -3319,6 +3301,7 @@ class YCable(YCableBase):
                                     tmp_cnt = 0
                                     tmp_print += 1
                                     #_logger.log_info("  {}%".format(tmp_print),CONSOLE_PRINT)
+                                    self.download_firmware_progress = tmp_print
                                     print("  {}% (tmp_cnt {})".format(tmp_print, tmp_cnt))
                                 break
                             else:
@@ -3406,6 +3389,7 @@ class YCable(YCableBase):
                                     tmp_cnt = 0
                                     tmp_print += 1
                                     #_logger.log_info("  {}%".format(tmp_print),CONSOLE_PRINT)
+                                    self.download_firmware_progress = tmp_print
                                     print("  {}% (tmp_cnt: {})".format(tmp_print, tmp_cnt))
                                 break
                             else:
@@ -3583,6 +3567,25 @@ class YCable(YCableBase):
         self.log_timestamp(start_tstamp, "FW upgrade complete")
         return ret_val
 
+    def invalidate_static_data(self):
+        """
+        This API drops the identity data cached by get_static_data and the firmware
+        versions returned by get_firmware_version during a firmware operation, e.g.
+        after a cable swap.
+        The port on which this API is called for can be referred using self.port.
+
+        Args:
+
+        Returns:
+            None
+        """
+
+        # firmware_operation invalidates when an operation starts, the versions
+        # are kept until it ends for get_firmware_version to return them meanwhile
+        if not self._firmware_operations:
+            self.fw_version_cache = {}
+        super(YCable, self).invalidate_static_data()
+
     def get_firmware_version(self, target):
         """
         This routine should return the active, inactive and next (committed)
@@ -3599,7 +3602,9 @@ class YCable(YCableBase):
         Returns:
             a Dictionary:
                  with version_active, version_inactive and version_next keys
-                 and their corresponding values
+                 and their corresponding values. While a firmware operation is
+                 in progress the versions read last are returned, with a cached
+                 key set to True
         """
 
         dat = []
@@ -3626,8 +3631,10 @@ class YCable(YCableBase):
             else:
                 target = self.NIC_MCU
 
-            # 1s timeout
-            with self.dl_lock.acquire_timeout(1) as result:
+            # download, activate and rollback hold dl_lock for up to minutes, rather than
+            # waiting for it, return the versions read last if there are any (1s timeout otherwise)
+            cached = self.fw_version_cache.get(target)
+            with self.dl_lock.acquire_timeout(0 if cached is not None else 1) as result:
 
                 if result:
                     upgrade_info.destination = target
@@ -3707,8 +3714,12 @@ class YCable(YCableBase):
                         fw_ver_dict["version_inactive"] = dat[1]
                         fw_ver_dict["version_next"] = dat[2]
 
+                    self.fw_version_cache[target] = dict(fw_ver_dict)
                     return fw_ver_dict
 
+                elif cached is not None:
+                    self.log(self.LOG_DEBUG, "firmware operation in progress, returning the last read firmware versions")
+                    return dict(cached, cached=True)
                 else:
                     self.log(self.LOG_ERROR, "DL Port lock timed-out!")
                     #ret_val = self.ERROR_PORT_LOCK_TIMEOUT
@@ -4184,6 +4195,7 @@ class YCable(YCableBase):
             self.log(self.LOG_ERROR, "Command execution failed ret_val : {}".format(ret_val))
             return False
 
+    @firmware_operation
     def download_firmware(self, fwfile):
         """
         This routine should download and store the firmware on all the
@@ -4239,9 +4251,14 @@ class YCable(YCableBase):
 
             if result:
 
-                # parse image for FW versions
+                # parse image for FW versions, the file is read once for all destinations
+                fwdata = self.read_fw_image(fwfile)
+                if fwdata is None:
+                    self.log(self.LOG_ERROR, "Parse image failed")
+                    return self.RR_ERROR
+                self.download_firmware_progress = 0
                 for i in range(0, 4):
-                    ret = self.parse_image(upgrade_head[i], i+1, fwfile)
+                    ret = self.parse_image(upgrade_head[i], i+1, fwfile, fwdata)
                     if ret != self.RR_SUCCESS:
                         self.log(self.LOG_ERROR, "Parse image failed")
                         return self.RR_ERROR
@@ -4391,6 +4408,7 @@ class YCable(YCableBase):
 
         return ret_val
 
+    @firmware_operation
     def activate_firmware(self, fwfile=None, hitless=False):
         """
         This routine should activate the downloaded firmware on all the
@@ -4432,6 +4450,7 @@ class YCable(YCableBase):
                 RR_ERROR                   : Cannot activate due to fw version mismatch
 
         """
+
         #ret_val = self.ERROR_FW_ACTIVATE_FAILURE
 
         if((fwfile is not None) and
@@ -4475,9 +4494,16 @@ class YCable(YCableBase):
                         self.log(self.LOG_ERROR, "MUX CHIP get firmware status failed")
                         return self.RR_ERROR
 
+                fwdata = None
+                if fwfile is not None:
+                    fwdata = self.read_fw_image(fwfile)
+                    if fwdata is None:
+                        self.log(self.LOG_ERROR, "Parse image failed")
+                        return self.RR_ERROR
+
                 for i in range(0, 4):
                     if fwfile is not None:
-                        ret = self.parse_image(upgrade_head[i], i+1, fwfile)
+                        ret = self.parse_image(upgrade_head[i], i+1, fwfile, fwdata)
                         if ret != self.RR_SUCCESS:
                             self.log(self.LOG_ERROR, "Parse image failed")
                             return self.RR_ERROR
@@ -4805,6 +4831,7 @@ class YCable(YCableBase):
             self.log(self.LOG_ERROR, "ERROR: Cannot activate!")
             return self.RR_ERROR
 
+    @firmware_operation
     def rollback_firmware(self, fwfile=None):
         """
         This routine should rollback the firmware to the previous version
@@ -4887,9 +4914,16 @@ class YCable(YCableBase):
                         self.log(self.LOG_ERROR, "MUX CHIP get firmware status failed")
                         return self.RR_ERROR
 
+                fwdata = None
+                if fwfile is not None:
+                    fwdata = self.read_fw_image(fwfile)
+                    if fwdata is None:
+                        self.log(self.LOG_ERROR, "Parse image failed")
+                        return self.RR_ERROR
+
                 for i in range(0, 4):
                     if fwfile is not None:
-                        ret = self.parse_image(upgrade_head[i], i+1, fwfile)
+                        ret = self.parse_image(upgrade_head[i], i+1, fwfile, fwdata)
                         if ret != self.RR_SUCCESS:
                             self.log(self.LOG_ERROR, "Parse image failed")
                             return self.RR_ERROR
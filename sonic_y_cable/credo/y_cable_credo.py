@@ -11,7 +11,8 @@ import threading
 from contextlib import contextmanager
 
 from ctypes import c_int8
-from sonic_y_cable.y_cable_base import YCableBase
+from sonic_y_cable.y_cable_base import YCableBase, firmware_operation
+from sonic_y_cable.y_cable_trace import TRACE_LOCK_WAIT, TRACE_MCU_CMD, record, trace_chassis, trace_y_cable_apis
 
 try:
     import sonic_platform.platform
@@ -21,16 +22,21 @@ except ImportError as e:
 class RLocker():
     ACQUIRE_LOCK_TIMEOUT = 15
 
-    def __init__(self):
+    def __init__(self, port=None):
+        self.port = port
         self.rlock = threading.RLock()
 
     @contextmanager
     def acquire_timeout(self, timeout):
+        start = time.monotonic()
         result = self.rlock.acquire(timeout=timeout)
+        # accounts the time spent waiting for the lock, see y_cable_trace
+        record(self.port, TRACE_LOCK_WAIT, 'rlock', time.monotonic() - start, not result)
         yield result
         if result:
             self.rlock.release()
 
+@trace_y_cable_apis
 class YCable(YCableBase):
     # definitions of the offset with width accommodated for values
     # of MUX register specs of upper page 0x04 starting at 640
@@ -108,6 +114,12 @@ class YCable(YCableBase):
     VSC_BUFF_SIZE = 512
     VSC_BLOCK_WRITE_LENGTH = 32
 
+    # VSC completion polling, in seconds. The opcode byte is polled with an
+    # interval doubling from VSC_POLL_BACKOFF_MIN up to VSC_POLL_INTERVAL,
+    # which is also the unit of the send_vsc() timeout
+    VSC_POLL_BACKOFF_MIN = 0.0005
+    VSC_POLL_INTERVAL = 0.005
+
     FIRMWARE_INFO_PAYLOAD_SIZE = 48
     EVENTLOG_PAYLOAD_SIZE = 18
 
@@ -209,10 +221,14 @@ class YCable(YCableBase):
         YCableBase.__init__(self, port, main_logger)
 
         self.platform_chassis = None
-        self.rlock = RLocker()
+        self.rlock = RLocker(port)
+
+        # status and response bytes of the last VSC command, indexed like
+        # vsc_req_form, see send_vsc()
+        self.vsc_response = bytearray([0xFF] * YCable.VSC_CMD_ATTRIBUTE_LENGTH)
 
         try:
-            self.platform_chassis = sonic_platform.platform.Platform().get_chassis()
+            self.platform_chassis = trace_chassis(sonic_platform.platform.Platform().get_chassis())
             self.log_info("chassis loaded {}".format(self.platform_chassis))
         except Exception as e:
             self.log_warning("Failed to load chassis due to {}".format(repr(e)))
@@ -291,7 +307,10 @@ class YCable(YCableBase):
         ret = self.platform_chassis.get_sfp(self.port).write_eeprom(linear_addr, len, ba)
 
         if (ret == False):
-            self.log_error('Write Failed!  page:%2X byte:%2X value:%2X' % (page, byte, value))
+            if len == 1:
+                self.log_error('Write Failed!  page:%2X byte:%2X value:%2X' % (page, byte, value))
+            else:
+                self.log_error('Write Failed!  page:%2X byte:%2X len:%d' % (page, byte, len))
 
         return ret
 
@@ -308,27 +327,62 @@ class YCable(YCableBase):
 
         Returns:
             an Integer, status code of vsc command, find the 'MCU_ERROR_CODE_STRING' for the interpretation.
+            The status and response bytes (129 to 140) are left in self.vsc_response, 0xFF if they
+            could not be read.
         """
 
+        self.vsc_response[:] = bytearray([0xFF] * YCable.VSC_CMD_ATTRIBUTE_LENGTH)
+        opcode = vsc_req_form[YCable.VSC_BYTE_OPCODE]
+        start = time.monotonic()
+
         if self.platform_chassis is not None:
-            for idx in range(129, YCable.VSC_CMD_ATTRIBUTE_LENGTH):
-                if vsc_req_form[idx] != None:
+            # each run of consecutive request bytes is written in one transaction,
+            # the opcode is written last since it starts the command
+            idx = YCable.VSC_BYTE_STATUS
+            while idx < YCable.VSC_CMD_ATTRIBUTE_LENGTH:
+                if vsc_req_form[idx] is None:
+                    idx += 1
+                    continue
+
+                end = idx + 1
+                while end < YCable.VSC_CMD_ATTRIBUTE_LENGTH and vsc_req_form[end] is not None:
+                    end += 1
+
+                if end - idx == 1:
                     self.write_mmap(YCable.MIS_PAGE_VSC, idx, vsc_req_form[idx])
+                else:
+                    self.write_mmap(YCable.MIS_PAGE_VSC, idx, bytearray(vsc_req_form[idx:end]), end - idx)
+                idx = end
             self.write_mmap(YCable.MIS_PAGE_VSC, YCable.VSC_BYTE_OPCODE, vsc_req_form[YCable.VSC_BYTE_OPCODE])
 
+            # most commands complete within a few ms, poll quickly first and back off to
+            # the 5ms interval, the timeout is still timeout * 5ms
+            deadline = time.monotonic() + timeout * YCable.VSC_POLL_INTERVAL
+            backoff = YCable.VSC_POLL_BACKOFF_MIN
             while True:
                 done = self.read_mmap(YCable.MIS_PAGE_VSC, YCable.VSC_BYTE_OPCODE)
                 if done == 0:
                     break
 
-                time.sleep(0.005)
-                timeout -= 1
-
-                if timeout == 0:
+                if time.monotonic() >= deadline:
                     self.log_error("wait vsc status value timeout")
+                    record(self.port, TRACE_MCU_CMD, 'vsc_0x%02X' % opcode, time.monotonic() - start, True)
                     return YCable.MCU_EC_WAIT_VSC_STATUS_TIMEOUT
 
-            status = self.read_mmap(YCable.MIS_PAGE_VSC, YCable.VSC_BYTE_STATUS)
+                time.sleep(backoff)
+                backoff = min(backoff * 2, YCable.VSC_POLL_INTERVAL)
+
+            # status and response in one read
+            size = YCable.VSC_CMD_ATTRIBUTE_LENGTH - YCable.VSC_BYTE_STATUS
+            response = self.read_mmap(YCable.MIS_PAGE_VSC, YCable.VSC_BYTE_STATUS, size)
+            if isinstance(response, int):
+                record(self.port, TRACE_MCU_CMD, 'vsc_0x%02X' % opcode, time.monotonic() - start, True)
+                return YCable.MCU_EC_UNDEFINED_ERROR
+            self.vsc_response[YCable.VSC_BYTE_STATUS:] = response[:size]
+
+            status = self.vsc_response[YCable.VSC_BYTE_STATUS]
+            record(self.port, TRACE_MCU_CMD, 'vsc_0x%02X' % opcode, time.monotonic() - start,
+                   status != YCable.MCU_EC_NO_ERROR)
         else:
             self.log_error("platform_chassis is not loaded, failed to send vsc cmd")
             return YCable.MCU_EC_UNDEFINED_ERROR
@@ -360,8 +414,7 @@ class YCable(YCableBase):
         if status != YCable.MCU_EC_NO_ERROR:
             self.log_error('fw cmd[%04X] detail1[%04X] error[%04X]' % (cmd, detail1, status))
 
-        response = (self.read_mmap(YCable.MIS_PAGE_VSC, 131) << 8) | self.read_mmap(YCable.MIS_PAGE_VSC, 130)
-        param1   = (self.read_mmap(YCable.MIS_PAGE_VSC, 137) << 8) | self.read_mmap(YCable.MIS_PAGE_VSC, 136)
+        response, param1 = struct.unpack_from('<H4xH', self.vsc_response, 130)
 
         return [response, param1]
 
@@ -394,9 +447,7 @@ class YCable(YCableBase):
         if status != YCable.MCU_EC_NO_ERROR:
             self.log_error('fw cmd ext[%04X] detail1[%04X] detail2[%04X] error[%04X]' % (cmd, detail1, detail2, status))
 
-        response = (self.read_mmap(YCable.MIS_PAGE_VSC, 131) << 8) | self.read_mmap(YCable.MIS_PAGE_VSC, 130)
-        param1   = (self.read_mmap(YCable.MIS_PAGE_VSC, 137) << 8) | self.read_mmap(YCable.MIS_PAGE_VSC, 136)
-        param2   = (self.read_mmap(YCable.MIS_PAGE_VSC, 139) << 8) | self.read_mmap(YCable.MIS_PAGE_VSC, 138)
+        response, param1, param2 = struct.unpack_from('<H4xHH', self.vsc_response, 130)
 
         return [response, param1, param2]
 
@@ -422,8 +473,7 @@ class YCable(YCableBase):
             self.log_error('tcm read addr[%04X]  error[%04X]' % (addr, status))
             return -1
 
-        data = (self.read_mmap(YCable.MIS_PAGE_VSC, 134) | (self.read_mmap(YCable.MIS_PAGE_VSC, 135) << 8) |
-               (self.read_mmap(YCable.MIS_PAGE_VSC, 136) << 16) | (self.read_mmap(YCable.MIS_PAGE_VSC, 137) << 24))
+        data = struct.unpack_from('<I', self.vsc_response, 134)[0]
 
         return data
 
@@ -485,8 +535,7 @@ class YCable(YCableBase):
                         self.log_error('tcm read addr[%04X]  error[%04X]' % (addr, status))
                         return -1
 
-                    data = (self.read_mmap(YCable.MIS_PAGE_VSC, 134) | (self.read_mmap(YCable.MIS_PAGE_VSC, 135) << 8) |
-                        (self.read_mmap(YCable.MIS_PAGE_VSC, 136) << 16) | (self.read_mmap(YCable.MIS_PAGE_VSC, 137) << 24))
+                    data = struct.unpack_from('<I', self.vsc_response, 134)[0]
                 else:
                     self.log_error('acquire lock timeout, failed to read serdes tcm register')
                     return YCable.EEPROM_ERROR
@@ -496,6 +545,43 @@ class YCable(YCableBase):
 
         return data
 
+    def tcm_read_many(self, addrs):
+        """
+        This API sends the tcm read command for several addresses in one lock session
+
+        Args:
+             addrs:
+                 a list of Integers, addresses of tcm space
+        Returns:
+            a list of Integers, return data of each tcm address in the order of addrs, -1 for the
+            addresses which could not be read, all of them if the lock could not be acquired
+        """
+
+        addrs = list(addrs)
+        if self.platform_chassis is not None:
+            with self.rlock.acquire_timeout(RLocker.ACQUIRE_LOCK_TIMEOUT) as lock_status:
+                if lock_status:
+                    data = []
+                    vsc_req_form = [None] * (YCable.VSC_CMD_ATTRIBUTE_LENGTH)
+                    vsc_req_form[YCable.VSC_BYTE_OPCODE] = YCable.VSC_OPCODE_TCM_READ
+                    for addr in addrs:
+                        vsc_req_form[130:134] = struct.pack('<I', addr & 0xFFFFFFFF)
+                        status = self.send_vsc(vsc_req_form)
+                        if status != YCable.MCU_EC_NO_ERROR:
+                            self.log_error('tcm read addr[%04X]  error[%04X]' % (addr, status))
+                            data.append(YCable.EEPROM_ERROR)
+                            continue
+
+                        data.append(struct.unpack_from('<I', self.vsc_response, 134)[0])
+                else:
+                    self.log_error('acquire lock timeout, failed to read serdes tcm registers')
+                    return [YCable.EEPROM_ERROR] * len(addrs)
+        else:
+            self.log_error("platform_chassis is not loaded, failed to read serdes tcm registers")
+            return [YCable.EEPROM_ERROR] * len(addrs)
+
+        return data
+
     def tcm_write_atomic(self, addr, data):
         """
         This API sends the tcm write command to the serdes chip via VSC cmd
@@ -560,7 +646,7 @@ class YCable(YCableBase):
             self.log_error('reg read addr[%04X]  error[%04X]' % (addr, status))
             return -1
 
-        return self.read_mmap(YCable.MIS_PAGE_VSC, 134) | (self.read_mmap(YCable.MIS_PAGE_VSC, 135) << 8)
+        return struct.unpack_from('<H', self.vsc_response, 134)[0]
 
     def reg_write(self, addr, data):
         """
@@ -616,7 +702,7 @@ class YCable(YCableBase):
                         self.log_error('reg read addr[%04X]  error[%04X]' % (addr, status))
                         return YCable.EEPROM_ERROR
 
-                    return self.read_mmap(YCable.MIS_PAGE_VSC, 134) | (self.read_mmap(YCable.MIS_PAGE_VSC, 135) << 8)
+                    return struct.unpack_from('<H', self.vsc_response, 134)[0]
                 else:
                     self.log_error('acquire lock timeout, failed to read serdes register')
                     return YCable.EEPROM_ERROR
@@ -624,6 +710,43 @@ class YCable(YCableBase):
             self.log_error("platform_chassis is not loaded, failed to read serdes register")
             return YCable.EEPROM_ERROR
         
+    def reg_read_many(self, addrs):
+        """
+        This API reads several serdes registers in one lock session
+
+        Args:
+             addrs:
+                 a list of Integers, addresses of the serdes registers
+        Returns:
+            a list of Integers, return data of each register in the order of addrs, -1 for the
+            registers which could not be read, all of them if the lock could not be acquired
+        """
+
+        addrs = list(addrs)
+        if self.platform_chassis is not None:
+            with self.rlock.acquire_timeout(RLocker.ACQUIRE_LOCK_TIMEOUT) as lock_status:
+                if lock_status:
+                    data = []
+                    vsc_req_form = [None] * (YCable.VSC_CMD_ATTRIBUTE_LENGTH)
+                    vsc_req_form[YCable.VSC_BYTE_OPCODE] = YCable.VSC_OPCODE_REG_READ
+                    for addr in addrs:
+                        vsc_req_form[130:134] = struct.pack('<I', addr & 0xFFFFFFFF)
+                        status = self.send_vsc(vsc_req_form)
+                        if status != YCable.MCU_EC_NO_ERROR:
+                            self.log_error('reg read addr[%04X]  error[%04X]' % (addr, status))
+                            data.append(YCable.EEPROM_ERROR)
+                            continue
+
+                        data.append(struct.unpack_from('<H', self.vsc_response, 134)[0])
+                else:
+                    self.log_error('acquire lock timeout, failed to read serdes registers')
+                    return [YCable.EEPROM_ERROR] * len(addrs)
+        else:
+            self.log_error("platform_chassis is not loaded, failed to read serdes registers")
+            return [YCable.EEPROM_ERROR] * len(addrs)
+
+        return data
+
     def reg_write_atomic(self, addr, data):
         """
         This API writes the serdes register in atomic method
@@ -662,6 +785,21 @@ class YCable(YCableBase):
 
         return 0        
 
+    @contextmanager
+    def telemetry_session(self):
+        """
+        This API holds the rlock for a whole telemetry snapshot, the snapshot queries
+        re-enter it instead of contending for it once per query
+
+        Yields:
+            a boolean, True if the lock was acquired
+        """
+
+        with self.rlock.acquire_timeout(RLocker.ACQUIRE_LOCK_TIMEOUT) as lock_status:
+            if not lock_status:
+                self.log_error('acquire lock timeout, failed to start telemetry session')
+            yield lock_status
+
     def toggle_mux_to_tor_a(self):
         """
         This API does a hard switch toggle of the Y cable's MUX regardless of link state to
@@ -1456,6 +1594,7 @@ class YCable(YCableBase):
 
         return result
 
+    @firmware_operation
     def download_firmware(self, fwfile):
         """
         This routine should download and store the firmware on all the
@@ -1504,6 +1643,7 @@ class YCable(YCableBase):
                 return YCableBase.FIRMWARE_DOWNLOAD_FAILURE
 
             self.download_firmware_status = self.FIRMWARE_DOWNLOAD_STATUS_INPROGRESS
+            self.download_firmware_progress = 0
 
             '''
             Firmware update start
@@ -1532,18 +1672,17 @@ class YCable(YCableBase):
             while chunk_idx < total_chunk:
                 with self.rlock.acquire_timeout(RLocker.ACQUIRE_LOCK_TIMEOUT) as lock_status:
                     if lock_status:
-                        checksum = 0
                         fw_img_offset = chunk_idx * YCable.VSC_BUFF_SIZE
-                        for byte_offset in range(YCable.VSC_BUFF_SIZE):
-                            checksum += fwImage[fw_img_offset]
-                            fw_img_offset += 1
-                            if (((byte_offset + 1) % YCable.VSC_BLOCK_WRITE_LENGTH) == 0):
-                                page = YCable.MIS_PAGE_FC + byte_offset // 128
-                                byte = 128 + ((byte_offset + 1) - YCable.VSC_BLOCK_WRITE_LENGTH) % 128
-                                self.write_mmap(page, byte, bytearray(
-                                    fwImage[fw_img_offset - YCable.VSC_BLOCK_WRITE_LENGTH: fw_img_offset]), YCable.VSC_BLOCK_WRITE_LENGTH)
+                        chunk = fwImage[fw_img_offset: fw_img_offset + YCable.VSC_BUFF_SIZE]
+                        checksum = sum(chunk)
+                        # the VSC buffer spans the upper halves of pages 0xFC-0xFF, written in blocks
+                        # of the size the MCU accepts in one transaction
+                        for byte_offset in range(0, YCable.VSC_BUFF_SIZE, YCable.VSC_BLOCK_WRITE_LENGTH):
+                            page = YCable.MIS_PAGE_FC + byte_offset // 128
+                            byte = 128 + byte_offset % 128
+                            self.write_mmap(page, byte, chunk[byte_offset: byte_offset + YCable.VSC_BLOCK_WRITE_LENGTH],
+                                            YCable.VSC_BLOCK_WRITE_LENGTH)
 
-                        fw_img_offset = chunk_idx * YCable.VSC_BUFF_SIZE
                         vsc_req_form = [None] * (YCable.VSC_CMD_ATTRIBUTE_LENGTH)
                         vsc_req_form[YCable.VSC_BYTE_OPCODE] = YCable.VSC_OPCODE_FWUPD
                         vsc_req_form[YCable.VSC_BYTE_OPTION] = YCable.FWUPD_OPTION_LOCAL_XFER
@@ -1558,6 +1697,7 @@ class YCable(YCableBase):
                         if status == YCable.MCU_EC_NO_ERROR:
                             chunk_idx += 1
                             retry_count = 0
+                            self.download_firmware_progress = chunk_idx * 100 // total_chunk
                         else:
                             self.log_error('Firmware binary transfer error (error code:%04X)' % (status))
 
@@ -1643,6 +1783,7 @@ class YCable(YCableBase):
 
         return YCableBase.FIRMWARE_DOWNLOAD_SUCCESS
 
+    @firmware_operation
     def activate_firmware(self, fwfile=None, hitless=False):
         """
         This routine should activate the downloaded firmware on all the
@@ -1680,6 +1821,7 @@ class YCable(YCableBase):
                 FIRMWARE_ACTIVATE_SUCCESS
                 FIRMWARE_ACTIVATE_FAILURE
         """
+
         if self.platform_chassis is not None:
             if fwfile is None:
                 with self.rlock.acquire_timeout(RLocker.ACQUIRE_LOCK_TIMEOUT) as lock_status:
@@ -1792,6 +1934,7 @@ class YCable(YCableBase):
 
         return YCableBase.FIRMWARE_ACTIVATE_SUCCESS
 
+    @firmware_operation
     def rollback_firmware(self, fwfile=None):
         """
         This routine should rollback the firmware to the previous version
@@ -1830,6 +1973,7 @@ class YCable(YCableBase):
 
         return YCableBase.FIRMWARE_ROLLBACK_SUCCESS
 
+    @firmware_operation
     def activate_target_firmware(self, target, fwfile=None, hitless=False):
         """
         This routine should activate the downloaded firmware on specific target
@@ -1870,6 +2014,7 @@ class YCable(YCableBase):
                 FIRMWARE_ACTIVATE_SUCCESS
                 FIRMWARE_ACTIVATE_FAILURE
         """
+
         if self.platform_chassis is not None:
 
             if target == YCableBase.TARGET_NIC:
@@ -2554,7 +2699,7 @@ class YCable(YCableBase):
                         status = self.send_vsc(vsc_req_form)
 
                         if status == YCable.MCU_EC_NO_ERROR:
-                            fetch_cnt = self.read_mmap(YCable.MIS_PAGE_VSC, 134)
+                            fetch_cnt = self.vsc_response[134]
                             if (fetch_cnt == 0):
                                 break
                         else:
@@ -2638,17 +2783,20 @@ class YCable(YCableBase):
 
                     base = (quad << 20) + 0xa0000
                     Rx = (ch * 35) + 0x40
-                    pcs_stats['Rx Frames OK']         = self.tcm_read(base + 4 * (Rx + 6))
-                    pcs_stats['Rx Chk SEQ Errs']      = self.tcm_read(base + 4 * (Rx + 7))
-                    pcs_stats['Rx Alignment Errs']    = self.tcm_read(base + 4 * (Rx + 2))
-                    pcs_stats['Rx In Errs']           = self.tcm_read(base + 4 * (Rx + 9))
-                    pcs_stats['Rx FrameTooLong Errs'] = self.tcm_read(base + 4 * (Rx + 4))
-                    pcs_stats['Rx Octets OK']         = self.tcm_read(base + 4 * (Rx + 1))
-
                     Tx = (ch * 26) + 0xC
-                    pcs_stats['Tx Frames OK'] = self.tcm_read(base + 4 * (Tx + 3))
-                    pcs_stats['Tx Out Errs']  = self.tcm_read(base + 4 * (Tx + 5))
-                    pcs_stats['Tx Octets OK'] = self.tcm_read(base + 4 * (Tx + 1))
+                    counters = [('Rx Frames OK',         Rx + 6),
+                                ('Rx Chk SEQ Errs',      Rx + 7),
+                                ('Rx Alignment Errs',    Rx + 2),
+                                ('Rx In Errs',           Rx + 9),
+                                ('Rx FrameTooLong Errs', Rx + 4),
+                                ('Rx Octets OK',         Rx + 1),
+                                ('Tx Frames OK',         Tx + 3),
+                                ('Tx Out Errs',          Tx + 5),
+                                ('Tx Octets OK',         Tx + 1)]
+
+                    data = self.tcm_read_many([base + 4 * reg for _, reg in counters])
+                    for (name, _), value in zip(counters, data):
+                        pcs_stats[name] = value
                 else:
                     self.log_error('acquire lock timeout, failed to get pcs statisics')
                     return YCable.EEPROM_ERROR
@@ -2695,39 +2843,31 @@ class YCable(YCableBase):
 
                     self.tcm_write(base + (3 << 2), 0x10000000 | (1 << ch))
 
-                    lsb = self.tcm_read(base + (8 << 2))
-                    msb = self.tcm_read(base + (0 << 2))
-                    fec_stats['Total recevied CW'] = (msb << 32) | lsb
-
-                    lsb = self.tcm_read(base + (9 << 2))
-                    msb = self.tcm_read(base + (0 << 2))
-                    fec_stats['Total correct CW'] = (msb << 32) | lsb
-
-                    lsb = self.tcm_read(base + (10 << 2))
-                    msb = self.tcm_read(base + (0 << 2))
-                    fec_stats['Total corrected CW'] = (msb << 32) | lsb
-
-                    fec_stats['Total uncorrectable CW'] = self.tcm_read(base + (11 << 2))
-
-                    lsb = self.tcm_read(base + (12 << 2))
-                    msb = self.tcm_read(base + ( 0 << 2))
-                    fec_stats['Corrected CW ( 1 sym err)'] = (msb << 32) | lsb
-                    lsb = self.tcm_read(base + (13 << 2))
-                    msb = self.tcm_read(base + ( 0 << 2))
-                    fec_stats['Corrected CW ( 2 sym err)'] = (msb << 32) | lsb
-                    fec_stats['Corrected CW ( 3 sym err)'] = self.tcm_read(base + (14 << 2))
-                    fec_stats['Corrected CW ( 4 sym err)'] = self.tcm_read(base + (15 << 2))
-                    fec_stats['Corrected CW ( 5 sym err)'] = self.tcm_read(base + (16 << 2))
-                    fec_stats['Corrected CW ( 6 sym err)'] = self.tcm_read(base + (17 << 2))
-                    fec_stats['Corrected CW ( 7 sym err)'] = self.tcm_read(base + (18 << 2))
-                    fec_stats['Corrected CW ( 8 sym err)'] = self.tcm_read(base + (19 << 2))
-                    fec_stats['Corrected CW ( 9 sym err)'] = self.tcm_read(base + (20 << 2))
-                    fec_stats['Corrected CW (10 sym err)'] = self.tcm_read(base + (21 << 2))
-                    fec_stats['Corrected CW (11 sym err)'] = self.tcm_read(base + (22 << 2))
-                    fec_stats['Corrected CW (12 sym err)'] = self.tcm_read(base + (23 << 2))
-                    fec_stats['Corrected CW (13 sym err)'] = self.tcm_read(base + (24 << 2))
-                    fec_stats['Corrected CW (14 sym err)'] = self.tcm_read(base + (25 << 2))
-                    fec_stats['Corrected CW (15 sym err)'] = self.tcm_read(base + (26 << 2))
+                    # (name, register, True if the counter is 64 bit wide). The upper word of
+                    # a 64 bit counter is read from register 0 right after its lower word
+                    counters = [('Total recevied CW',         8,  True),
+                                ('Total correct CW',          9,  True),
+                                ('Total corrected CW',        10, True),
+                                ('Total uncorrectable CW',    11, False),
+                                ('Corrected CW ( 1 sym err)', 12, True),
+                                ('Corrected CW ( 2 sym err)', 13, True)]
+                    counters.extend(('Corrected CW (%2d sym err)' % (n), n + 11, False) for n in range(3, 16))
+
+                    addrs = []
+                    for _, reg, wide in counters:
+                        addrs.append(base + (reg << 2))
+                        if wide:
+                            addrs.append(base + (0 << 2))
+
+                    data = self.tcm_read_many(addrs)
+                    idx = 0
+                    for name, _, wide in counters:
+                        if wide:
+                            fec_stats[name] = (data[idx + 1] << 32) | data[idx]
+                            idx += 2
+                        else:
+                            fec_stats[name] = data[idx]
+                            idx += 1
                 else:
                     self.log_error('acquire lock timeout, failed to get fec statisics')
                     return YCable.EEPROM_ERROR
@@ -2862,9 +3002,13 @@ class YCable(YCableBase):
 
                     anlt_stat['AN_StateMachine'] = an_sm
 
-                    for idx, ln in enumerate(range(lanes[0], lanes[1])):
-                        lt_tx1 = self.reg_read(0xB3 | 0x200 * ln)
-                        lt_tx2 = self.reg_read(0xB4 | 0x200 * ln)
+                    addrs = []
+                    for ln in range(lanes[0], lanes[1]):
+                        addrs.extend([0xB3 | 0x200 * ln, 0xB4 | 0x200 * ln])
+                    data = self.reg_read_many(addrs)
+
+                    for idx in range(lanes[1] - lanes[0]):
+                        lt_tx1, lt_tx2 = data[2 * idx], data[2 * idx + 1]
                         anlt_stat['LT_TX_lane%d' % idx] = [(lt_tx1 >> 8) & 0xFF, lt_tx1 & 0xFF, (lt_tx2 >> 8) & 0xFF, lt_tx2 & 0xFF]
                 else:
                     self.log_error('acquire lock timeout, failed to get anlt stat')
@@ -3549,8 +3693,8 @@ class YCable(YCableBase):
                         self.log_error('Get DSP firmware init status error (error code:0x%04X)' % (status))
                         return result
 
-                    result['err_code'] = self.read_mmap(YCable.MIS_PAGE_VSC, 134)
-                    result['err_stat'] = self.read_mmap(YCable.MIS_PAGE_VSC, 135)
+                    result['err_code'] = self.vsc_response[134]
+                    result['err_stat'] = self.vsc_response[135]
                 else:
                     self.log_error('acquire lock timeout, failed to get init status')
                     return YCable.EEPROM_ERROR
@@ -3584,7 +3728,7 @@ class YCable(YCableBase):
                             return result
 
                         data = self.read_mmap(YCable.MIS_PAGE_FC, 128, 64)
-                        ver  = self.read_mmap(YCable.MIS_PAGE_VSC, 130, 1)
+                        ver  = self.vsc_response[130]
 
                         uartPort = {}
                         cnt = {}
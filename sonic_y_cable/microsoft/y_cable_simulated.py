@@ -5,18 +5,85 @@ test server simulating the physical y-cable.
 
 Mux simulator documentation: https://github.com/Azure/sonic-mgmt/blob/master/ansible/roles/vm_set/files/mux_simulator.md
 """
+import http.client
 import json
 import os
-import urllib.request
-import urllib.error
+import threading
 import time
+import urllib.parse
 
 from sonic_py_common import device_info
 from portconfig import get_port_config
 from natsort import natsorted
 from sonic_y_cable.y_cable_base import YCableBase
+from sonic_y_cable.y_cable_trace import TRACE_HTTP, record, trace_y_cable_apis
 
 
+class MuxSimulatorSession(object):
+    """Keep-alive HTTP connections to the mux simulator server.
+
+    A session is shared by all the simulated y-cables of a process talking to the same server, see get_session().
+    http.client connections are not thread safe, so each thread has its own connection to the server.
+    """
+
+    _sessions = {}
+    _sessions_lock = threading.Lock()
+
+    def __init__(self, host, port, timeout):
+        self.host = host
+        self.port = port
+        self.timeout = timeout
+        self._local = threading.local()
+
+    @classmethod
+    def get_session(cls, host, port, timeout):
+        """Get the session of the mux simulator server at host:port, creating it on first use.
+        """
+        with cls._sessions_lock:
+            session = cls._sessions.get((host, port))
+            if session is None:
+                session = cls._sessions[(host, port)] = cls(host, port, timeout)
+            return session
+
+    def _connection(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = self._local.conn = http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+        return conn
+
+    def close(self):
+        """Close the connection of the calling thread, the next request reconnects.
+        """
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+    def request(self, method, path, body=None, headers=None):
+        """Send a request on the kept-alive connection of the calling thread.
+
+        A connection closed by the server while idle is reopened and the request sent again once.
+
+        Returns:
+            (status, data): the HTTP status code and the bytes of the response body
+        """
+        for attempt in range(2):
+            conn = self._connection()
+            try:
+                conn.request(method, path, body, headers or {})
+                resp = conn.getresponse()
+                return resp.status, resp.read()
+            except (http.client.RemoteDisconnected, http.client.CannotSendRequest, ConnectionResetError,
+                    BrokenPipeError):
+                self.close()
+                if attempt:
+                    raise
+            except Exception:
+                self.close()
+                raise
+
+
+@trace_y_cable_apis
 class YCable(YCableBase):
 
     EEPROM_ERROR = -1
@@ -35,8 +102,25 @@ class YCable(YCableBase):
 
     POLL_TIMEOUT = 30
     POLL_INTERVAL = 1
+    POLL_RETRY_MIN = 0.1
     URLOPEN_TIMEOUT = 5
 
+    # The mux status of all the ports of a vm_set is fetched with one GET /mux/<vm_set> and
+    # served to every cable of the process for MUX_STATUS_CACHE_TTL seconds. 0 disables it.
+    MUX_STATUS_CACHE_TTL = 1
+
+    # physical port -> (logical port index, speed), computed once per process
+    _port_index_map = None
+    _port_index_lock = threading.Lock()
+
+    # vm_set url -> (time.monotonic() of the fetch, mux status of all the ports), successful fetches only
+    _vmset_status = {}
+    # vm_set url -> threading.Event set when the fetch in progress completes
+    _vmset_status_fetching = {}
+    # vm_set url -> number of invalidations, a fetch overtaken by a POST is not cached
+    _vmset_status_generation = {}
+    _vmset_status_lock = threading.Lock()
+
     def __init__(self, port, logger):
         YCableBase.__init__(self, port, logger)
         if not os.path.exists(self.MUX_SIMULATOR_CONFIG_FILE) or not os.path.isfile(self.MUX_SIMULATOR_CONFIG_FILE):
@@ -54,151 +138,194 @@ class YCable(YCableBase):
                 mux_simulator['server_port'],
                 mux_simulator['vm_set'])
             self._url = '{}/{}'.format(self._vmset_url, self.port_index)
+            self._session = MuxSimulatorSession.get_session(mux_simulator['server_ip'],
+                                                            int(mux_simulator['server_port']),
+                                                            self.URLOPEN_TIMEOUT)
             self.side = mux_simulator['side']  # Either "upper_tor" or "lower_tor"
             self._initialized = True
             self.log_notice('Initialized simulated y_cable driver, port={}, index={}'.format(self.port, self.port_index))
         except Exception as e:
             self.log_error('Unexpected content in {}, {}'.format(self.MUX_SIMULATOR_CONFIG_FILE, repr(e)))
 
+    @staticmethod
+    def _get_port_index_map():
+        """Map each physical port to its logical port index and speed.
+
+        The port config is natsorted once per process and shared by all the simulated cables.
+        """
+        with YCable._port_index_lock:
+            if YCable._port_index_map is None:
+                (platform, hwsku) = device_info.get_platform_and_hwsku()
+                ports, _, _ = get_port_config(hwsku, platform)
+
+                intf_names = natsorted(ports.keys(), key=lambda y: y.lower())
+
+                port_index_map = {}
+                for port_index, intf_name in enumerate(intf_names):
+                    physical_port = int(ports[intf_name]['index'])
+                    if physical_port not in port_index_map:
+                        port_index_map[physical_port] = (port_index, int(ports[intf_name]['speed']))
+                YCable._port_index_map = port_index_map
+            return YCable._port_index_map
+
     def _init_port_index(self):
         """Get logical port_index based on the physical "port".
         """
         self.port_index = None
 
-        (platform, hwsku) = device_info.get_platform_and_hwsku()
-        ports, _, _ = get_port_config(hwsku, platform)
-
-        intf_names = natsorted(ports.keys(), key=lambda y: y.lower())
+        port_index_map = self._get_port_index_map()
+        if self.port in port_index_map:
+            self.port_index, self.port_speed = port_index_map[self.port]
+        else:
+            self.log_error('Failed to find index of physical port {}, ports={}'.format(
+                self.port, json.dumps(sorted(port_index_map))))
 
-        port_index = 0
-        for intf_name in intf_names:
-            physical_port = int(ports[intf_name]['index'])
-            if physical_port == self.port:
-                self.port_index = port_index
-                self.port_speed = int(ports[intf_name]['speed'])
-                return
-            port_index += 1
-        if self.port_index is None:
-            self.log_error('Failed to find index of physical port {}, ports={}'.format(self.port, json.dumps(ports)))
+    def _request(self, method, url, post_data=None):
+        """Send a request to the mux simulator, retrying on failure for up to POLL_TIMEOUT seconds.
 
-    def _get(self, url=None):
-        if not self._initialized:
-            return None
+        Retries start after POLL_RETRY_MIN seconds and back off to POLL_INTERVAL seconds.
 
-        if url:
-            get_url = url
+        Returns:
+            The decoded JSON response, None if all the attempts failed
+        """
+        if method == 'GET':
+            request = 'GET {}'.format(url)
+            headers = None
         else:
-            get_url = self._url
+            request = '{} {} with data {}'.format(method, url, post_data)
+            headers = {'Accept': 'application/json', 'Content-Type': 'application/json'}
+
+        split_url = urllib.parse.urlsplit(url)
+        path = split_url.path
+        if split_url.query:
+            path = '{}?{}'.format(path, split_url.query)
 
         start_time = time.time()
         attempt = 1
+        retry_interval = self.POLL_RETRY_MIN
         while True:
+            request_start = time.monotonic()
+            status = None
             try:
-                try:
-                    req = urllib.request.Request(get_url)
-                    with urllib.request.urlopen(req, timeout=self.URLOPEN_TIMEOUT) as resp:
-                        return json.loads(resp.read().decode('utf-8'))
-                except urllib.error.HTTPError as e:
-                    self.log_warning('attempt={}, GET {} for physical_port {} failed with {}, detail: {}'.format(
-                        attempt,
-                        get_url,
-                        self.port,
-                        repr(e),
-                        e.read()))
-            except (urllib.error.URLError, json.decoder.JSONDecodeError, Exception) as e:
-                self.log_warning('attempt={}, GET {} for physical_port {} failed with {}'.format(
+                status, data = self._session.request(method, path, post_data, headers)
+                record(self.port, TRACE_HTTP, method, time.monotonic() - request_start, status >= 400, len(data))
+                if status < 400:
+                    return json.loads(data.decode('utf-8'))
+                self.log_warning('attempt={}, {} for physical_port {} failed with HTTP {}, detail: {}'.format(
                     attempt,
-                    get_url,
+                    request,
+                    self.port,
+                    status,
+                    data))
+            except Exception as e:
+                if status is None:
+                    record(self.port, TRACE_HTTP, method, time.monotonic() - request_start, True)
+                self.log_warning('attempt={}, {} for physical_port {} failed with {}'.format(
+                    attempt,
+                    request,
                     self.port,
                     repr(e)))
 
             # Retry in case of exception, to workaround 'no route to host' issue after pmon restart
             if (time.time() - start_time) > self.POLL_TIMEOUT:
-                self.log_warning('Retry GET {} for physical port {} timeout after {} seconds, attempted={}'.format(
-                    get_url,
+                self.log_warning('Retry {} for physical port {} timeout after {} seconds, attempted={}'.format(
+                    request,
                     self.port,
                     self.POLL_TIMEOUT,
                     attempt
                 ))
                 break
             else:
-                self.log_notice('Sleep {} seconds to retry GET {} for physical port {}'.format(
-                    self.POLL_INTERVAL,
-                    get_url,
+                self.log_notice('Sleep {} seconds to retry {} for physical port {}'.format(
+                    retry_interval,
+                    request,
                     self.port
                 ))
                 attempt += 1
-                time.sleep(self.POLL_INTERVAL)
+                time.sleep(retry_interval)
+                retry_interval = min(retry_interval * 2, self.POLL_INTERVAL)
 
         return None
 
-    def _post(self, url=None, data=None):
+    def _get(self, url=None):
         if not self._initialized:
             return None
 
-        if url:
-            post_url = url
-        else:
-            post_url = self._url
+        return self._request('GET', url if url else self._url)
+
+    def _post(self, url=None, data=None):
+        if not self._initialized:
+            return None
 
         if data is not None:
             post_data = json.dumps(data).encode('utf-8')
         else:
             post_data = None
 
-        start_time = time.time()
-        attempt = 1
-        while True:
-            try:
-                try:
-                    headers = {'Accept': 'application/json', 'Content-Type': 'application/json'}
-                    req = urllib.request.Request(post_url, post_data, headers, method='POST')
-                    with urllib.request.urlopen(req, timeout=self.URLOPEN_TIMEOUT) as resp:
-                        return json.loads(resp.read().decode('utf-8'))
-                except urllib.error.HTTPError as e:
-                    self.log_warning('attempt={}, POST {} with data {} for physical_port {} failed with {}, detail: {}'.format(
-                        attempt,
-                        post_url,
-                        post_data,
-                        self.port,
-                        repr(e),
-                        e.read()
-                    ))
-            except (urllib.error.URLError, json.decoder.JSONDecodeError, Exception) as e:
-                self.log_warning('attempt={}, POST {} with data {} for physical_port {} failed with {}'.format(
-                        attempt,
-                        post_url,
-                        post_data,
-                        self.port,
-                        repr(e)
-                    ))
+        # the mux status changes, the next read fetches it again
+        try:
+            return self._request('POST', url if url else self._url, post_data)
+        finally:
+            self._invalidate_vmset_status()
 
-            # Retry in case of exception, to workaround 'no route to host' issue after pmon restart
-            if time.time() - start_time > self.POLL_TIMEOUT:
-                self.log_warning('Retry POST {} with data{} for physical port {} timeout after {} seconds, attempted={}'.format(
-                    post_url,
-                    post_data,
-                    self.port,
-                    self.POLL_TIMEOUT,
-                    attempt
-                ))
-                break
+    def _get_vmset_status(self):
+        """Get the mux status of all the ports of the vm_set, fetched at most once per MUX_STATUS_CACHE_TTL.
+
+        Concurrent callers wait for the fetch in progress instead of issuing their own. The fetch is done
+        without holding _vmset_status_lock and a failed fetch is not cached.
+
+        Returns:
+            A dict of port index (string) to mux status, None if the fetch failed
+        """
+        with YCable._vmset_status_lock:
+            cached = YCable._vmset_status.get(self._vmset_url)
+            if cached is not None and time.monotonic() - cached[0] < self.MUX_STATUS_CACHE_TTL:
+                return cached[1]
+
+            fetching = YCable._vmset_status_fetching.get(self._vmset_url)
+            if fetching is None:
+                fetching = YCable._vmset_status_fetching[self._vmset_url] = threading.Event()
+                generation = YCable._vmset_status_generation.get(self._vmset_url, 0)
+                fetcher = True
             else:
-                self.log_notice('Sleep {} seconds to retry POST {} with data {} for physical port {}'.format(
-                    self.POLL_INTERVAL,
-                    post_url,
-                    post_data,
-                    self.port
-                ))
-                attempt += 1
-                time.sleep(self.POLL_INTERVAL)
+                fetcher = False
 
-        return None
+        if not fetcher:
+            fetching.wait(self.POLL_TIMEOUT + self.URLOPEN_TIMEOUT)
+            with YCable._vmset_status_lock:
+                cached = YCable._vmset_status.get(self._vmset_url)
+            # None when the fetch failed or was overtaken by a POST, the caller asks for its port alone
+            return cached[1] if cached is not None else None
+
+        status = None
+        try:
+            status = self._get(self._vmset_url)
+            if not isinstance(status, dict):
+                status = None
+        finally:
+            with YCable._vmset_status_lock:
+                if status is not None and YCable._vmset_status_generation.get(self._vmset_url, 0) == generation:
+                    YCable._vmset_status[self._vmset_url] = (time.monotonic(), status)
+                del YCable._vmset_status_fetching[self._vmset_url]
+            fetching.set()
+        return status
+
+    def _invalidate_vmset_status(self):
+        with YCable._vmset_status_lock:
+            YCable._vmset_status.pop(self._vmset_url, None)
+            YCable._vmset_status_generation[self._vmset_url] = \
+                YCable._vmset_status_generation.get(self._vmset_url, 0) + 1
 
     def _get_status(self):
         if not self._initialized:
             return None
         try:
+            if self.MUX_STATUS_CACHE_TTL > 0 and self.port_index is not None:
+                vmset_status = self._get_vmset_status()
+                status = vmset_status.get(str(self.port_index)) if vmset_status is not None else None
+                if isinstance(status, dict):
+                    return status
+                # the vm_set status could not be fetched or misses the port, ask for the port alone
             return self._get()
         except Exception as e:
             self.log_warning('Get {} failed, exception: {}'.format(self._url, repr(e)))
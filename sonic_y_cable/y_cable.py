@@ -8,6 +8,7 @@ try:
     import math
     import time
     import struct
+    import threading
     from ctypes import c_int8
 
     from sonic_py_common import logger
@@ -90,6 +91,10 @@ EEPROM_TIMEOUT_ERROR = -1
 BER_TIMEOUT_SECS = 1
 EYE_TIMEOUT_SECS = 1
 
+# bounded exponential backoff between two reads of a register being polled
+POLL_BACKOFF_MIN_SECS = 0.001
+POLL_BACKOFF_MAX_SECS = 0.05
+
 MAX_NUM_LANES = 4
 
 # switching modes inside muxcable
@@ -137,27 +142,162 @@ def y_cable_validate_read_data(result, size, physical_port, message):
         return EEPROM_READ_DATA_INVALID
 
 
+def y_cable_read_block(physical_port, offset, size, message):
+    """
+    Reads a contiguous block of mux cable registers in a single eeprom transaction,
+    so that multi-byte values and all the lanes can be decoded from one read.
+
+    Args:
+        physical_port:
+             an Integer, the actual physical port connected to a Y cable
+        offset:
+             an Integer, the eeprom offset of the first register
+        size:
+             an Integer, the number of bytes to read
+        message:
+             a string, the name of the block used in the error logs
+    Returns:
+        a bytearray of size bytes, or None if the read failed
+    """
+
+    result = platform_chassis.get_sfp(physical_port).read_eeprom(offset, size)
+    if y_cable_validate_read_data(result, size, physical_port, message) == EEPROM_READ_DATA_INVALID:
+        return None
+    return result
+
+
+def y_cable_poll_register(physical_port, offset, value, timeout, message):
+    """
+    Polls a one byte mux cable register until it reads the expected value,
+    sleeping with a bounded exponential backoff between the reads.
+
+    Args:
+        physical_port:
+             an Integer, the actual physical port connected to a Y cable
+        offset:
+             an Integer, the eeprom offset of the register
+        value:
+             an Integer, the expected value
+        timeout:
+             a float, the number of seconds after which polling is abandoned
+        message:
+             a string, the name of the register used in the error logs
+    Returns:
+        True once the register reads value, EEPROM_ERROR if a read failed, or
+        EEPROM_TIMEOUT_ERROR on timeout
+    """
+
+    time_start = time.time()
+    backoff = POLL_BACKOFF_MIN_SECS
+    while True:
+        done = platform_chassis.get_sfp(physical_port).read_eeprom(offset, 1)
+        if y_cable_validate_read_data(done, 1, physical_port, message) == EEPROM_READ_DATA_INVALID:
+            return EEPROM_ERROR
+        if done[0] == value:
+            return True
+        remaining = timeout - (time.time() - time_start)
+        if remaining <= 0:
+            return EEPROM_TIMEOUT_ERROR
+        time.sleep(min(backoff, remaining))
+        backoff = min(backoff * 2, POLL_BACKOFF_MAX_SECS)
+
+
+# Names of the y_cable driver functions decorated with hook_y_cable_simulator
+y_cable_hooked_functions = set()
+
+# Hooks replacing y_cable driver functions, by function name. Populated from the
+# y_cable_simulator_client module on first use and by register_y_cable_hook()
+y_cable_hooks = {}
+y_cable_hooks_loaded = False
+# Serializes loading the simulator client and changing the hooks
+y_cable_hooks_lock = threading.RLock()
+
+
+def load_y_cable_simulator_hooks():
+    """Looks up the y_cable_simulator_client module and installs its functions as hooks.
+
+    This is done once, the first time a hooked y_cable driver function is called, so that the
+    failing import is not retried on every call on devices without the simulator. It can be
+    called again to pick up a simulator client installed later.
+
+    Returns:
+        True if the y_cable_simulator_client module was found, False otherwise.
+    """
+    global y_cable_hooks_loaded
+    with y_cable_hooks_lock:
+        try:
+            import y_cable_simulator_client
+        except ImportError:
+            y_cable_hooks_loaded = True
+            return False
+
+        for name in y_cable_hooked_functions:
+            y_cable_func = getattr(y_cable_simulator_client, name, None)
+            if y_cable_func and callable(y_cable_func):
+                y_cable_hooks[name] = y_cable_func
+        # only published once the hooks are in place, callers seeing it set do not take the lock
+        y_cable_hooks_loaded = True
+        return True
+
+
+def ensure_y_cable_simulator_hooks():
+    """Loads the simulator hooks unless they were already loaded."""
+    if y_cable_hooks_loaded:
+        return
+    with y_cable_hooks_lock:
+        if not y_cable_hooks_loaded:
+            load_y_cable_simulator_hooks()
+
+
+def register_y_cable_hook(name, func):
+    """Installs func in place of the y_cable driver function called name.
+
+    Args:
+        name (str): The name of a function decorated with hook_y_cable_simulator.
+        func (function): The hook, called with the arguments of the driver function.
+    """
+    if name not in y_cable_hooked_functions:
+        raise ValueError("{} is not a hookable y_cable function".format(name))
+    with y_cable_hooks_lock:
+        ensure_y_cable_simulator_hooks()
+        y_cable_hooks[name] = func
+
+
+def unregister_y_cable_hook(name=None):
+    """Removes the hook installed for the y_cable driver function called name.
+
+    Args:
+        name (str): The function name, None removes all the hooks.
+    """
+    with y_cable_hooks_lock:
+        ensure_y_cable_simulator_hooks()
+        if name is None:
+            y_cable_hooks.clear()
+        else:
+            y_cable_hooks.pop(name, None)
+
+
 def hook_y_cable_simulator(target):
     """Decorator to add hook for calling y_cable_simulator_client.
 
     This decorator updates the y_cable driver functions to call hook functions defined in the y_cable_simulator_client
-    module if importing the module is successful. If importing the y_cable_simulator_client module failed, just call
+    module if importing the module is successful, or registered with register_y_cable_hook(). Otherwise just call
     the original y_cable driver functions defined in this module.
 
     Args:
         target (function): The y_cable driver function to be updated.
     """
+    name = target.__name__
+    y_cable_hooked_functions.add(name)
+
     def wrapper(*args, **kwargs):
-        try:
-            import y_cable_simulator_client
-            y_cable_func = getattr(y_cable_simulator_client, target.__name__, None)
-            if y_cable_func and callable(y_cable_func):
-                return y_cable_func(*args, **kwargs)
-            else:
-                return target(*args, **kwargs)
-        except ImportError:
-            return target(*args, **kwargs)
-    wrapper.__name__ = target.__name__
+        ensure_y_cable_simulator_hooks()
+        y_cable_func = y_cable_hooks.get(name)
+        if y_cable_func is not None:
+            return y_cable_func(*args, **kwargs)
+        return target(*args, **kwargs)
+    wrapper.__name__ = name
+    wrapper.__doc__ = target.__doc__
     return wrapper
 
 
@@ -885,30 +1025,17 @@ def get_ber_info(physical_port, target):
             physical_port).write_eeprom(curr_offset, 1, buffer)
         if result is False:
             return result
-        time_start = time.time()
-        while(True):
-            done = platform_chassis.get_sfp(physical_port).read_eeprom(curr_offset, 1)
-            if y_cable_validate_read_data(done, 1, physical_port, "BER data ready to read") == EEPROM_READ_DATA_INVALID:
-                return EEPROM_ERROR
-            time_now = time.time()
-            time_diff = time_now - time_start
-            if done[0] == 1:
-                break
-            elif time_diff >= BER_TIMEOUT_SECS:
-                return EEPROM_TIMEOUT_ERROR
-
-        idx = 0
-        curr_offset = OFFSET_LANE_1_BER_RESULT
+        result = y_cable_poll_register(physical_port, curr_offset, 1, BER_TIMEOUT_SECS, "BER data ready to read")
+        if result is not True:
+            return result
+
+        # msb and lsb of all the lanes in one read
+        block = y_cable_read_block(physical_port, OFFSET_LANE_1_BER_RESULT, 2 * MAX_NUM_LANES, "BER data result")
+        if block is None:
+            return EEPROM_ERROR
         for lane in range(MAX_NUM_LANES):
-            msb_result = platform_chassis.get_sfp(physical_port).read_eeprom(curr_offset+idx, 1)
-            if y_cable_validate_read_data(msb_result, 1, physical_port, "BER data msb result") == EEPROM_READ_DATA_INVALID:
-                return EEPROM_ERROR
-            lsb_result = platform_chassis.get_sfp(physical_port).read_eeprom(curr_offset+1+idx, 1)
-            if y_cable_validate_read_data(lsb_result, 1, physical_port, "BER data lsb result") == EEPROM_READ_DATA_INVALID:
-                return EEPROM_ERROR
-            lane_result = msb_result[0] * math.pow(10, (lsb_result[0]-24))
+            lane_result = block[2 * lane] * math.pow(10, (block[2 * lane + 1]-24))
             ber_result.append(lane_result)
-            idx += 2
 
     else:
         helper_logger.log_error("platform_chassis is not loaded, failed to configure the PRBS type")
@@ -963,30 +1090,17 @@ def get_eye_info(physical_port, target):
         if result is False:
             return result
 
-        time_start = time.time()
-        while(True):
-            done = platform_chassis.get_sfp(physical_port).read_eeprom(curr_offset, 1)
-            if y_cable_validate_read_data(done, 1, physical_port, "EYE data ready to read") == EEPROM_READ_DATA_INVALID:
-                return EEPROM_ERROR
-            time_now = time.time()
-            time_diff = time_now - time_start
-            if done[0] == 1:
-                break
-            elif time_diff >= EYE_TIMEOUT_SECS:
-                return EEPROM_TIMEOUT_ERROR
-
-        idx = 0
+        result = y_cable_poll_register(physical_port, curr_offset, 1, EYE_TIMEOUT_SECS, "EYE data ready to read")
+        if result is not True:
+            return result
+
+        # msb and lsb of all the lanes in one read
+        block = y_cable_read_block(physical_port, OFFSET_LANE_1_EYE_RESULT, 2 * MAX_NUM_LANES, "EYE data result")
+        if block is None:
+            return EEPROM_ERROR
         for lane in range(MAX_NUM_LANES):
-            curr_offset = OFFSET_LANE_1_EYE_RESULT
-            msb_result = platform_chassis.get_sfp(physical_port).read_eeprom(curr_offset+idx, 1)
-            if y_cable_validate_read_data(msb_result, 1, physical_port, "EYE data msb result") == EEPROM_READ_DATA_INVALID:
-                return EEPROM_ERROR
-            lsb_result = platform_chassis.get_sfp(physical_port).read_eeprom(curr_offset+1+idx, 1)
-            if y_cable_validate_read_data(lsb_result, 1, physical_port, "EYE data lsb result") == EEPROM_READ_DATA_INVALID:
-                return EEPROM_ERROR
-            lane_result = (msb_result[0] << 8 | lsb_result[0])
+            lane_result = (block[2 * lane] << 8 | block[2 * lane + 1])
             eye_result.append(lane_result)
-            idx += 2
 
     else:
         helper_logger.log_error("platform_chassis is not loaded, failed to configure the PRBS type")
@@ -1077,19 +1191,10 @@ def get_switch_count(physical_port, count_type):
     count = 0
 
     if platform_chassis is not None:
-        msb_result = platform_chassis.get_sfp(physical_port).read_eeprom(curr_offset, 1)
-        if y_cable_validate_read_data(msb_result, 1, physical_port, "{} switch count msb result".format(count_type)) == EEPROM_READ_DATA_INVALID:
-            return EEPROM_ERROR
-        msb_result_1 = platform_chassis.get_sfp(physical_port).read_eeprom(curr_offset + 1, 1)
-        if y_cable_validate_read_data(msb_result_1, 1, physical_port, "{} switch count msb result 1".format(count_type)) == EEPROM_READ_DATA_INVALID:
-            return EEPROM_ERROR
-        msb_result_2 = platform_chassis.get_sfp(physical_port).read_eeprom(curr_offset + 2, 1)
-        if y_cable_validate_read_data(msb_result_2, 1, physical_port, "{} switch count msb result 2".format(count_type)) == EEPROM_READ_DATA_INVALID:
+        block = y_cable_read_block(physical_port, curr_offset, 4, "{} switch count result".format(count_type))
+        if block is None:
             return EEPROM_ERROR
-        lsb_result = platform_chassis.get_sfp(physical_port).read_eeprom(curr_offset+3, 1)
-        if y_cable_validate_read_data(lsb_result, 1, physical_port, "{} switch count lsb result".format(count_type)) == EEPROM_READ_DATA_INVALID:
-            return EEPROM_ERROR
-        count = (msb_result[0] << 24 | msb_result_1[0] << 16 | msb_result_2[0] << 8 | lsb_result[0])
+        count = struct.unpack('>I', block)[0]
 
     else:
         helper_logger.log_error("platform_chassis is not loaded, failed to get manual switch count")
@@ -1127,26 +1232,11 @@ def get_target_cursor_values(physical_port, lane, target):
     result = []
 
     if platform_chassis is not None:
-        pre1 = platform_chassis.get_sfp(physical_port).read_eeprom(curr_offset + (target)*20 + (lane-1)*5, 1)
-        if y_cable_validate_read_data(pre1, 1, physical_port, "target cursor result") == EEPROM_READ_DATA_INVALID:
-            return EEPROM_ERROR
-        result.append(c_int8(pre1[0]).value)
-        pre2 = platform_chassis.get_sfp(physical_port).read_eeprom(curr_offset + (target)*20 + (lane-1)*5 + 1, 1)
-        if y_cable_validate_read_data(pre2, 1, physical_port, "target cursor result") == EEPROM_READ_DATA_INVALID:
+        # pre one, pre two, main, post one and post two cursors in one read
+        block = y_cable_read_block(physical_port, curr_offset + (target)*20 + (lane-1)*5, 5, "target cursor result")
+        if block is None:
             return EEPROM_ERROR
-        result.append(c_int8(pre2[0]).value)
-        main = platform_chassis.get_sfp(physical_port).read_eeprom(curr_offset + (target)*20 + (lane-1)*5 + 2, 1)
-        if y_cable_validate_read_data(main, 1, physical_port, "target cursor result") == EEPROM_READ_DATA_INVALID:
-            return EEPROM_ERROR
-        result.append(c_int8(main[0]).value)
-        post1 = platform_chassis.get_sfp(physical_port).read_eeprom(curr_offset + (target)*20 + (lane-1)*5 + 3, 1)
-        if y_cable_validate_read_data(post1, 1, physical_port, "target cursor result") == EEPROM_READ_DATA_INVALID:
-            return EEPROM_ERROR
-        result.append(c_int8(post1[0]).value)
-        post2 = platform_chassis.get_sfp(physical_port).read_eeprom(curr_offset + (target)*20 + (lane-1)*5 + 4, 1)
-        if y_cable_validate_read_data(post2, 1, physical_port, "target cursor result") == EEPROM_READ_DATA_INVALID:
-            return EEPROM_ERROR
-        result.append(c_int8(post2[0]).value)
+        result.extend(c_int8(value).value for value in block)
 
     else:
         helper_logger.log_error("platform_chassis is not loaded, failed to get target cursor values")
@@ -1192,12 +1282,11 @@ def get_firmware_version(physical_port, target):
     data = bytearray(FIRMWARE_INFO_PAYLOAD_SIZE)
 
     if platform_chassis is not None:
-        for byte_idx in range(0, FIRMWARE_INFO_PAYLOAD_SIZE):
-            curr_offset = 0xfc * 128 + 128 + byte_idx
-            read_out = platform_chassis.get_sfp(physical_port).read_eeprom(curr_offset, 1)
-            if y_cable_validate_read_data(read_out, 1, physical_port, "firmware info") == EEPROM_READ_DATA_INVALID:
-                return EEPROM_ERROR
-            data[byte_idx] = read_out[0]
+        curr_offset = 0xfc * 128 + 128
+        read_out = y_cable_read_block(physical_port, curr_offset, FIRMWARE_INFO_PAYLOAD_SIZE, "firmware info")
+        if read_out is None:
+            return EEPROM_ERROR
+        data[:] = read_out
     else:
         helper_logger.log_error("platform_chassis is not loaded, failed to get NIC lanes active")
         return -1
@@ -1255,19 +1344,15 @@ def get_internal_voltage_temp(physical_port):
 
     curr_offset = OFFSET_INTERNAL_TEMPERATURE
     if platform_chassis is not None:
-        result = platform_chassis.get_sfp(physical_port).read_eeprom(curr_offset, 1)
-        if y_cable_validate_read_data(result, 1, physical_port, "internal voltage") == EEPROM_READ_DATA_INVALID:
-            return EEPROM_ERROR
-        curr_offset = OFFSET_INTERNAL_VOLTAGE
-        msb_result = platform_chassis.get_sfp(physical_port).read_eeprom(curr_offset, 1)
-        if y_cable_validate_read_data(msb_result, 1, physical_port, "internal temperature msb") == EEPROM_READ_DATA_INVALID:
-            return EEPROM_ERROR
-        lsb_result = platform_chassis.get_sfp(physical_port).read_eeprom(curr_offset+1, 1)
-        if y_cable_validate_read_data(lsb_result, 1, physical_port, "internal temperature lsb") == EEPROM_READ_DATA_INVALID:
+        # temperature through voltage lsb in one read
+        size = OFFSET_INTERNAL_VOLTAGE + 2 - curr_offset
+        block = y_cable_read_block(physical_port, curr_offset, size, "internal voltage and temperature")
+        if block is None:
             return EEPROM_ERROR
 
-        temp = result[0]
-        voltage = (((msb_result[0] << 8) | lsb_result[0]) * 0.0001)
+        voltage_idx = OFFSET_INTERNAL_VOLTAGE - curr_offset
+        temp = block[0]
+        voltage = (((block[voltage_idx] << 8) | block[voltage_idx + 1]) * 0.0001)
     else:
         helper_logger.log_error("platform_chassis is not loaded, failed to get internal voltage and temp")
         return -1
@@ -1280,19 +1365,15 @@ def get_nic_voltage_temp(physical_port):
 
     curr_offset = OFFSET_NIC_TEMPERATURE
     if platform_chassis is not None:
-        result = platform_chassis.get_sfp(physical_port).read_eeprom(curr_offset, 1)
-        if y_cable_validate_read_data(result, 1, physical_port, "internal voltage") == EEPROM_READ_DATA_INVALID:
-            return EEPROM_ERROR
-        curr_offset = OFFSET_NIC_VOLTAGE
-        msb_result = platform_chassis.get_sfp(physical_port).read_eeprom(curr_offset, 1)
-        if y_cable_validate_read_data(msb_result, 1, physical_port, "internal temperature msb") == EEPROM_READ_DATA_INVALID:
-            return EEPROM_ERROR
-        lsb_result = platform_chassis.get_sfp(physical_port).read_eeprom(curr_offset+1, 1)
-        if y_cable_validate_read_data(lsb_result, 1, physical_port, "internal temperature lsb") == EEPROM_READ_DATA_INVALID:
+        # temperature through voltage lsb in one read
+        size = OFFSET_NIC_VOLTAGE + 2 - curr_offset
+        block = y_cable_read_block(physical_port, curr_offset, size, "NIC voltage and temperature")
+        if block is None:
             return EEPROM_ERROR
 
-        temp = result[0]
-        voltage = (((msb_result[0] << 8) | lsb_result[0]) * 0.0001)
+        voltage_idx = OFFSET_NIC_VOLTAGE - curr_offset
+        temp = block[0]
+        voltage = (((block[voltage_idx] << 8) | block[voltage_idx + 1]) * 0.0001)
     else:
         helper_logger.log_error("platform_chassis is not loaded, failed to get NIC voltage and temp")
         return -1
@@ -1321,14 +1402,11 @@ def get_local_voltage(physical_port):
 
     if platform_chassis is not None:
         curr_offset = OFFSET_INTERNAL_VOLTAGE
-        msb_result = platform_chassis.get_sfp(physical_port).read_eeprom(curr_offset, 1)
-        if y_cable_validate_read_data(msb_result, 1, physical_port, "local voltage MSB") == EEPROM_READ_DATA_INVALID:
-            return EEPROM_ERROR
-        lsb_result = platform_chassis.get_sfp(physical_port).read_eeprom(curr_offset+1, 1)
-        if y_cable_validate_read_data(lsb_result, 1, physical_port, "local voltage LSB") == EEPROM_READ_DATA_INVALID:
+        block = y_cable_read_block(physical_port, curr_offset, 2, "local voltage")
+        if block is None:
             return EEPROM_ERROR
 
-        voltage = (((msb_result[0] << 8) | lsb_result[0]) * 0.0001)
+        voltage = (((block[0] << 8) | block[1]) * 0.0001)
     else:
         helper_logger.log_error("platform_chassis is not loaded, failed to get local voltage")
         return -1
@@ -1357,14 +1435,11 @@ def get_nic_voltage(physical_port):
 
     curr_offset = OFFSET_NIC_VOLTAGE
     if platform_chassis is not None:
-        msb_result = platform_chassis.get_sfp(physical_port).read_eeprom(curr_offset, 1)
-        if y_cable_validate_read_data(msb_result, 1, physical_port, "NIC voltage MSB") == EEPROM_READ_DATA_INVALID:
-            return EEPROM_ERROR
-        lsb_result = platform_chassis.get_sfp(physical_port).read_eeprom(curr_offset+1, 1)
-        if y_cable_validate_read_data(lsb_result, 1, physical_port, "NIC voltage LSB") == EEPROM_READ_DATA_INVALID:
+        block = y_cable_read_block(physical_port, curr_offset, 2, "NIC voltage")
+        if block is None:
             return EEPROM_ERROR
 
-        voltage = (((msb_result[0] << 8) | lsb_result[0]) * 0.0001)
+        voltage = (((block[0] << 8) | block[1]) * 0.0001)
     else:
         helper_logger.log_error("platform_chassis is not loaded, failed to get NIC voltage")
         return -1
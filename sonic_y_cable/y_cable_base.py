@@ -8,6 +8,33 @@
     with a vendor-specific Y-Cable
 """
 
+import functools
+import threading
+import time
+from contextlib import contextmanager
+
+from sonic_y_cable.y_cable_trace import trace_y_cable_api
+
+
+def firmware_operation(func):
+    """
+    Decorator of the vendor APIs changing the firmware of the cable (download, activate,
+    rollback). The static data cached by get_static_data is dropped when the API starts and
+    again when it returns, and get_static_data does not cache anything while it runs.
+    """
+    @functools.wraps(func)
+    def wrapper(self, *args, **kwargs):
+        with self._static_data_lock:
+            self._firmware_operations += 1
+        self.invalidate_static_data()
+        try:
+            return func(self, *args, **kwargs)
+        finally:
+            with self._static_data_lock:
+                self._firmware_operations -= 1
+            self.invalidate_static_data()
+    return wrapper
+
 #
 # YCableBase ===================================================================
 #
@@ -77,6 +104,10 @@ class YCableBase():
     FIRMWARE_DOWNLOAD_STATUS_INPROGRESS = 1
     FIRMWARE_DOWNLOAD_STATUS_FAILED = 2
 
+    # The download_firmware_progress variable may be updated inside
+    # download_firmware routine with the percentage (0-100) of the
+    # firmware image transferred so far, for progress reporting
+
 
     # Valid status values for mux togge
     # The mux_toggle_status variable should be assigned/used
@@ -92,6 +123,9 @@ class YCableBase():
     PRBS_DIRECTION_GENERATOR = 1
     PRBS_DIRECTION_CHECKER = 2
 
+    # definitions of the targets queried by get_telemetry_snapshot
+    TELEMETRY_TARGETS = (TARGET_NIC, TARGET_TOR_A, TARGET_TOR_B)
+
     def __init__(self, port, logger):
         """
         Args:
@@ -105,8 +139,17 @@ class YCableBase():
         self.port = port
         self._logger = logger
         self.download_firmware_status = self.FIRMWARE_DOWNLOAD_STATUS_NOT_INITIATED_OR_FINISHED
+        self.download_firmware_progress = 0
         self.mux_toggle_status = self.MUX_TOGGLE_STATUS_NOT_INITIATED_OR_FINISHED
 
+        # identity data cached by get_static_data, and a generation number bumped
+        # by invalidate_static_data so that a read racing with it is not cached
+        self._static_data = {}
+        self._static_data_generation = 0
+        self._static_data_lock = threading.Lock()
+        # number of firmware_operation decorated APIs running, see get_static_data
+        self._firmware_operations = 0
+
 
     def log_warning(self, msg):
         self._logger.log_warning("y_cable_port {}: {}".format(self.port, msg))
@@ -1297,3 +1340,165 @@ class YCableBase():
         """
 
         raise NotImplementedError
+
+    def invalidate_static_data(self):
+        """
+        This API drops the identity data cached by get_static_data, so that it is read
+        again from the cable on the next call.
+        It should be called when the cable is removed or inserted (OIR). The vendor
+        firmware download, activate and rollback APIs decorated with firmware_operation
+        call it when they start and when they return.
+        The port on which this API is called for can be referred using self.port.
+
+        Args:
+
+        Returns:
+            None
+        """
+
+        with self._static_data_lock:
+            self._static_data = {}
+            self._static_data_generation += 1
+
+    def get_static_data(self, targets=TELEMETRY_TARGETS):
+        """
+        This API returns the identity data of the cable, which does not change until
+        the cable is replaced or its firmware is changed. The values are read once
+        and cached until invalidate_static_data is called. A value which could not
+        be read, or a firmware version returned with a 'cached' key set to True,
+        is not cached and is read again on the next call.
+        The port on which this API is called for can be referred using self.port.
+
+        Args:
+            targets:
+                an iterable of the targets for which the firmware version is returned
+
+        Returns:
+            a Dictionary:
+                 with vendor, part_number, serial_number and firmware_version keys,
+                 firmware_version being a Dictionary of target to the result of
+                 get_firmware_version. A value is None if it could not be read.
+        """
+
+        with self._static_data_lock:
+            generation = self._static_data_generation
+            cached = dict(self._static_data)
+
+        read = {}
+        queries = [('vendor', 'get_vendor', ()),
+                   ('part_number', 'get_part_number', ()),
+                   ('serial_number', 'get_serial_number', ())]
+        queries.extend((('firmware_version', target), 'get_firmware_version', (target,)) for target in targets)
+
+        for key, api, args in queries:
+            if key in cached:
+                continue
+            try:
+                value = getattr(self, api)(*args)
+            except (AttributeError, NotImplementedError):
+                continue
+            except Exception as e:
+                self.log_warning("{} failed while reading static data: {}".format(api, repr(e)))
+                continue
+            # the vendor APIs return an error code or None on failure
+            if isinstance(value, dict if isinstance(key, tuple) else str) and value:
+                read[key] = value
+
+        if read:
+            with self._static_data_lock:
+                # the firmware versions may change until the firmware operations complete
+                if (generation == self._static_data_generation and not self._firmware_operations and
+                        self.download_firmware_status != self.FIRMWARE_DOWNLOAD_STATUS_INPROGRESS):
+                    # nor are the versions a vendor returned from its own cache, marked 'cached'
+                    self._static_data.update((key, value) for key, value in read.items()
+                                             if not (isinstance(value, dict) and value.get('cached')))
+            cached.update(read)
+
+        return {'vendor': cached.get('vendor'),
+                'part_number': cached.get('part_number'),
+                'serial_number': cached.get('serial_number'),
+                'firmware_version': {target: cached.get(('firmware_version', target)) for target in targets}}
+
+    @contextmanager
+    def telemetry_session(self):
+        """
+        This API is a context manager wrapping the queries of get_telemetry_snapshot, so that
+        they are done in one session on the cable. Vendor implementations override it to take
+        their port lock once for the whole snapshot instead of once per query.
+
+        Yields:
+            a Boolean, True if the session could be started (e.g. the lock was acquired)
+        """
+
+        yield True
+
+    @trace_y_cable_api
+    def get_telemetry_snapshot(self, targets=TELEMETRY_TARGETS):
+        """
+        This API returns, in a single record, the data collected by a periodic telemetry
+        cycle: the cached identity data (see get_static_data), the mux state, eye heights,
+        switch counts, temperatures and voltages of the cable. The dynamic values are
+        collected in one telemetry_session.
+        A value is None if the API is not implemented or failed, the errors of the failed
+        APIs are reported under the errors key.
+        The port on which this API is called for can be referred using self.port.
+
+        Args:
+            targets:
+                an iterable of the targets for which the per target values are returned
+
+        Returns:
+            a Dictionary:
+                 with the keys
+                     static: the result of get_static_data
+                     mux_direction, active_linked_tor_side: the results of the corresponding APIs
+                     link_active, eye_heights: a Dictionary of target to the result of
+                         is_link_active / get_eye_heights
+                     switch_count: a Dictionary with SWITCH_COUNT_MANUAL and SWITCH_COUNT_AUTO keys,
+                         the results of get_switch_count_total
+                     nic_temperature, local_temperature, nic_voltage, local_voltage: the results
+                         of the corresponding APIs
+                     errors: a Dictionary of query name to the error it raised
+                     time: the number of seconds spent collecting the snapshot
+        """
+
+        targets = tuple(targets)
+        time_start = time.monotonic()
+
+        # read outside of the session, it is usually cached anyway
+        snapshot = {'static': self.get_static_data(targets)}
+        snapshot.update({'mux_direction': None, 'active_linked_tor_side': None,
+                         'link_active': {target: None for target in targets},
+                         'eye_heights': {target: None for target in targets},
+                         'switch_count': {self.SWITCH_COUNT_MANUAL: None, self.SWITCH_COUNT_AUTO: None},
+                         'nic_temperature': None, 'local_temperature': None,
+                         'nic_voltage': None, 'local_voltage': None, 'errors': {}})
+
+        queries = [(('mux_direction',), self.get_mux_direction, ()),
+                   (('active_linked_tor_side',), self.get_active_linked_tor_side, ())]
+        queries.extend((('link_active', target), self.is_link_active, (target,)) for target in targets)
+        queries.extend((('eye_heights', target), self.get_eye_heights, (target,)) for target in targets)
+        queries.extend((('switch_count', count_type), self.get_switch_count_total, (count_type,))
+                       for count_type in (self.SWITCH_COUNT_MANUAL, self.SWITCH_COUNT_AUTO))
+        queries.extend(((name,), getattr(self, 'get_' + name), ())
+                       for name in ('nic_temperature', 'local_temperature', 'nic_voltage', 'local_voltage'))
+
+        with self.telemetry_session() as session:
+            if not session:
+                snapshot['errors']['session'] = 'failed to start the telemetry session'
+            else:
+                for key, query, args in queries:
+                    try:
+                        value = query(*args)
+                    except NotImplementedError:
+                        continue
+                    except Exception as e:
+                        snapshot['errors']['_'.join(str(k) for k in key)] = repr(e)
+                        continue
+                    if len(key) == 1:
+                        snapshot[key[0]] = value
+                    else:
+                        snapshot[key[0]][key[1]] = value
+
+        snapshot['time'] = time.monotonic() - time_start
+        return snapshot
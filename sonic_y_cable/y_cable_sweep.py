@@ -0,0 +1,105 @@
+"""
+    y_cable_sweep.py
+
+    Concurrent collection of the mux state of several Y-Cables.
+    The queries are issued through the public YCableBase API of each cable,
+    so the per-port locking of the vendor implementations (PortLock, RLocker)
+    still applies. Cables sharing a bus are swept one after the other by the
+    same worker, cables on different buses are swept concurrently.
+"""
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from sonic_y_cable.y_cable_base import YCableBase
+
+# default targets for which is_link_active() is queried
+SWEEP_LINK_TARGETS = (YCableBase.TARGET_NIC, YCableBase.TARGET_TOR_A, YCableBase.TARGET_TOR_B)
+
+# default number of buses swept concurrently
+SWEEP_MAX_WORKERS = 16
+
+
+def sweep_cable_mux_state(cable, link_targets=SWEEP_LINK_TARGETS):
+    """
+    Collects the mux state of one cable
+
+    Args:
+        cable:
+             an object derived from YCableBase
+        link_targets:
+             an iterable of the targets for which the link state is queried
+
+    Returns:
+        a dict with the keys
+            'mux_direction': the result of get_mux_direction()
+            'active_linked_tor_side': the result of get_active_linked_tor_side()
+            'link_active': a dict of target to the result of is_link_active(target)
+            'errors': a dict of query name to the error raised by that query
+            'start': the time.time() at which the first query was issued
+            'time': the number of seconds spent querying the cable
+    """
+    state = {'mux_direction': None, 'active_linked_tor_side': None, 'link_active': {}, 'errors': {}}
+    queries = [('mux_direction', cable.get_mux_direction, ()),
+               ('active_linked_tor_side', cable.get_active_linked_tor_side, ())]
+    queries.extend(('link_active', cable.is_link_active, (target,)) for target in link_targets)
+
+    state['start'] = time.time()
+    time_start = time.monotonic()
+    for name, query, args in queries:
+        try:
+            result = query(*args)
+        except Exception as e:
+            state['errors'][name if not args else '{}_{}'.format(name, args[0])] = repr(e)
+            continue
+        if args:
+            state[name][args[0]] = result
+        else:
+            state[name] = result
+    state['time'] = time.monotonic() - time_start
+    return state
+
+
+def sweep_mux_state(cables, bus_key, max_workers=SWEEP_MAX_WORKERS, link_targets=SWEEP_LINK_TARGETS):
+    """
+    Collects the mux state of several cables concurrently
+
+    Args:
+        cables:
+             an iterable of objects derived from YCableBase
+        bus_key:
+             a callable returning, for a cable, the key of the bus it sits on
+             (e.g. its i2c bus number, which only the platform knows). Cables with
+             the same key are swept serially, so a platform with every port on its
+             own bus passes a callable returning the port.
+        max_workers:
+             an Integer, the maximum number of buses swept concurrently
+        link_targets:
+             an iterable of the targets for which the link state is queried
+
+    Returns:
+        a dict of port to the state returned by sweep_cable_mux_state() for that port
+    """
+    # group by bus, and by port within a bus so that a cable is never
+    # queried by two workers at the same time
+    buses = {}
+    for cable in cables:
+        ports = buses.setdefault(bus_key(cable), {})
+        ports.setdefault(cable.port, cable)
+
+    def sweep_bus(bus_cables):
+        return [(cable.port, sweep_cable_mux_state(cable, link_targets)) for cable in bus_cables]
+
+    table = {}
+    if not buses:
+        return table
+
+    if max_workers <= 1 or len(buses) == 1:
+        for bus_cables in buses.values():
+            table.update(sweep_bus(bus_cables.values()))
+        return table
+
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(buses))) as executor:
+        for result in executor.map(sweep_bus, [list(bus_cables.values()) for bus_cables in buses.values()]):
+            table.update(result)
+    return table
@@ -0,0 +1,288 @@
+"""
+    y_cable_trace.py
+
+    Per-port transaction accounting and latency tracing for the Y-Cable drivers.
+    The drivers record here their eeprom reads and writes (through the chassis
+    returned by trace_chassis()), their MCU commands, the time spent waiting for
+    their port locks and the latency of their public APIs. Time spent in eeprom
+    accesses, lock waits and MCU commands during an API call is also added to the
+    breakdown of that call, so that a slow toggle can be attributed to I2C, lock
+    contention or the MCU. ycabled reads the statistics with get_trace_stats().
+"""
+
+import functools
+import threading
+import time
+
+# categories of the recorded transactions
+TRACE_EEPROM_READ = 'eeprom_read'
+TRACE_EEPROM_WRITE = 'eeprom_write'
+TRACE_MCU_CMD = 'mcu_cmd'
+TRACE_LOCK_WAIT = 'lock_wait'
+TRACE_LOCK_HOLD = 'lock_hold'
+TRACE_HTTP = 'http'
+TRACE_API = 'api'
+
+# public APIs of YCableBase traced by trace_y_cable_apis
+TRACED_APIS = (
+    'toggle_mux_to_tor_a',
+    'toggle_mux_to_tor_b',
+    'get_read_side',
+    'get_mux_direction',
+    'get_active_linked_tor_side',
+    'is_link_active',
+    'get_eye_heights',
+    'get_switch_count_total',
+    'get_switch_count_target',
+    'get_firmware_version',
+    'download_firmware',
+    'activate_firmware',
+    'rollback_firmware',
+    'set_switching_mode',
+    'get_switching_mode',
+    'get_alive_status',
+    'reset',
+    'health_check',
+    'get_telemetry_snapshot',
+)
+
+y_cable_tracing_enabled = True
+
+# port -> PortTraceStats, see get_trace_stats()
+y_cable_trace_stats = {}
+# only taken to add the statistics of a new port, the ports record under their own lock
+y_cable_trace_lock = threading.Lock()
+
+# API calls in progress on the current thread, innermost last
+y_cable_trace_spans = threading.local()
+
+
+class PortTraceStats(object):
+    """Statistics of the transactions of one port, (category, name) -> statistics.
+
+    Each port has its own lock, so that the cables accessed concurrently do not contend
+    on a process-wide lock for every eeprom access.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.stats = {}
+
+
+def get_port_trace_stats(port):
+    """Returns the PortTraceStats of port, created on first use.
+    """
+    port_stats = y_cable_trace_stats.get(port)
+    if port_stats is None:
+        with y_cable_trace_lock:
+            port_stats = y_cable_trace_stats.setdefault(port, PortTraceStats())
+    return port_stats
+
+
+def set_tracing_enabled(enabled):
+    """Enables or disables the recording of the statistics, enabled by default.
+    """
+    global y_cable_tracing_enabled
+    y_cable_tracing_enabled = enabled
+
+
+def record(port, category, name, seconds, error=False, size=0):
+    """Records one transaction.
+
+    Args:
+        port (int): The physical port of the cable.
+        category (str): One of the TRACE_* categories.
+        name (str): The name of the transaction within the category, e.g. the API name or the MCU command.
+        seconds (float): The duration of the transaction.
+        error (bool): True if the transaction failed.
+        size (int): The number of bytes transferred.
+    """
+    if not y_cable_tracing_enabled:
+        return
+
+    # account the time to the API calls in progress on this thread
+    if category not in (TRACE_API, TRACE_LOCK_HOLD):
+        for breakdown in getattr(y_cable_trace_spans, 'stack', ()):
+            breakdown[category] = breakdown.get(category, 0) + seconds
+
+    key = (category, name)
+    port_stats = get_port_trace_stats(port)
+    with port_stats.lock:
+        stats = port_stats.stats.get(key)
+        if stats is None:
+            stats = port_stats.stats[key] = {'count': 0, 'errors': 0, 'bytes': 0, 'total_time': 0,
+                                             'max_time': 0, 'last_time': 0}
+        stats['count'] += 1
+        stats['errors'] += 1 if error else 0
+        stats['bytes'] += size
+        stats['total_time'] += seconds
+        stats['max_time'] = max(stats['max_time'], seconds)
+        stats['last_time'] = seconds
+
+
+def record_api(port, name, seconds, breakdown, error=False):
+    """Records one API call with the time spent in each category of transaction during the call.
+    """
+    if not y_cable_tracing_enabled:
+        return
+
+    record(port, TRACE_API, name, seconds, error)
+    port_stats = get_port_trace_stats(port)
+    with port_stats.lock:
+        stats = port_stats.stats.get((TRACE_API, name))
+        if stats is None:
+            # reset since recorded
+            return
+        totals = stats.setdefault('breakdown', {})
+        for category, category_seconds in breakdown.items():
+            totals[category] = totals.get(category, 0) + category_seconds
+        stats['last_breakdown'] = dict(breakdown)
+
+
+def get_trace_stats(port=None, reset=False, categories=None):
+    """Retrieves the recorded statistics.
+
+    Args:
+        port (int): The physical port to retrieve the statistics of, None for all the ports.
+        reset (bool): If True, the returned statistics are cleared.
+        categories (iterable): The TRACE_* categories to retrieve, None for all of them.
+
+    Returns:
+        A dict of port to a dict of category to a dict of name to a dict with keys 'count', 'errors',
+        'bytes', 'total_time', 'max_time', 'last_time' and 'avg_time', times in seconds. The statistics
+        of the TRACE_API category also have a 'breakdown' and a 'last_breakdown' key, dicts of category
+        to the seconds spent in that category during all the calls and during the last call. The
+        categories overlap: the time of an MCU command includes the eeprom accesses it makes.
+    """
+    table = {}
+    if port is None:
+        with y_cable_trace_lock:
+            ports = list(y_cable_trace_stats.items())
+    elif port in y_cable_trace_stats:
+        ports = [(port, y_cable_trace_stats[port])]
+    else:
+        ports = []
+
+    for stats_port, port_stats in ports:
+        with port_stats.lock:
+            for key in list(port_stats.stats):
+                if categories is not None and key[0] not in categories:
+                    continue
+                stats = dict(port_stats.stats[key])
+                for breakdown_key in ('breakdown', 'last_breakdown'):
+                    if breakdown_key in stats:
+                        stats[breakdown_key] = dict(stats[breakdown_key])
+                stats['avg_time'] = stats['total_time'] / stats['count']
+                table.setdefault(stats_port, {}).setdefault(key[0], {})[key[1]] = stats
+                if reset:
+                    del port_stats.stats[key]
+    return table
+
+
+def reset_trace_stats(port=None):
+    """Clears the recorded statistics of port, or of all the ports if port is None.
+    """
+    get_trace_stats(port, reset=True)
+
+
+def trace_y_cable_apis(cls):
+    """Class decorator tracing the latency of the TRACED_APIS methods defined by a YCable class.
+    """
+    for name in TRACED_APIS:
+        if name in vars(cls):
+            setattr(cls, name, trace_y_cable_api(vars(cls)[name]))
+    return cls
+
+
+def trace_y_cable_api(func):
+    """Decorator recording the latency of a YCable method as a TRACE_API transaction of self.port.
+    """
+    name = func.__name__
+
+    @functools.wraps(func)
+    def wrapper(self, *args, **kwargs):
+        if not y_cable_tracing_enabled:
+            return func(self, *args, **kwargs)
+
+        stack = getattr(y_cable_trace_spans, 'stack', None)
+        if stack is None:
+            stack = y_cable_trace_spans.stack = []
+        breakdown = {}
+        stack.append(breakdown)
+        time_start = time.monotonic()
+        error = True
+        try:
+            result = func(self, *args, **kwargs)
+            error = False
+            return result
+        finally:
+            seconds = time.monotonic() - time_start
+            stack.pop()
+            record_api(self.port, name, seconds, breakdown, error)
+
+    return wrapper
+
+
+class TracedSfp(object):
+    """Proxy of a platform Sfp object recording its read_eeprom and write_eeprom calls.
+    """
+
+    def __init__(self, sfp, port):
+        self._sfp = sfp
+        self._port = port
+
+    def __getattr__(self, name):
+        return getattr(self._sfp, name)
+
+    def read_eeprom(self, offset, num_bytes):
+        time_start = time.monotonic()
+        result = None
+        try:
+            result = self._sfp.read_eeprom(offset, num_bytes)
+            return result
+        finally:
+            record(self._port, TRACE_EEPROM_READ, 'read_eeprom', time.monotonic() - time_start,
+                   result is None, num_bytes)
+
+    def write_eeprom(self, offset, num_bytes, write_buffer):
+        time_start = time.monotonic()
+        result = False
+        try:
+            result = self._sfp.write_eeprom(offset, num_bytes, write_buffer)
+            return result
+        finally:
+            record(self._port, TRACE_EEPROM_WRITE, 'write_eeprom', time.monotonic() - time_start,
+                   result is False or result is None, num_bytes)
+
+
+class TracedChassis(object):
+    """Proxy of a platform Chassis object whose get_sfp() returns TracedSfp proxies.
+    """
+
+    def __init__(self, chassis):
+        self._chassis = chassis
+        self._sfps = {}
+
+    def __getattr__(self, name):
+        return getattr(self._chassis, name)
+
+    def __str__(self):
+        return str(self._chassis)
+
+    def get_sfp(self, index):
+        sfp = self._chassis.get_sfp(index)
+        traced = self._sfps.get(index)
+        # the platform may return a new object, e.g. after a transceiver change
+        if traced is None or traced._sfp is not sfp:
+            if sfp is None:
+                return None
+            traced = self._sfps[index] = TracedSfp(sfp, index)
+        return traced
+
+
+def trace_chassis(chassis):
+    """Returns a proxy of chassis recording the eeprom accesses of its sfps, None if chassis is None.
+    """
+    if chassis is None or isinstance(chassis, TracedChassis):
+        return chassis
+    return TracedChassis(chassis)
@@ -0,0 +1,80 @@
+"""
+    y_cable_upgrade.py
+
+    Parallel firmware download on several Y-Cables.
+    Each cable runs its vendor download_firmware() in a worker thread while
+    the caller is periodically given the progress of every cable, so that
+    all the mux cables of a ToR can be upgraded in one maintenance window.
+"""
+
+from concurrent.futures import ThreadPoolExecutor, wait
+
+from sonic_y_cable.y_cable_base import YCableBase
+
+# default number of cables upgraded concurrently
+UPGRADE_MAX_WORKERS = 8
+
+# default number of seconds between two progress reports
+UPGRADE_PROGRESS_INTERVAL = 1
+
+
+def get_download_firmware_progress(cables):
+    """
+    Retrieves the firmware download progress of several cables
+
+    Args:
+        cables:
+             an iterable of objects derived from YCableBase
+
+    Returns:
+        a dict of port to a (download_firmware_status, download_firmware_progress) tuple
+    """
+    return {cable.port: (cable.download_firmware_status, getattr(cable, 'download_firmware_progress', 0))
+            for cable in cables}
+
+
+def download_firmware_parallel(cables, fwfile, max_workers=UPGRADE_MAX_WORKERS, progress_callback=None,
+                               progress_interval=UPGRADE_PROGRESS_INTERVAL):
+    """
+    Downloads the firmware file on several cables concurrently
+
+    Args:
+        cables:
+             an iterable of objects derived from YCableBase
+        fwfile:
+             a string, the path to the firmware image, see YCableBase.download_firmware()
+        max_workers:
+             an Integer, the maximum number of cables upgraded at the same time
+        progress_callback:
+             an optional callable, called every progress_interval seconds and once
+             at the end with the dict returned by get_download_firmware_progress()
+        progress_interval:
+             a float, the number of seconds between two progress reports
+
+    Returns:
+        a dict of port to the value returned by download_firmware() for that port,
+        FIRMWARE_DOWNLOAD_FAILURE if it raised
+    """
+    cables = list(cables)
+    results = {}
+    if not cables:
+        return results
+
+    def download(cable):
+        try:
+            return cable.download_firmware(fwfile)
+        except Exception as e:
+            cable.log_error("firmware download of {} failed: {}".format(fwfile, repr(e)))
+            return YCableBase.FIRMWARE_DOWNLOAD_FAILURE
+
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(cables)))) as executor:
+        futures = {executor.submit(download, cable): cable for cable in cables}
+        pending = set(futures)
+        while pending:
+            _, pending = wait(pending, timeout=progress_interval)
+            if progress_callback is not None:
+                progress_callback(get_download_firmware_progress(cables))
+
+    for future, cable in futures.items():
+        results[cable.port] = future.result()
+    return results
@@ -0,0 +1,148 @@
+import os
+import socket
+import threading
+
+import pytest
+
+from sonic_platform_base.sonic_sfp.bcmshell import bcmshell, bcmshellpool
+
+PROMPT = 'drivshell> \n'
+
+RESPONSES = {
+    'echo bcmshell': 'bcmshell\r\n',
+    'getreg raw XLPORT_MODE_REG.xlport0': 'XLPORT_MODE_REG.xlport0[0x2020229]=0x5\n',
+    'getreg XLPORT_MODE_REG.xlport0':
+        'XLPORT_MODE_REG.xlport0[0x2020229]=0x5: <XPORT0_CORE_PORT_MODE=1,\n'
+        '\tXPORT0_PHY_PORT_MODE=1>\n',
+    'getreg raw CMIC_VERSION': 'CMIC_VERSION.cmic0[0x1]=0x12\n',
+    'getreg raw NOT_A_REG': 'Syntax error parsing "NOT_A_REG"\n',
+    'dump all raw L2_ENTRY': ''.join(
+        'L2_ENTRY.ipipe0[%d]: <0x%x 0x1>\n' % (i, i) for i in range(200)),
+    'dump all raw L2_ENTRY 2 2': 'L2_ENTRY.ipipe0[2]: <0x2 0x1>\nL2_ENTRY.ipipe0[3]: <0x3 0x1>\n',
+    'dump all VLAN':
+        'VLAN.ipipe0[1]: <VALID=1,\n    STG=1>\n'
+        'VLAN.ipipe0[2]: <VALID=0,\n    STG=2>\n',
+}
+
+
+class FakeDiagShell(object):
+    """ Minimal drivshell stand-in served over a unix socket """
+
+    def __init__(self, path):
+        self.path = path
+        self.commands = []
+        self.writes = 0
+        self.server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.server.bind(path)
+        self.server.listen(4)
+        self.thread = threading.Thread(target=self.serve, daemon=True)
+        self.thread.start()
+
+    def serve(self):
+        while True:
+            try:
+                conn, _ = self.server.accept()
+            except OSError:
+                return
+            threading.Thread(target=self.handle, args=(conn,), daemon=True).start()
+
+    def handle(self, conn):
+        buf = b''
+        while True:
+            data = conn.recv(4096)
+            if not data:
+                break
+            self.writes += 1
+            buf += data
+            while b'\n' in buf:
+                line, buf = buf.split(b'\n', 1)
+                cmd = line.decode()
+                self.commands.append(cmd)
+                reply = RESPONSES.get(cmd, '') + PROMPT
+                # dribble large replies to exercise partial reads
+                for i in range(0, len(reply), 1000):
+                    conn.sendall(reply[i:i + 1000].encode())
+        conn.close()
+
+    def close(self):
+        self.server.close()
+
+
+@pytest.fixture
+def diag_shell(tmp_path):
+    server = FakeDiagShell(os.path.join(str(tmp_path), 'sswsyncd.socket'))
+    yield server
+    server.close()
+
+
+class TestBcmshell(object):
+
+    def test_getreg(self, diag_shell):
+        shell = bcmshell(socketname=diag_shell.path)
+        assert shell.getreg('XLPORT_MODE_REG.xlport0') == 5
+        assert shell.getreg('XLPORT_MODE_REG.xlport0', True) == {
+            'XPORT0_CORE_PORT_MODE': 1, 'XPORT0_PHY_PORT_MODE': 1}
+        with pytest.raises(RuntimeError):
+            shell.getreg('NOT_A_REG')
+
+    def test_getregs_single_round_trip(self, diag_shell):
+        shell = bcmshell(keepopen=True, opennow=True, socketname=diag_shell.path)
+        writes = diag_shell.writes
+        regs = shell.getregs(['XLPORT_MODE_REG.xlport0', 'CMIC_VERSION', 'XLPORT_MODE_REG.xlport0'])
+        assert regs == {'XLPORT_MODE_REG.xlport0': 5, 'CMIC_VERSION': 0x12}
+        assert diag_shell.writes - writes == 1
+        assert shell.run_batch([]) == []
+        shell.close()
+
+    def test_getreg_layout_cached(self, diag_shell):
+        shell = bcmshell(keepopen=True, socketname=diag_shell.path)
+        layout = shell.getreg_layout('XLPORT_MODE_REG.xlport0')
+        assert layout == {'xlport0': ['XPORT0_CORE_PORT_MODE', 'XPORT0_PHY_PORT_MODE']}
+        count = len(diag_shell.commands)
+        assert shell.getreg_layout('XLPORT_MODE_REG.xlport0') == layout
+        assert len(diag_shell.commands) == count
+        shell.close()
+
+    def test_gettable(self, diag_shell):
+        shell = bcmshell(keepopen=True, socketname=diag_shell.path)
+        assert shell.gettable('L2_ENTRY', start=2, entries=2) == [2 + (1 << 32), 3 + (1 << 32)]
+        assert shell.gettable('VLAN', True) == [{'VALID': 1, 'STG': 1}, {'VALID': 0, 'STG': 2}]
+        tables = shell.gettables(['VLAN', 'L2_ENTRY'])
+        assert len(tables['L2_ENTRY']) == 200
+        shell.close()
+
+    def test_itertable(self, diag_shell):
+        shell = bcmshell(keepopen=True, socketname=diag_shell.path)
+        rows = list(shell.itertable('L2_ENTRY'))
+        assert rows == shell.gettable('L2_ENTRY')
+        assert list(shell.itertable('VLAN', True)) == shell.gettable('VLAN', True)
+        # the connection is still usable afterwards
+        assert shell.getreg('CMIC_VERSION') == 0x12
+        shell.close()
+
+    def test_pool(self, diag_shell):
+        pool = bcmshellpool(size=2, socketname=diag_shell.path)
+        with pool.connection() as shell:
+            assert shell.getreg('CMIC_VERSION') == 0x12
+        with pool.connection() as again:
+            assert again is shell
+
+        results = []
+
+        def worker():
+            with pool.connection() as s:
+                results.append(s.getreg('CMIC_VERSION'))
+
+        threads = [threading.Thread(target=worker) for _ in range(6)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert results == [0x12] * 6
+        assert pool.created <= 2
+
+        with pytest.raises(RuntimeError):
+            with pool.connection() as s:
+                s.getreg('NOT_A_REG')
+        pool.close_all()
+        assert pool.idle == [] and pool.created == 0
@@ -1,6 +1,9 @@
+import fcntl
 import os
 import pytest
+import shutil
 import subprocess
+import threading
 from unittest import mock
 from unittest.mock import patch, MagicMock
 from sonic_platform_base.sonic_eeprom import eeprom_base, eeprom_tlvinfo
@@ -76,6 +79,165 @@ class TestEepromTlvinfo:
         (is_valid, t) = eeprom_class.get_tlv_field(eeprom, 0xFF)
         assert(not is_valid)
 
+    def test_eeprom_tlvinfo_index(self):
+        eeprom_class = eeprom_tlvinfo.TlvInfoDecoder(EEPROM_SYMLINK_FULL_PATH, 0, '', True)
+        eeprom = eeprom_class.read_eeprom()
+        tlv_info_index = eeprom_class.get_tlv_info_index(eeprom)
+        assert tlv_info_index.header_valid
+        assert tlv_info_index.crc_valid
+        assert tlv_info_index.invalid_offset is None
+        assert [tlv[0] for _, tlv in tlv_info_index.tlvs] == \
+            [0x21, 0x22, 0x23, 0x24, 0x25, 0x26, 0x2A, 0x2B, 0xFD, 0xFD, 0xFD, 0xFD, 0xFD, 0x28, 0x29, 0xFE]
+        assert tlv_info_index.get_tlv(0x2B)[2:].decode("ascii").rstrip('\0') == 'Mellanox'
+        assert tlv_info_index.get_tlv(0xFF) is None
+        vendor_exts = tlv_info_index.get_vendor_extensions()
+        assert [tlv[1] for tlv in vendor_exts] == [36, 164, 36, 36, 36]
+        assert tlv_info_index.get_tlv(0xFD) == vendor_exts[0]
+
+        # The index is memoized against the EEPROM content
+        with mock.patch.object(eeprom_class, 'parse_tlv_info') as mock_parse:
+            assert eeprom_class.get_tlv_info_index(bytearray(eeprom)) is tlv_info_index
+            eeprom_class.modelstr(eeprom)
+            eeprom_class.serial_number_str(eeprom)
+            mock_parse.assert_not_called()
+
+        # A different content is parsed again, fields are not returned when the CRC is invalid
+        eeprom_bad_crc = bytearray(eeprom)
+        eeprom_bad_crc[-1] ^= 0xFF
+        tlv_info_index = eeprom_class.get_tlv_info_index(eeprom_bad_crc)
+        assert not tlv_info_index.crc_valid
+        assert tlv_info_index.get_tlv(0x2B) is not None
+        (is_valid, t) = eeprom_class.get_tlv_field(eeprom_bad_crc, 0x2B)
+        assert not is_valid
+
+    def test_eeprom_tlvinfo_get_tlv_index(self):
+        eeprom_class = eeprom_tlvinfo.TlvInfoDecoder(EEPROM_SYMLINK_FULL_PATH, 0, '', True)
+        # TLV fields only, as edited by set_eeprom
+        tlvs = bytearray([0x21, 2]) + b'AB' + bytearray([0x22, 1]) + b'C' + bytearray([0x21, 1]) + b'D'
+        assert eeprom_class.get_tlv_index(tlvs, 0x21) == (True, 0)
+        assert eeprom_class.get_tlv_index(tlvs, 0x22) == (True, 4)
+        assert eeprom_class.get_tlv_index(tlvs, 0x23) == (False, 0)
+        # a TLV overflowing the data is not found
+        assert eeprom_class.get_tlv_index(tlvs + bytearray([0x23, 9, 0x41]), 0x23) == (False, 0)
+
+        with mock.patch.object(eeprom_class, 'parse_tlv_info', wraps=eeprom_class.parse_tlv_info) as mock_parse:
+            eeprom_class.get_tlv_index(tlvs, 0x21)
+            eeprom_class.get_tlv_index(tlvs, 0x22)
+            mock_parse.assert_called_once_with(tlvs, True)
+
+    def test_eeprom_tlvinfo_index_invalid_tlv(self):
+        eeprom_class = eeprom_tlvinfo.TlvInfoDecoder(EEPROM_SYMLINK_FULL_PATH, 0, '', True)
+        eeprom = eeprom_class.read_eeprom()
+        # Corrupt the length of the Part Number TLV so that it overflows the EEPROM data
+        tlv_info_index = eeprom_class.get_tlv_info_index(eeprom)
+        offset = tlv_info_index.tlvs[1][0]
+        eeprom_bad = bytearray(eeprom[:offset + 4])
+        eeprom_bad[offset + 1] = 0xFF
+        tlv_info_index = eeprom_class.get_tlv_info_index(eeprom_bad)
+        assert tlv_info_index.invalid_offset == offset
+        assert len(tlv_info_index.tlvs) == 1
+
+        visitor = mock.MagicMock()
+        eeprom_class.visit_eeprom(eeprom_bad, visitor)
+        visitor.visit_tlv.assert_called_once()
+        visitor.set_error.assert_called_once_with('Invalid TLV field starting at EEPROM offset %d' % offset)
+        visitor.visit_end.assert_called_once()
+
+    def test_eeprom_tlvinfo_image_cache(self, tmp_path):
+        cache_dir = str(tmp_path / 'cache')
+        eeprom_path = str(tmp_path / EEPROM_SYMLINK)
+        shutil.copy(EEPROM_SYMLINK_FULL_PATH, eeprom_path)
+        eeprom_class = eeprom_tlvinfo.TlvInfoDecoder(eeprom_path, 0, '', True)
+        eeprom = eeprom_class.read_eeprom()
+
+        eeprom_class.set_image_cache_dir(cache_dir)
+        assert eeprom_class.read_image_cache() is None
+        assert eeprom_class.read_eeprom() == eeprom
+        image = eeprom_class.read_image_cache()
+        assert image is not None and bytes(image[:len(eeprom)]) == bytes(eeprom)
+
+        # Another decoder is served from the cache, only the fingerprint is read from the EEPROM device
+        other_class = eeprom_tlvinfo.TlvInfoDecoder(eeprom_path, 0, '', True)
+        other_class.set_image_cache_dir(cache_dir)
+        reads = []
+        def open_eeprom(path, mode):
+            F = open(path, mode)
+            read = F.read
+            def read_recorded(size=-1):
+                data = read(size)
+                reads.append(len(data))
+                return data
+            F.read = read_recorded
+            return F
+        with mock.patch('sonic_platform_base.sonic_eeprom.eeprom_base.io.open', side_effect=open_eeprom):
+            assert other_class.read_eeprom() == eeprom
+        assert reads and all(size in (eeprom_class._TLV_INFO_HDR_LEN, 6) for size in reads)
+
+        # The cache is stale once the EEPROM content changes, even though the
+        # mtime of the device (a sysfs node on a switch) does not
+        stat = os.stat(eeprom_path)
+        eeprom_new = bytearray(eeprom)
+        eeprom_new[-1] ^= 0xFF
+        with open(eeprom_path, 'r+b') as f:
+            f.write(eeprom_new)
+        os.utime(eeprom_path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+        assert other_class.read_image_cache() is None
+        assert other_class.read_eeprom() == eeprom_new
+        assert other_class.read_image_cache() is not None
+
+        # A corrupted image is detected by its CRC and replaced on the next read
+        image_files = [f for f in os.listdir(cache_dir) if not f.endswith(eeprom_base.IMAGE_CACHE_META_SUFFIX)]
+        assert len(image_files) == 1
+        image_path = os.path.join(cache_dir, image_files[0])
+        os.chmod(image_path, 0o644)
+        with open(image_path, 'r+b') as f:
+            f.write(b'\xff')
+        fresh_class = eeprom_tlvinfo.TlvInfoDecoder(eeprom_path, 0, '', True)
+        fresh_class.set_image_cache_dir(cache_dir)
+        assert fresh_class.read_image_cache() is None
+        assert fresh_class.read_eeprom() == eeprom_new
+        assert fresh_class.read_image_cache() is not None
+
+        # Invalidation drops the cached image
+        fresh_class.invalidate_image_cache()
+        assert fresh_class.read_image_cache() is None
+
+        # Decoders without a fingerprint do not use the cache
+        base_class = eeprom_base.EepromDecoder(eeprom_path, [('data', 's', 16)], 0, '', True)
+        base_class.set_image_cache_dir(str(tmp_path / 'base_cache'))
+        assert base_class.read_eeprom() == eeprom_new[:16]
+        assert base_class.read_image_cache() is None
+        assert not os.path.exists(str(tmp_path / 'base_cache'))
+
+    def test_eeprom_cache_name_lock(self, tmp_path):
+        eeprom_path = str(tmp_path / EEPROM_SYMLINK)
+        cache_path = str(tmp_path / 'cache')
+        shutil.copy(EEPROM_SYMLINK_FULL_PATH, eeprom_path)
+        readers = [eeprom_tlvinfo.TlvInfoDecoder(eeprom_path, 0, '', True) for _ in range(2)]
+        # Readers share the lock
+        for reader in readers:
+            reader.set_cache_name(cache_path)
+        eeprom = readers[0].read_eeprom()
+        assert readers[1].read_eeprom() == eeprom
+        with open(eeprom_path, 'r') as f:
+            fcntl.flock(f, fcntl.LOCK_SH | fcntl.LOCK_NB)
+            fcntl.flock(f, fcntl.LOCK_UN)
+            with pytest.raises(BlockingIOError):
+                fcntl.flock(f, fcntl.LOCK_EX | fcntl.LOCK_NB)
+
+        # The cache is written under the exclusive lock, once the other reader is done
+        writer = threading.Thread(target=readers[1].update_cache, args=(eeprom,))
+        writer.start()
+        writer.join(0.2)
+        assert writer.is_alive()
+        readers[0].update_cache(eeprom)
+        writer.join(5)
+        assert not writer.is_alive()
+        with open(cache_path, 'rb') as f:
+            assert f.read() == eeprom
+        with open(eeprom_path, 'r') as f:
+            fcntl.flock(f, fcntl.LOCK_EX | fcntl.LOCK_NB)
+
     def test_eeprom_tlvinfo_set_eeprom(self):
         eeprom_class = eeprom_tlvinfo.TlvInfoDecoder(EEPROM_SYMLINK_FULL_PATH, 0, '', True)
         eeprom = eeprom_class.read_eeprom()
@@ -158,17 +320,68 @@ class TestEepromTlvinfo:
             assert exit_mock.called
 
     def test_eeprom_tlvinfo_update_eeprom_db(self):
-        # Test updating eeprom to DB by mocking redis hmset
+        # Test updating eeprom to DB by mocking redis pipeline
         eeprom_class = eeprom_tlvinfo.TlvInfoDecoder(EEPROM_SYMLINK_FULL_PATH, 0, '', True)
         eeprom = eeprom_class.read_eeprom()
-        eeprom_class.redis_client.hmset = mock.MagicMock(return_value = True)
+        mock_pipeline = mock.MagicMock()
+        eeprom_class.redis_client.pipeline = mock.MagicMock(return_value=mock_pipeline)
         assert(0 == eeprom_class.update_eeprom_db(eeprom))
+        eeprom_class.redis_client.pipeline.assert_called_once_with(transaction=True)
+        assert mock_pipeline.hmset.call_count == 20
+        mock_pipeline.execute.assert_called_once()
 
     def test_eeprom_tlvinfo_read_eeprom_db(self):
-        # Test reading from DB by mocking redis hget
+        # Test reading from DB by mocking redis pipeline
         eeprom_class = eeprom_tlvinfo.TlvInfoDecoder(EEPROM_SYMLINK_FULL_PATH, 0, '', True)
-        eeprom_class.redis_client.hget = mock.MagicMock(return_value = b'1')
+        mock_pipeline = mock.MagicMock()
+        mock_pipeline.execute = mock.MagicMock(side_effect=lambda: [{b'Initialized': b'1'}] + [{}] * 19)
+        eeprom_class.redis_client.pipeline = mock.MagicMock(return_value=mock_pipeline)
         assert(0 == eeprom_class.read_eeprom_db())
+        assert mock_pipeline.hgetall.call_count == 20
+        mock_pipeline.execute.assert_called_once()
+
+        mock_pipeline.execute = mock.MagicMock(side_effect=lambda: [{}] * 20)
+        assert(-1 == eeprom_class.read_eeprom_db())
+
+    def test_eeprom_tlvinfo_eeprom_db_round_trip(self):
+        # Write the EEPROM to an in-memory stand-in of redis and read it back
+        class FakePipeline(object):
+            def __init__(self, db):
+                self.db = db
+                self.commands = []
+
+            def hmset(self, key, fvs):
+                self.commands.append(('hmset', key, dict(fvs)))
+
+            def hgetall(self, key):
+                self.commands.append(('hgetall', key, None))
+
+            def execute(self):
+                result = []
+                for cmd, key, fvs in self.commands:
+                    if cmd == 'hmset':
+                        self.db.setdefault(key, {}).update(
+                            {k.encode(): str(v).encode() for k, v in fvs.items()})
+                        result.append(True)
+                    else:
+                        result.append(dict(self.db.get(key, {})))
+                self.commands = []
+                return result
+
+        db = {}
+        eeprom_class = eeprom_tlvinfo.TlvInfoDecoder(EEPROM_SYMLINK_FULL_PATH, 0, '', True)
+        eeprom = eeprom_class.read_eeprom()
+        eeprom_class.redis_client.pipeline = mock.MagicMock(side_effect=lambda transaction=True: FakePipeline(db))
+        assert(0 == eeprom_class.update_eeprom_db(eeprom))
+        assert db['EEPROM_INFO|0x2b'][b'Value'] == b'Mellanox'
+        assert db['EEPROM_INFO|0xfd'][b'Num_vendor_ext'] == b'5'
+
+        with mock.patch('builtins.print') as mock_print:
+            assert(0 == eeprom_class.read_eeprom_db())
+        printed = [c[0][0] for c in mock_print.call_args_list if c[0]]
+        assert "   Total Length: 527" in printed
+        assert "%-20s 0x%02X %3s %s" % ('Manufacturer', 0x2B, '8', 'Mellanox') in printed
+        assert "(checksum valid)" in printed
 
 class TestEepromDecoder(object):
     def setup(self):
@@ -971,6 +971,7 @@ class TestModuleBase:
         with patch.object(self.module, "get_name", return_value="DPU0"), \
              patch.object(self.module, "_transition_operation_lock"):
             assert self.module.get_module_state_transition("dpu0") is False
+        assert "Error getting transition flag for module DPU0: DB Error (Exception)" in capsys.readouterr().err
 
     @pytest.mark.parametrize("mod", ["DPU0", "LINE-CARD1", "SUPERVISOR0", "FABRIC-CARD0"])
     def test_get_module_state_transition_various_modules(self, mod):
@@ -150,13 +150,14 @@ class TestPcieCommon:
         result = pcieutil.get_pcie_device()
         assert result == pcie_device_list
 
-    @mock.patch('os.path.exists')
-    def test_get_pcie_check(self, os_path_exists_mock):
+    @mock.patch('os.listdir')
+    def test_get_pcie_check(self, os_listdir_mock):
 
-        def os_path_exists_side_effect(*args):
-            return bool(args[0] in pci_sysfs_paths)
+        def os_listdir_side_effect(*args):
+            assert args[0] == '/sys/bus/pci/devices'
+            return [os.path.basename(path) for path in pci_sysfs_paths]
 
-        os_path_exists_mock.side_effect = os_path_exists_side_effect
+        os_listdir_mock.side_effect = os_listdir_side_effect
         pcieutil = PcieUtil(tests_dir)
         sample_pcie_config = yaml.dump(pcie_device_list)
 
@@ -166,6 +167,48 @@ class TestPcieCommon:
             open_mock.assert_called_once_with(pcie_config_file)
             assert result == pcie_check_output
 
+    @mock.patch('os.path.exists')
+    def test_get_pcie_check_platform_probe(self, os_path_exists_mock):
+
+        class PlatformPcieUtil(PcieUtil):
+            def check_pcie_sysfs(self, domain=0, bus=0, device=0, func=0):
+                return bus == 0
+
+        pcieutil = PlatformPcieUtil(tests_dir)
+        sample_pcie_config = yaml.dump(pcie_device_list)
+        with mock.patch('{}.open'.format(BUILTINS), mock.mock_open(read_data=sample_pcie_config)):
+            result = pcieutil.get_pcie_check()
+        assert [item['result'] for item in result] == ['Passed', 'Passed', 'Passed', 'Failed']
+        os_path_exists_mock.assert_not_called()
+
+    def test_get_pcie_sysfs_devices(self, tmp_path):
+        for path, device in zip(pci_sysfs_paths, pcie_device_list):
+            dev_dir = tmp_path / os.path.basename(path)
+            dev_dir.mkdir()
+            (dev_dir / 'vendor').write_text('0x1000\n')
+            (dev_dir / 'device').write_text('0x{}\n'.format(device['id']))
+            (dev_dir / 'class').write_text('0x020000\n')
+        # neither a BDF nor a readable device
+        (tmp_path / 'not_a_device').mkdir()
+        (tmp_path / '0000:02:00.0').mkdir()
+
+        pcieutil = PcieUtil(tests_dir)
+        with mock.patch.object(PcieUtil, 'PCIE_SYSFS_PATH', str(tmp_path)):
+            devices = pcieutil.get_pcie_sysfs_devices()
+            assert sorted(devices) == [(0, 0, 1, 0), (0, 0, 2, 0), (0, 0, 2, 1), (0, 1, 0, 0), (0, 2, 0, 0)]
+            assert devices[(0, 0, 2, 1)] == {'bus': '00', 'dev': '02', 'fn': '1', 'vendor': '1000',
+                                             'device': '000c', 'class': '020000', 'id': '000c'}
+            assert devices[(0, 2, 0, 0)]['id'] is None
+            assert pcieutil.get_pcie_sysfs_devices(attrs=False)[(0, 1, 0, 0)] == {'bus': '01', 'dev': '00', 'fn': '0'}
+
+            missing = dict(pcie_device_list[0], bus='03')
+            with mock.patch('{}.open'.format(BUILTINS), mock.mock_open(read_data=yaml.dump([missing] + pcie_device_list))):
+                result = pcieutil.get_pcie_check()
+            assert [item['result'] for item in result] == ['Failed'] + ['Passed'] * 4
+
+        with mock.patch.object(PcieUtil, 'PCIE_SYSFS_PATH', str(tmp_path / 'absent')):
+            assert pcieutil.get_pcie_sysfs_devices() == {}
+
     @mock.patch('os.path.isfile', mock.MagicMock(return_value=True))
     @mock.patch('{}.open'.format(BUILTINS))
     def test_get_pcie_aer_stats(self, open_mock):
@@ -191,6 +234,110 @@ class TestPcieCommon:
                                              func=int(test_device['fn']))
         assert result == pcie_aer_stats
 
+    def test_get_pcie_aer_deltas(self, tmp_path):
+        for path in pci_sysfs_paths:
+            (tmp_path / os.path.basename(path)).mkdir()
+        dev_dir = tmp_path / os.path.basename(pci_sysfs_paths[0])
+        (dev_dir / 'aer_dev_correctable').write_text(pcie_aer_correctable_content)
+        (dev_dir / 'aer_dev_fatal').write_text(pcie_aer_fatal_content)
+        (dev_dir / 'aer_dev_nonfatal').write_text(pcie_aer_nonfatal_content)
+
+        pcieutil = PcieUtil(tests_dir)
+        with mock.patch.object(PcieUtil, 'PCIE_SYSFS_PATH', str(tmp_path)):
+            # first sample reports the non-zero counters in full, as integers
+            deltas = pcieutil.get_pcie_aer_deltas()
+            expected = {}
+            for severity, stats in pcie_aer_stats.items():
+                expected[severity] = {field: int(value) for field, value in stats.items() if int(value)}
+            assert deltas == {'0000:00:01.0': expected}
+
+            # unchanged counters report nothing
+            assert pcieutil.get_pcie_aer_deltas() == {}
+
+            (dev_dir / 'aer_dev_correctable').write_text(
+                pcie_aer_correctable_content.replace('RxErr 0', 'RxErr 3').replace('TOTAL_ERR_COR 28', 'TOTAL_ERR_COR 31'))
+            assert pcieutil.get_pcie_aer_deltas(devices=[(0, 0, 1, 0)]) == \
+                {'0000:00:01.0': {'correctable': {'RxErr': 3, 'TOTAL_ERR_COR': 3}}}
+
+            # rate limited
+            assert pcieutil.get_pcie_aer_deltas(min_interval=60) is None
+
+            # removed device is forgotten and its fds closed
+            for file_name in ('aer_dev_correctable', 'aer_dev_fatal', 'aer_dev_nonfatal'):
+                (dev_dir / file_name).unlink()
+            dev_dir.rmdir()
+            with mock.patch('os.pread', side_effect=OSError):
+                assert pcieutil.get_pcie_aer_deltas(devices=[(0, 0, 1, 0)]) == {}
+            assert pcieutil._aer_fds == {}
+            assert '0000:00:01.0' not in pcieutil._aer_counters
+            pcieutil.close_aer_collector()
+
+    def test_get_pcie_aer_deltas_unsupported(self, tmp_path):
+        dev_dir = tmp_path / '0000:00:01.0'
+        dev_dir.mkdir()
+        pcieutil = PcieUtil(tests_dir)
+        with mock.patch.object(PcieUtil, 'PCIE_SYSFS_PATH', str(tmp_path)):
+            # a device without AER files is probed once
+            with mock.patch('os.open', wraps=os.open) as open_mock:
+                assert pcieutil.get_pcie_aer_deltas(devices=[(0, 0, 1, 0)]) == {}
+                assert open_mock.call_count == 3
+                assert pcieutil.get_pcie_aer_deltas(devices=[(0, 0, 1, 0)]) == {}
+                assert open_mock.call_count == 3
+
+            # until it is re-enumerated, malformed lines are skipped
+            dev_dir.rename(tmp_path / 'old')
+            dev_dir.mkdir()
+            (tmp_path / 'old').rmdir()
+            (dev_dir / 'aer_dev_correctable').write_text('RxErr 2\n\nunexpected line here\nBadTLP x\n')
+            assert pcieutil.get_pcie_aer_deltas(devices=[(0, 0, 1, 0)]) == \
+                {'0000:00:01.0': {'correctable': {'RxErr': 2}}}
+            assert pcieutil._aer_unsupported == {}
+
+            # a removed device is forgotten
+            (dev_dir / 'aer_dev_correctable').unlink()
+            pcieutil.close_aer_collector()
+            assert pcieutil.get_pcie_aer_deltas(devices=[(0, 0, 1, 0)]) == {}
+            assert '0000:00:01.0' in pcieutil._aer_unsupported
+            dev_dir.rmdir()
+            assert pcieutil.get_pcie_aer_deltas(devices=[(0, 0, 1, 0)]) == {}
+            assert pcieutil._aer_unsupported == {}
+            pcieutil.close_aer_collector()
+
+    def test_get_pcie_aer_deltas_stale_fd(self, tmp_path):
+        dev_dir = tmp_path / '0000:00:01.0'
+        dev_dir.mkdir()
+        (dev_dir / 'aer_dev_correctable').write_text('RxErr 1\n')
+        pcieutil = PcieUtil(tests_dir)
+        with mock.patch.object(PcieUtil, 'PCIE_SYSFS_PATH', str(tmp_path)):
+            assert pcieutil.get_pcie_aer_deltas(devices=[(0, 0, 1, 0)]) == \
+                {'0000:00:01.0': {'correctable': {'RxErr': 1}}}
+            stale_fds = set(pcieutil._aer_fds.values())
+            assert len(stale_fds) == 1
+
+            # the device was removed and added back: the fd kept from the last sample
+            # fails, the file is reopened and read
+            (dev_dir / 'aer_dev_correctable').write_text('RxErr 4\n')
+            pread = os.pread
+
+            def stale_pread(fd, length, offset):
+                # the reopened file may get the same fd number back
+                if fd in stale_fds:
+                    stale_fds.discard(fd)
+                    raise OSError(19, 'No such device')
+                return pread(fd, length, offset)
+
+            with mock.patch('os.pread', side_effect=stale_pread):
+                assert pcieutil.get_pcie_aer_deltas(devices=[(0, 0, 1, 0)]) == \
+                    {'0000:00:01.0': {'correctable': {'RxErr': 3}}}
+            assert pcieutil._aer_unsupported == {}
+            assert not stale_fds
+            assert len(pcieutil._aer_fds) == 1
+
+            (dev_dir / 'aer_dev_correctable').write_text('RxErr 5\n')
+            assert pcieutil.get_pcie_aer_deltas(devices=[(0, 0, 1, 0)]) == \
+                {'0000:00:01.0': {'correctable': {'RxErr': 1}}}
+            pcieutil.close_aer_collector()
+
     @mock.patch('sonic_platform_base.sonic_pcie.pcie_common.PcieUtil.get_pcie_device', mock.MagicMock(return_value=pcie_device_list))
     def test_dump_conf_yaml(self):
         pcieutil = PcieUtil(tests_dir)
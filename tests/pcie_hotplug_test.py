@@ -0,0 +1,128 @@
+import errno
+import os
+import sys
+import threading
+
+if sys.version_info.major == 3:
+    from unittest import mock
+else:
+    import mock
+
+import pytest
+
+from sonic_platform_base.sonic_pcie.pcie_common import PcieUtil
+from sonic_platform_base.sonic_pcie.pcie_hotplug import PcieHotplugMonitor, parse_uevent
+
+tests_dir = os.path.dirname(os.path.abspath(__file__))
+
+
+def make_uevent(action, slot, subsystem='pci', pci_id='1000:00B2', pci_class='20000'):
+    fields = ['{}@/devices/pci0000:00/{}'.format(action, slot),
+              'ACTION=' + action,
+              'DEVPATH=/devices/pci0000:00/' + slot,
+              'SUBSYSTEM=' + subsystem,
+              'PCI_CLASS=' + pci_class,
+              'PCI_ID=' + pci_id,
+              'PCI_SLOT_NAME=' + slot,
+              'SEQNUM=1234']
+    return '\0'.join(fields).encode() + b'\0'
+
+
+class FakeUeventSource(object):
+
+    def __init__(self, events=()):
+        self.events = list(events)
+        self.closed = False
+        self.drained = threading.Event()
+
+    def recv(self, timeout=None):
+        if self.events:
+            return self.events.pop(0)
+        self.drained.set()
+        threading.Event().wait(0.01)
+        return None
+
+    def close(self):
+        self.closed = True
+
+
+class TestPcieHotplug:
+
+    def test_parse_uevent(self):
+        uevent = parse_uevent(make_uevent('add', '0000:03:00.0'))
+        assert uevent['ACTION'] == 'add'
+        assert uevent['PCI_SLOT_NAME'] == '0000:03:00.0'
+        assert parse_uevent(b'libudev\0\xfe\xed') is None
+
+    def test_handle_uevent(self):
+        pcieutil = PcieUtil(tests_dir)
+        seed = {(0, 1, 0, 0): {'bus': '01', 'dev': '00', 'fn': '0', 'vendor': '1000',
+                               'device': '00b2', 'class': '020000', 'id': '00b2'}}
+        with mock.patch.object(PcieUtil, 'get_pcie_sysfs_devices', return_value=dict(seed)):
+            monitor = PcieHotplugMonitor(pcieutil, source=FakeUeventSource())
+
+        events = []
+        dpu_events = []
+        monitor.register_callback(lambda *args: events.append(args))
+        monitor.register_callback(lambda *args: dpu_events.append(args), bdfs=['01:00.0'])
+
+        def broken(*args):
+            raise RuntimeError('callback failure')
+        monitor.register_callback(broken)
+
+        assert monitor.handle_uevent(make_uevent('remove', '0000:01:00.0')) == ('remove', '0000:01:00.0')
+        assert monitor.get_devices() == {}
+        assert dpu_events == [('remove', '0000:01:00.0', seed[(0, 1, 0, 0)])]
+
+        assert monitor.handle_uevent(make_uevent('add', '0000:01:00.0')) == ('add', '0000:01:00.0')
+        assert monitor.get_devices() == seed
+        assert monitor.handle_uevent(make_uevent('add', '0000:02:00.1')) == ('add', '0000:02:00.1')
+        assert (0, 2, 0, 1) in monitor.get_devices()
+        assert len(dpu_events) == 2
+        assert [event[:2] for event in events] == [('remove', '0000:01:00.0'), ('add', '0000:01:00.0'),
+                                                   ('add', '0000:02:00.1')]
+
+        # other subsystems and actions are ignored
+        assert monitor.handle_uevent(make_uevent('add', '0000:04:00.0', subsystem='net')) is None
+        assert monitor.handle_uevent(make_uevent('bind', '0000:04:00.0')) is None
+        assert len(events) == 3
+
+    def test_background_thread(self):
+        source = FakeUeventSource([make_uevent('add', '0000:05:00.0'), make_uevent('remove', '0000:05:00.0'),
+                                   make_uevent('add', '0000:06:00.0')])
+        monitor = PcieHotplugMonitor(source=source)
+        events = []
+        monitor.register_callback(lambda *args: events.append(args[:2]))
+        monitor.start(poll_interval=0.01)
+        assert source.drained.wait(5)
+        monitor.stop()
+        assert source.closed
+        assert events == [('add', '0000:05:00.0'), ('remove', '0000:05:00.0'), ('add', '0000:06:00.0')]
+        assert list(monitor.get_devices()) == [(0, 6, 0, 0)]
+
+    def test_overflow_resync(self):
+        pcieutil = PcieUtil(tests_dir)
+        device_a = {'bus': '01', 'dev': '00', 'fn': '0', 'vendor': '1000', 'device': '00b2', 'class': '020000', 'id': '00b2'}
+        device_b = dict(device_a, bus='02')
+        device_c = dict(device_a, bus='03')
+        with mock.patch.object(PcieUtil, 'get_pcie_sysfs_devices', return_value={(0, 1, 0, 0): device_a,
+                                                                                 (0, 2, 0, 0): device_b}):
+            monitor = PcieHotplugMonitor(pcieutil, source=FakeUeventSource())
+        events = []
+        monitor.register_callback(lambda *args: events.append(args))
+
+        # the uevents removing 02:00.0 and adding 03:00.0 were dropped
+        monitor.source.recv = mock.MagicMock(side_effect=OSError(errno.ENOBUFS, 'No buffer space available'))
+        with mock.patch.object(PcieUtil, 'get_pcie_sysfs_devices', return_value={(0, 1, 0, 0): device_a,
+                                                                                 (0, 3, 0, 0): device_c}):
+            assert monitor.poll(0) is None
+        assert monitor.get_devices() == {(0, 1, 0, 0): device_a, (0, 3, 0, 0): device_c}
+        assert events == [('remove', '0000:02:00.0', device_b), ('add', '0000:03:00.0', device_c)]
+
+        # other receive errors are raised
+        monitor.source.recv = mock.MagicMock(side_effect=OSError(errno.EBADF, 'Bad file descriptor'))
+        with pytest.raises(OSError):
+            monitor.poll(0)
+
+        # without PcieUtil there is nothing to re-scan
+        assert PcieHotplugMonitor(source=FakeUeventSource()).resync() is None
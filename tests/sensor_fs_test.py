@@ -7,6 +7,7 @@ import os
 from unittest import mock
 from sonic_platform_base.sensor_fs import VoltageSensorFs
 from sonic_platform_base.sensor_fs import CurrentSensorFs
+from sonic_platform_base.sensor_fs import SensorFsGroup
 
 yaml_data = """
 voltage_sensors:
@@ -81,3 +82,41 @@ class TestSensorFs:
         assert(vsensors[0].get_value() == 900)
         assert(vsensors[0].get_minimum_recorded() == 900)
         assert(vsensors[0].get_maximum_recorded() == 900)
+
+    @staticmethod
+    def test_sensor_fs_group(tmp_path):
+        '''
+        Test sampling a group of sensors
+        '''
+        sensors_data = yaml.safe_load(yaml_data)
+        for idx, sensor in enumerate(sensors_data['voltage_sensors'] + sensors_data['current_sensors']):
+            sensor['sensor'] = str(tmp_path / sensor['name'])
+            (tmp_path / sensor['name']).write_text('{}\n'.format(900 + idx))
+
+        vsensors = VoltageSensorFs.factory(VoltageSensorFs, sensors_data['voltage_sensors'])
+        csensors = CurrentSensorFs.factory(CurrentSensorFs, sensors_data['current_sensors'])
+
+        for max_workers in (0, 2):
+            group = SensorFsGroup(vsensors + csensors, max_workers=max_workers)
+            assert group.sample() == [900, 901, 902, 903]
+
+            (tmp_path / 'VSENSOR1').write_text('950\n')
+            (tmp_path / 'CSENSOR2').write_text('800\n')
+            assert group.sample() == [950, 901, 902, 800]
+            assert group.get_maximum_recorded(0) == 950
+            assert group.get_minimum_recorded(0) == 900
+            assert group.get_minimum_recorded(3) == 800
+            assert vsensors[0].maximum_sensor == 950
+            assert csensors[1].minimum_sensor == 800
+
+            # a sensor whose file went away reports None and keeps its record
+            vsensors[1].sensor = str(tmp_path / 'missing')
+            assert group.sample()[1] is None
+            assert group.get_value(1) is None
+            assert group.get_maximum_recorded(1) == 901
+            group.close()
+            assert group.fds == [None] * 4
+
+            vsensors[1].sensor = str(tmp_path / 'VSENSOR2')
+            for idx, name in enumerate(['VSENSOR1', 'VSENSOR2', 'CSENSOR1', 'CSENSOR2']):
+                (tmp_path / name).write_text('{}\n'.format(900 + idx))
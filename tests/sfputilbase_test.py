@@ -0,0 +1,157 @@
+import sys
+
+if sys.version_info.major == 3:
+    from unittest import mock
+else:
+    import mock
+
+import pytest
+
+from sonic_platform_base.sonic_sfp.sfputilbase import SfpEepromSnapshot, SfpUtilBase
+
+
+def build_sfp_eeprom():
+    """
+    SFP EEPROM image as exposed by optoe2: A0h at offset 0, A2h at offset 256
+    """
+    eeprom = bytearray(512)
+    eeprom[0] = 0x03                                # SFP/SFP+/SFP28
+    eeprom[1] = 0x04
+    eeprom[2] = 0x07                                # LC
+    eeprom[11] = 0x06                               # 64B/66B
+    eeprom[12] = 0x67                               # 10.3 Gbd
+    eeprom[20:36] = b'ACME CORP.      '
+    eeprom[37:40] = b'\x00\x90\x65'
+    eeprom[40:56] = b'SFP-10G-SR      '
+    eeprom[56:60] = b'A1  '
+    eeprom[68:84] = b'SN0123456789    '
+    eeprom[84:92] = b'20010203'
+    eeprom[92] = 0x68                               # DOM implemented, internally calibrated
+    # A2h thresholds: temperature high alarm 75C, low alarm -5C
+    eeprom[256:258] = b'\x4b\x00'
+    eeprom[258:260] = b'\xfb\x00'
+    # A2h real time values: 25.5C, 3.3V
+    eeprom[256 + 96:256 + 98] = b'\x19\x80'
+    eeprom[256 + 98:256 + 100] = b'\x80\xe8'
+    return eeprom
+
+
+class SfpUtil(SfpUtilBase):
+    port_start = 1
+    port_end = 3
+    qsfp_ports = []
+
+    def __init__(self, mapping):
+        SfpUtilBase.__init__(self)
+        self._mapping = mapping
+
+    @property
+    def port_to_eeprom_mapping(self):
+        return self._mapping
+
+    def get_presence(self, port_num):
+        return True
+
+    def get_low_power_mode(self, port_num):
+        return False
+
+    def set_low_power_mode(self, port_num, lpmode):
+        return False
+
+    def reset(self, port_num):
+        return False
+
+    def get_transceiver_change_event(self, timeout=0):
+        return False, {}
+
+
+@pytest.fixture
+def eeprom_path(tmp_path):
+    path = tmp_path / 'eeprom'
+    path.write_bytes(bytes(build_sfp_eeprom()))
+    return str(path)
+
+
+class TestSfpEepromSnapshot(object):
+    def test_read(self):
+        snapshot = SfpEepromSnapshot(1)
+        snapshot.add_region(0x50, 0, b'\x01\x02\x03\x04')
+        snapshot.add_region(0x50, 256, b'\x05\x06')
+
+        assert snapshot.has_device(0x50)
+        assert not snapshot.has_device(0x51)
+        assert snapshot.read(0x50, 1, 2) == b'\x02\x03'
+        # reads past the end of a region are short, uncovered ranges are empty
+        assert snapshot.read(0x50, 257, 4) == b'\x06'
+        assert snapshot.read(0x50, 100, 4) == b''
+        assert snapshot.get_eeprom_file(0x51) is None
+
+        eeprom_file = snapshot.get_eeprom_file(0x50)
+        eeprom_file.seek(2)
+        assert eeprom_file.read(1) == b'\x03'
+        assert eeprom_file.read(1) == b'\x04'
+
+
+class TestSfpUtilBaseSnapshot(object):
+    def test_a0_fields(self, eeprom_path):
+        sfputil = SfpUtil({1: eeprom_path})
+
+        info = sfputil.get_transceiver_info_dict(1, sfputil.get_transceiver_eeprom_snapshot(1))
+        assert info['manufacturer'] == 'ACME CORP.'
+        assert info['model'] == 'SFP-10G-SR'
+        assert info['hardware_rev'] == 'A1'
+        assert info['serial'] == 'SN0123456789'
+        assert info['connector'] == 'LC'
+        # the snapshot serves the same data as the per-field sysfs reads
+        assert info == sfputil.get_transceiver_info_dict(1)
+
+    def test_bulk_info_dict(self, eeprom_path):
+        sfputil = SfpUtil({1: eeprom_path})
+
+        with mock.patch('builtins.open', wraps=open) as mock_open:
+            bulk = sfputil.get_transceiver_bulk_info_dict(1)
+        # A0h and A2h share the optoe file: one presence probe and one read for both
+        assert mock_open.call_count == 2
+
+        assert bulk['info'] == sfputil.get_transceiver_info_dict(1)
+        assert bulk['dom'] == sfputil.get_transceiver_dom_info_dict(1)
+        assert bulk['dom_threshold'] == sfputil.get_transceiver_dom_threshold_info_dict(1)
+        assert set(bulk['dom']) >= {'temperature', 'voltage', 'rx1power', 'tx1bias', 'tx1power'}
+
+    def test_a2_presence_probe(self, eeprom_path, tmp_path):
+        dom_path = str(tmp_path / 'dom')
+        sfputil = SfpUtil({1: eeprom_path})
+
+        def get_port_eeprom_path(port_num, devid):
+            return dom_path if devid == sfputil.DOM_EEPROM_ADDR else eeprom_path
+
+        with mock.patch.object(sfputil, '_get_port_eeprom_path', side_effect=get_port_eeprom_path), \
+                mock.patch.object(sfputil, '_sfp_eeprom_present', wraps=sfputil._sfp_eeprom_present) as mock_present:
+            # no A2h device: the identity data is still returned
+            snapshot = sfputil.get_transceiver_eeprom_snapshot(1)
+            assert snapshot.has_device(sfputil.IDENTITY_EEPROM_ADDR)
+            assert not snapshot.has_device(sfputil.DOM_EEPROM_ADDR)
+            assert mock.call(eeprom_path, 0) in mock_present.call_args_list
+            # A2h is probed at the offset it is exposed at
+            assert mock.call(dom_path, 256) in mock_present.call_args_list
+            assert sfputil.get_transceiver_dom_info_dict(1, snapshot) is None
+
+            with open(dom_path, 'wb') as dom_file:
+                dom_file.write(bytes(build_sfp_eeprom()))
+            snapshot = sfputil.get_transceiver_eeprom_snapshot(1)
+            assert snapshot.has_device(sfputil.DOM_EEPROM_ADDR)
+            assert sfputil.get_transceiver_dom_info_dict(1, snapshot) == sfputil.get_transceiver_dom_info_dict(1)
+
+    def test_missing_port(self, eeprom_path, tmp_path):
+        missing_path = str(tmp_path / 'missing')
+        sfputil = SfpUtil({1: eeprom_path, 2: missing_path})
+
+        assert sfputil.get_transceiver_eeprom_snapshot(2) is None
+        assert sfputil.get_transceiver_bulk_info_dict(2) is None
+
+        bulk = sfputil.get_all_transceiver_bulk_info_dict()
+        assert sorted(bulk) == [1, 2]
+        assert bulk[1]['info']['serial'] == 'SN0123456789'
+        assert bulk[2] is None
+        assert sfputil.get_all_transceiver_bulk_info_dict([2], max_workers=1) == {2: None}
+        assert SfpUtil({}).get_all_transceiver_bulk_info_dict() == {}
@@ -1,5 +1,6 @@
 
 import sys
+import json
 if sys.version_info.major == 3:
     from unittest import mock
 else:
@@ -1996,3 +1997,92 @@ class TestSsd:
         assert(atp_nvme_ssd.get_disk_io_reads() == '44,586,180 [22.8 TB]')
         assert(atp_nvme_ssd.get_disk_io_writes() == '18,202,849 [9.31 TB]')
         assert(atp_nvme_ssd.get_reserved_blocks() == 100.0)
+
+    @mock.patch('sonic_platform_base.sonic_storage.ssd.SsdUtil._execute_shell')
+    def test_ssd_json(self, mock_exec):
+        # The text report embedded in the JSON report is parsed as before
+        mock_exec.return_value = json.dumps({"smartctl": {"output": output_ssd.splitlines()}})
+        ssd = SsdUtil('/dev/sda')
+        mock_exec.assert_called_once_with('smartctl /dev/sda -a --json=o')
+        assert(ssd.get_health() == '95')
+        assert(ssd.get_model() == '(S42) 3IE3')
+        assert(ssd.get_temperature() == '30')
+        assert(ssd.get_disk_io_reads() == '760991')
+        assert(ssd.get_reserved_blocks() == '146')
+
+        # Values missing from the text report come from the structured data
+        mock_exec.return_value = json.dumps({
+            "smartctl": {"output": output_lack_info_ssd.splitlines()},
+            "model_name": "SATA SSD", "serial_number": "SPG210902J8", "firmware_version": "FW1241",
+            "temperature": {"current": 31},
+            "ata_smart_attributes": {"table": [
+                {"id": 169, "name": "Unknown_Attribute", "raw": {"value": 96, "string": "96"}},
+                {"id": 232, "name": "Available_Reservd_Space", "raw": {"value": 29, "string": "29"}},
+                {"id": 241, "name": "Total_LBAs_Written", "raw": {"value": 1024, "string": "1024"}},
+                {"id": 242, "name": "Total_LBAs_Read", "raw": {"value": 2048, "string": "2048 (0 0)"}}]}})
+        ssd = SsdUtil('/dev/sda')
+        assert(ssd.get_health() == '96')
+        assert(ssd.get_model() == 'SATA SSD')
+        assert(ssd.get_firmware() == 'FW1241')
+        assert(ssd.get_temperature() == '31')
+        assert(ssd.get_serial() == 'SPG210902J8')
+        assert(ssd.get_disk_io_reads() == '2048')
+        assert(ssd.get_disk_io_writes() == '1024')
+        assert(ssd.get_reserved_blocks() == '29')
+
+        mock_exec.return_value = json.dumps({
+            "smartctl": {"output": output_lack_info_ssd.splitlines()},
+            "temperature": {"current": 45},
+            "nvme_smart_health_information_log": {"percentage_used": 6, "available_spare": 100,
+                                                  "data_units_read": 44586180, "data_units_written": 18202849}})
+        nvme_ssd = SsdUtil('/dev/nvme0n1')
+        assert(nvme_ssd.get_health() == 94.0)
+        assert(nvme_ssd.get_temperature() == 45.0)
+        assert(nvme_ssd.get_reserved_blocks() == 100.0)
+        assert(nvme_ssd.get_disk_io_reads() == '44,586,180')
+        assert(nvme_ssd.get_disk_io_writes() == '18,202,849')
+
+    @mock.patch('sonic_platform_base.sonic_storage.ssd.SsdUtil._execute_shell')
+    def test_ssd_json_unsupported(self, mock_exec):
+        mock_exec.side_effect = ['=======> UNRECOGNIZED OPTION: json=o\n', output_ssd, output_ssd,
+                                 json.dumps({"smartctl": {"output": output_ssd.splitlines()}})]
+        ssd = SsdUtil('/dev/sda')
+        assert(ssd.get_health() == '95')
+        assert ssd.smartctl_json_supported is False
+        # smartctl is not asked for JSON again for this disk
+        ssd.fetch_generic_ssd_info('/dev/sda')
+        # the other disks still are
+        other_ssd = SsdUtil('/dev/sdb')
+        assert other_ssd.smartctl_json_supported is True
+        assert [call[0][0] for call in mock_exec.call_args_list] == \
+            ['smartctl /dev/sda -a --json=o', 'smartctl /dev/sda -a', 'smartctl /dev/sda -a',
+             'smartctl /dev/sdb -a --json=o']
+
+    @mock.patch('sonic_platform_base.sonic_storage.ssd.SsdUtil._execute_shell', mock.MagicMock(return_value=output_micron_ssd))
+    def test_smartctl_vendor_reuses_report(self):
+        SsdUtil('/dev/sda')
+        assert SsdUtil._execute_shell.call_count == 1
+
+    @mock.patch('sonic_platform_base.sonic_storage.ssd.time.monotonic')
+    @mock.patch('sonic_platform_base.sonic_storage.ssd.SsdUtil._execute_shell')
+    def test_ssd_info_ttl(self, mock_exec, mock_monotonic):
+        mock_exec.return_value = output_ssd
+        mock_monotonic.return_value = 100
+        ssd = SsdUtil('/dev/sda', info_ttl=60)
+        assert(ssd.get_temperature() == '30')
+        assert mock_exec.call_count == 1
+
+        mock_exec.return_value = output_ssd.replace('Old_age   Offline      -       30 (2 100 0 0 0)',
+                                                    'Old_age   Offline      -       41 (2 100 0 0 0)')
+        mock_monotonic.return_value = 159
+        assert(ssd.get_temperature() == '30')
+        mock_monotonic.return_value = 160
+        assert(ssd.get_temperature() == '41')
+        assert(ssd.get_health() == '95')
+        assert mock_exec.call_count == 2
+
+        # Without a TTL the information is collected once
+        ssd = SsdUtil('/dev/sda')
+        mock_monotonic.return_value = 10000
+        ssd.get_temperature()
+        assert mock_exec.call_count == 3
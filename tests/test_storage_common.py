@@ -2,28 +2,37 @@ import os
 import sys
 import types
 from mock import MagicMock, patch
-#import psutil
 
-from sonic_platform_base.sonic_storage.storage_common import StorageCommon
+from sonic_platform_base.sonic_storage import storage_common
+from sonic_platform_base.sonic_storage.storage_common import StorageCommon, DiskStatsSampler
 
-class DiskIOCounters():
-    def __init__(self, perdisk=True, nowrap=True):
-
-        self.read_count =  18038
-        self.write_count = 95836
+diskstats_output = """\
+   7       0 loop0 5 0 12 0 0 0 0 0 0 4 0 0 0 0 0 0 0
+   8       0 sda 18038 3409 1228954 10476 95836 95301 3528162 90248 0 126952 119076 0 0 0 0 4312 18350
+   8       1 sda1 17800 3409 1220000 10400 95800 95301 3528000 90200 0 126900 100600 0 0 0 0 0 0
+"""
 
 class TestStorageCommon:
-    
-    @patch('psutil.disk_io_counters', MagicMock(return_value={'sda': DiskIOCounters()}))
-    def test_get_reads_writes(self):
 
-        common_object = StorageCommon('/dev/sda')
+    def setup_method(self):
+        storage_common.diskstats_sampler.timestamp = None
+
+    def test_get_reads_writes(self, tmp_path):
+        diskstats = tmp_path / 'diskstats'
+        diskstats.write_text(diskstats_output)
+
+        with patch.object(storage_common.diskstats_sampler, 'path', str(diskstats)):
+            common_object = StorageCommon('/dev/sda')
 
-        reads = common_object.get_fs_io_reads()
-        writes = common_object.get_fs_io_writes()
+            reads = common_object.get_fs_io_reads()
+            writes = common_object.get_fs_io_writes()
+
+            assert (reads == 18038)
+            assert (writes == 95836)
 
-        assert (reads == 18038)
-        assert (writes == 95836)
+            # one parse serves every disk within the sampling interval
+            diskstats.write_text("")
+            assert StorageCommon('/dev/sda1').get_fs_io_reads() == 17800
 
     
     def test_init(self):
@@ -32,19 +41,59 @@ class TestStorageCommon:
         assert common_object.storage_disk == 'sda'
 
 
-    def test_get_reads_writes_bad_disk(self):
+    def test_get_reads_writes_bad_disk(self, tmp_path):
         common_object = StorageCommon('/dev/glorp')
 
-        with patch('psutil.disk_io_counters', MagicMock()) as mock_psutil_output:
-
-            class DiskIOCounters():
-                def __init__(self, perdisk=True, nowrap=True):
-                    pass
-
-            mock_psutil_output.return_value = {'glorp': DiskIOCounters()}
+        diskstats = tmp_path / 'diskstats'
+        diskstats.write_text(diskstats_output)
+        with patch.object(storage_common.diskstats_sampler, 'path', str(diskstats)):
             reads = common_object.get_fs_io_reads()
             writes = common_object.get_fs_io_writes()
 
             assert (reads == 0)
             assert (writes == 0)
 
+    @patch('sonic_platform_base.sonic_storage.storage_common.time.monotonic')
+    def test_diskstats_sampler_rates(self, mock_monotonic, tmp_path):
+        diskstats = tmp_path / 'diskstats'
+        diskstats.write_text(diskstats_output)
+        sampler = DiskStatsSampler(path=str(diskstats), interval=5)
+
+        mock_monotonic.return_value = 100
+        assert sampler.get_counter('sda', storage_common.DISKSTATS_WRITE_SECTORS) == 3528162
+        assert sampler.get_rates('sda') is None
+
+        diskstats.write_text(diskstats_output.replace('sda 18038 3409 1228954', 'sda 18538 3409 1248954')
+                                             .replace('10476 95836 95301 3528162', '10476 96836 95301 3538162'))
+        # within the interval the previous sample is served
+        mock_monotonic.return_value = 104
+        assert sampler.get_counter('sda', storage_common.DISKSTATS_READ_COUNT) == 18038
+
+        mock_monotonic.return_value = 110
+        assert sampler.get_rates('sda') == {'read_iops': 50.0, 'write_iops': 100.0,
+                                            'read_bytes_per_sec': 20000 * 512 / 10.0,
+                                            'write_bytes_per_sec': 10000 * 512 / 10.0}
+        assert sampler.get_rates('sda1') == {'read_iops': 0.0, 'write_iops': 0.0,
+                                             'read_bytes_per_sec': 0.0, 'write_bytes_per_sec': 0.0}
+        assert sampler.get_rates('glorp') is None
+
+        with patch.object(storage_common, 'diskstats_sampler', sampler):
+            common_object = StorageCommon('/dev/sda')
+            assert common_object.get_fs_io_reads() == 18538
+            assert common_object.get_fs_io_rates()['write_iops'] == 100.0
+
+    def test_diskstats_sampler_nowrap(self, tmp_path):
+        diskstats = tmp_path / 'diskstats'
+        diskstats.write_text(diskstats_output)
+        sampler = DiskStatsSampler(path=str(diskstats), interval=0)
+        assert sampler.get_counter('sda', storage_common.DISKSTATS_READ_COUNT) == 18038
+
+        # the read count wrapped around 2^32 to 100
+        diskstats.write_text(diskstats_output.replace('sda 18038 ', 'sda 100 '))
+        sampler.sample(force=True)
+        assert sampler.get_counter('sda', storage_common.DISKSTATS_READ_COUNT) == 18138
+        diskstats.write_text(diskstats_output.replace('sda 18038 ', 'sda 600 '))
+        assert sampler.get_counter('sda', storage_common.DISKSTATS_READ_COUNT) == 18638
+        # the other counters are not affected
+        assert sampler.get_counter('sda', storage_common.DISKSTATS_WRITE_COUNT) == 95836
+        assert sampler.get_counter('sda1', storage_common.DISKSTATS_READ_COUNT) == 17800
@@ -94,3 +94,359 @@ class TestThermalManagerBase:
         tmb.ThermalManagerBase.run_policy(chassis)
         assert MockThermalCondition1.is_match.call_count == 0
         assert MockThermalCondition2.is_match.call_count == 0
+
+
+class SlowThermalInfo(thermal_info_base.ThermalPolicyInfoBase):
+    def __init__(self, delay=0):
+        self.delay = delay
+        self.collected = 0
+        self.threads = set()
+
+    def collect(self, chassis):
+        import threading
+        import time
+        self.threads.add(threading.current_thread().name)
+        time.sleep(self.delay)
+        self.collected += 1
+
+
+class CollectThermalManager(tmb.ThermalManagerBase):
+    _collect_thermal_information = tmb.ThermalManagerBase.__dict__['_collect_thermal_information']
+    _running = True
+    _thermal_info_dict = {}
+    _info_collect_pending = {}
+    _info_snapshots = {}
+    _info_refresh_interval = {}
+    _info_last_collect = {}
+    _info_collect_time = {}
+    _log = None
+
+
+class TestThermalInfoCollection:
+    def setup_method(self):
+        CollectThermalManager._thermal_info_dict = {'fast1': SlowThermalInfo(), 'fast2': SlowThermalInfo(),
+                                                    'slow': SlowThermalInfo(0.5)}
+        CollectThermalManager._info_collect_pending = {}
+        CollectThermalManager._info_snapshots = {}
+        CollectThermalManager._log = mock.MagicMock()
+        CollectThermalManager._info_refresh_interval = {}
+        CollectThermalManager._info_last_collect = {}
+        CollectThermalManager._info_collect_time = {}
+
+    def teardown_method(self):
+        CollectThermalManager.set_info_collect_concurrency(0)
+
+    def test_serial_collection_timing(self):
+        CollectThermalManager._collect_thermal_information(MockChassis())
+        infos = CollectThermalManager._thermal_info_dict
+        assert all(info.collected == 1 for info in infos.values())
+        assert infos['fast1'].threads == {'MainThread'}
+        collect_time = CollectThermalManager.get_info_collect_time()
+        assert sorted(collect_time) == ['fast1', 'fast2', 'slow']
+        assert collect_time['slow'] >= 0.5
+
+    def test_concurrent_collection_timeout(self):
+        CollectThermalManager.set_info_collect_concurrency(3, timeout=0.2)
+        infos = CollectThermalManager._thermal_info_dict
+        CollectThermalManager._collect_thermal_information(MockChassis())
+        assert infos['fast1'].collected == 1 and infos['fast2'].collected == 1
+        assert 'MainThread' not in infos['fast1'].threads
+        # the slow collector timed out and is not re-submitted while it is still running
+        assert infos['slow'].collected == 0
+        assert 'slow' in CollectThermalManager._info_collect_pending
+        CollectThermalManager._collect_thermal_information(MockChassis())
+        assert infos['fast1'].collected == 2
+        CollectThermalManager._info_collect_pending['slow'].result()
+        assert infos['slow'].collected == 1
+        CollectThermalManager._collect_thermal_information(MockChassis())
+        assert infos['fast1'].collected == 3
+        CollectThermalManager._info_collect_pending['slow'].result()
+        assert infos['slow'].collected == 2
+
+    def test_concurrent_collection_per_collector_timeout(self):
+        infos = CollectThermalManager._thermal_info_dict
+        infos['stuck'] = SlowThermalInfo(0.8)
+        # the slow collector gets more time than the default, which applies to each collector separately
+        CollectThermalManager.set_info_collect_concurrency(4, timeout=0.2, info_timeouts={'slow': 1.0})
+        CollectThermalManager._collect_thermal_information(MockChassis())
+        assert infos['slow'].collected == 1
+        assert infos['stuck'].collected == 0
+        assert list(CollectThermalManager._info_collect_pending) == ['stuck']
+        warning = CollectThermalManager._log.log_warning.call_args[0][0]
+        assert 'stuck' in warning and '0.2' in warning
+
+    def test_concurrent_collection_snapshot(self):
+        infos = CollectThermalManager._thermal_info_dict
+        CollectThermalManager.set_info_collect_concurrency(3, timeout=0.2)
+        CollectThermalManager._collect_thermal_information(MockChassis())
+        # the policies see the slow information as it was before the collection started
+        policy_infos = CollectThermalManager._get_policy_info_dict()
+        assert policy_infos['fast1'] is infos['fast1']
+        assert policy_infos['slow'] is not infos['slow']
+        CollectThermalManager._info_collect_pending['slow'].result()
+        assert infos['slow'].collected == 1 and len(infos['slow'].threads) == 1
+        assert policy_infos['slow'].collected == 0 and not policy_infos['slow'].threads
+        # the completed collection is handed to the policies in the next cycle
+        infos['slow'].delay = 0
+        CollectThermalManager._collect_thermal_information(MockChassis())
+        assert not CollectThermalManager._info_collect_pending
+        assert CollectThermalManager._get_policy_info_dict() is infos
+        assert infos['slow'].collected == 2
+
+    def test_concurrent_collection_not_started(self):
+        infos = CollectThermalManager._thermal_info_dict
+        infos['fast1'].delay = 0.4
+        del infos['fast2']
+        # one worker is busy with fast1, slow is cancelled before it starts
+        CollectThermalManager.set_info_collect_concurrency(1, timeout=0.1, info_timeouts={'fast1': 1.0})
+        CollectThermalManager._collect_thermal_information(MockChassis())
+        assert infos['fast1'].collected == 1
+        assert infos['slow'].collected == 0
+        assert not CollectThermalManager._info_collect_pending
+        assert CollectThermalManager._get_policy_info_dict() is infos
+
+    def test_concurrent_collection_error(self):
+        CollectThermalManager.set_info_collect_concurrency(2)
+        CollectThermalManager._thermal_info_dict['fast2'].collect = mock.MagicMock(side_effect=RuntimeError('i2c'))
+        try:
+            CollectThermalManager._collect_thermal_information(MockChassis())
+            assert False
+        except RuntimeError:
+            pass
+        assert CollectThermalManager._thermal_info_dict['slow'].collected == 1
+
+    @mock.patch('sonic_platform_base.sonic_thermal_control.thermal_manager_base.time.monotonic')
+    def test_refresh_interval(self, mock_monotonic):
+        CollectThermalManager._thermal_info_dict['slow'].delay = 0
+        CollectThermalManager._info_refresh_interval = {'slow': 300}
+        infos = CollectThermalManager._thermal_info_dict
+        for now, fast, slow in ((1000, 1, 1), (1060, 2, 1), (1299, 3, 1), (1300, 4, 2)):
+            mock_monotonic.return_value = now
+            CollectThermalManager._collect_thermal_information(MockChassis())
+            assert infos['fast1'].collected == fast
+            assert infos['slow'].collected == slow
+
+    def test_load_refresh_interval(self, tmp_path):
+        policy_file = tmp_path / 'policy.json'
+        policy_file.write_text('{"info_types": [{"type": "some_info", "refresh_interval": "120"}]}')
+        CollectThermalManager.load(str(policy_file))
+        assert CollectThermalManager._info_refresh_interval == {'some_info': 120.0}
+        assert isinstance(CollectThermalManager._thermal_info_dict['some_info'], MockThermalInfo)
+
+
+class ChangingThermalInfo(thermal_info_base.ThermalPolicyInfoBase):
+    def __init__(self):
+        self.temperature = 30
+        self.changed = True
+
+    def collect(self, chassis):
+        pass
+
+    def is_changed(self):
+        return self.changed
+
+
+class DependentCondition(thermal_condition_base.ThermalPolicyConditionBase):
+    evaluations = 0
+
+    def load_from_json(self, json_obj):
+        self.threshold = int(json_obj.get('threshold', 50))
+
+    def __eq__(self, other):
+        return self.__class__ == other.__class__ and self.threshold == other.threshold
+
+    def get_info_dependencies(self):
+        return ['temp_info']
+
+    def is_stateless(self):
+        return True
+
+    def is_match(self, thermal_info_dict):
+        DependentCondition.evaluations += 1
+        return thermal_info_dict['temp_info'].temperature > self.threshold
+
+
+class UnknownCondition(thermal_condition_base.ThermalPolicyConditionBase):
+    evaluations = 0
+
+    def is_match(self, thermal_info_dict):
+        UnknownCondition.evaluations += 1
+        return True
+
+
+class SharedCondition(thermal_condition_base.ThermalPolicyConditionBase):
+    evaluations = 0
+
+    def is_stateless(self):
+        return True
+
+    def is_match(self, thermal_info_dict):
+        SharedCondition.evaluations += 1
+        return True
+
+
+class CompiledThermalManager(tmb.ThermalManagerBase):
+    _collect_thermal_information = tmb.ThermalManagerBase.__dict__['_collect_thermal_information']
+    _running = True
+    _policy_dict = {}
+    _thermal_info_dict = {}
+    _info_last_collect = {}
+    _info_collect_time = {}
+    _info_generation = {}
+
+
+class TestCompiledPolicy:
+    @mock.patch.dict(thermal_json_object.ThermalJsonObject._object_type_dict,
+                     {'dep_cond': DependentCondition, 'unknown_cond': UnknownCondition})
+    def test_compiled_policy(self):
+        CompiledThermalManager._policy_dict = {}
+        CompiledThermalManager._thermal_info_dict = {'temp_info': ChangingThermalInfo()}
+        CompiledThermalManager._info_generation = {}
+        for name, conditions in (('hot', [{'type': 'dep_cond'}]),
+                                 ('hot and other', [{'type': 'dep_cond'}, {'type': 'unknown_cond'}]),
+                                 ('very hot', [{'type': 'dep_cond', 'threshold': '80'}])):
+            CompiledThermalManager._load_policy({'name': name, 'conditions': conditions,
+                                                 'actions': [{'type': 'action1', 'speed': '100'}]})
+        CompiledThermalManager.set_policy_compilation(True)
+        MockThermalAction1.execute = mock.MagicMock()
+        DependentCondition.evaluations = 0
+        UnknownCondition.evaluations = 0
+        temp_info = CompiledThermalManager._thermal_info_dict['temp_info']
+
+        chassis = MockChassis()
+        CompiledThermalManager.run_policy(chassis)
+        # the two equal threshold-50 conditions are evaluated once, the threshold-80 one separately
+        assert len(CompiledThermalManager._compiled_conditions) == 3
+        assert DependentCondition.evaluations == 2
+        assert UnknownCondition.evaluations == 0
+        assert MockThermalAction1.execute.call_count == 0
+
+        # unchanged information: memoized results, conditions of unknown dependencies still run
+        temp_info.temperature = 60
+        temp_info.changed = False
+        CompiledThermalManager.run_policy(chassis)
+        assert DependentCondition.evaluations == 2
+        assert MockThermalAction1.execute.call_count == 0
+
+        temp_info.changed = True
+        CompiledThermalManager.run_policy(chassis)
+        assert DependentCondition.evaluations == 4
+        assert UnknownCondition.evaluations == 1
+        assert MockThermalAction1.execute.call_count == 2
+
+        # loading a policy recompiles
+        CompiledThermalManager._load_policy({'name': 'any', 'conditions': [{'type': 'unknown_cond'}],
+                                             'actions': [{'type': 'action1', 'speed': '100'}]})
+        assert CompiledThermalManager._compiled_policies is None
+        CompiledThermalManager.run_policy(chassis)
+        assert len(CompiledThermalManager._compiled_policies) == 4
+        # conditions which are not stateless are never shared, each policy evaluates its own
+        assert len(CompiledThermalManager._compiled_conditions) == 4
+        assert UnknownCondition.evaluations == 3
+        CompiledThermalManager.set_policy_compilation(False)
+
+    @mock.patch.dict(thermal_json_object.ThermalJsonObject._object_type_dict,
+                     {'shared_cond': SharedCondition, 'unknown_cond': UnknownCondition})
+    def test_compiled_policy_shared_condition(self):
+        CompiledThermalManager._policy_dict = {}
+        CompiledThermalManager._thermal_info_dict = {}
+        for name, conditions in (('shared', [{'type': 'shared_cond'}]),
+                                 ('shared and other', [{'type': 'unknown_cond'}, {'type': 'shared_cond'}])):
+            CompiledThermalManager._load_policy({'name': name, 'conditions': conditions,
+                                                 'actions': [{'type': 'action1', 'speed': '100'}]})
+        CompiledThermalManager.set_policy_compilation(True)
+        MockThermalAction1.execute = mock.MagicMock()
+        SharedCondition.evaluations = 0
+
+        # a stateless condition without declared dependencies is evaluated once per run for both policies
+        chassis = MockChassis()
+        for cycle in range(1, 4):
+            CompiledThermalManager.run_policy(chassis)
+            assert SharedCondition.evaluations == cycle
+        assert MockThermalAction1.execute.call_count == 6
+        CompiledThermalManager.set_policy_compilation(False)
+
+
+class TestThermalInfoChanged:
+    def test_default_is_changed(self):
+        info = MockThermalInfo()
+        info.fans = []
+        info.temperature = 30
+        assert info.is_changed()
+        assert not info.is_changed()
+
+        info.temperature = 31
+        assert info.is_changed()
+        # containers mutated in place are compared to their previous content
+        info.fans.append('fan1')
+        assert info.is_changed()
+        assert not info.is_changed()
+        assert not info.snapshot().is_changed()
+
+
+class ProfiledThermalManager(tmb.ThermalManagerBase):
+    _collect_thermal_information = tmb.ThermalManagerBase.__dict__['_collect_thermal_information']
+    _running = True
+    _interval = 1
+    _policy_dict = {}
+    _thermal_info_dict = {}
+    _info_last_collect = {}
+    _info_collect_time = {}
+    _info_generation = {}
+
+
+class TestThermalProfiler:
+    def test_profiler_percentiles(self):
+        from sonic_platform_base.sonic_thermal_control.thermal_profiler import ThermalControlProfiler
+        profiler = ThermalControlProfiler(window=10)
+        for value in range(1, 21):
+            profiler.record(ThermalControlProfiler.STEP_INFO, 'fan_info', value / 10.0)
+        summary = profiler.get_summary()['steps']['info.fan_info']
+        # only the last 10 samples are kept
+        assert summary['count'] == 10
+        assert summary['p50'] == 1.5
+        assert summary['p90'] == 1.9
+        assert summary['max'] == summary['last'] == 2.0
+
+    @mock.patch('sonic_platform_base.sonic_thermal_control.thermal_profiler.time.monotonic')
+    @mock.patch('sonic_platform_base.sonic_thermal_control.thermal_manager_base.time.monotonic')
+    def test_run_policy_profiled(self, mock_monotonic, mock_profiler_monotonic):
+        clock = [0.0]
+
+        def tick(seconds):
+            def advance(*args):
+                clock[0] += seconds
+                return True
+            return advance
+
+        mock_monotonic.side_effect = lambda: clock[0]
+        mock_profiler_monotonic.side_effect = lambda: clock[0]
+        info = SlowThermalInfo()
+        info.collect = mock.MagicMock(side_effect=tick(0.3))
+        ProfiledThermalManager._thermal_info_dict = {'fan_info': info}
+        ProfiledThermalManager._policy_dict = {}
+        ProfiledThermalManager._load_policy({'name': 'p1', 'conditions': [{'type': 'condition1'}],
+                                             'actions': [{'type': 'action1', 'speed': '100'}]})
+        MockThermalCondition1.is_match = mock.MagicMock(side_effect=tick(0.1))
+        MockThermalAction1.execute = mock.MagicMock(side_effect=tick(0.7))
+
+        logger = mock.MagicMock()
+        assert ProfiledThermalManager.get_profile_summary() is None
+        ProfiledThermalManager.enable_profiler(log_interval=2, logger=logger)
+        try:
+            ProfiledThermalManager.run_policy(MockChassis())
+            ProfiledThermalManager.run_policy(MockChassis())
+            summary = ProfiledThermalManager.get_profile_summary()
+            assert summary['cycles'] == 2
+            # 0.3 + 0.1 + 0.7 exceeds the 1 second interval
+            assert summary['overruns'] == 2
+            assert sorted(summary['steps']) == ['action.MockThermalAction1', 'condition.MockThermalCondition1',
+                                                'cycle.total', 'info.fan_info']
+            assert abs(summary['steps']['action.MockThermalAction1']['p50'] - 0.7) < 1e-9
+            assert abs(summary['steps']['condition.MockThermalCondition1']['p90'] - 0.1) < 1e-9
+            assert abs(summary['steps']['cycle.total']['max'] - 1.1) < 1e-9
+            # the summary is logged every 2 seconds
+            assert logger.call_count == 1
+            assert 'overruns 2' in logger.call_args[0][0]
+        finally:
+            ProfiledThermalManager.disable_profiler()
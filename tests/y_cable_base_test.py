@@ -0,0 +1,112 @@
+import sys
+import threading
+
+if sys.version_info.major == 3:
+    from unittest import mock
+else:
+    import mock
+
+from sonic_y_cable.y_cable_base import YCableBase, firmware_operation
+
+
+class FakeCable(YCableBase):
+    def __init__(self, port=1):
+        YCableBase.__init__(self, port, mock.MagicMock())
+        self.version = '1.0'
+        self.reads = 0
+        self.activating = threading.Event()
+        self.activated = threading.Event()
+
+    def get_vendor(self):
+        self.reads += 1
+        return 'ACME'
+
+    def get_part_number(self):
+        return 'YC-1'
+
+    def get_serial_number(self):
+        return 'SN1'
+
+    def get_firmware_version(self, target):
+        return {'version_active': self.version, 'version_inactive': None, 'version_next': self.version}
+
+    @firmware_operation
+    def activate_firmware(self, fwfile=None, hitless=False):
+        # telemetry is read from another thread while the new firmware is activated
+        self.activating.set()
+        assert self.activated.wait(5)
+        self.version = '2.0'
+        return self.FIRMWARE_ACTIVATE_SUCCESS
+
+    @firmware_operation
+    def rollback_firmware(self, fwfile=None):
+        raise RuntimeError('i2c')
+
+
+def firmware_versions(static_data):
+    return set(version['version_active'] for version in static_data['firmware_version'].values())
+
+
+class TestStaticData(object):
+    def test_cache_and_invalidate(self):
+        cable = FakeCable()
+        static_data = cable.get_static_data()
+        assert static_data['vendor'] == 'ACME'
+        assert static_data['serial_number'] == 'SN1'
+        assert firmware_versions(static_data) == {'1.0'}
+        assert cable.get_static_data() == static_data
+        assert cable.reads == 1
+
+        cable.version = '1.1'
+        assert firmware_versions(cable.get_static_data()) == {'1.0'}
+        cable.invalidate_static_data()
+        assert firmware_versions(cable.get_static_data()) == {'1.1'}
+        assert cable.reads == 2
+
+        # nothing is cached while a download is in progress
+        cable.invalidate_static_data()
+        cable.download_firmware_status = cable.FIRMWARE_DOWNLOAD_STATUS_INPROGRESS
+        cable.get_static_data()
+        cable.get_static_data()
+        assert cable.reads == 4
+
+    def test_read_during_firmware_operation(self):
+        cable = FakeCable()
+        assert firmware_versions(cable.get_static_data()) == {'1.0'}
+
+        results = []
+        activate = threading.Thread(target=lambda: results.append(cable.activate_firmware()))
+        activate.start()
+        assert cable.activating.wait(5)
+        # read while the activation runs, the old versions are returned but not cached
+        assert firmware_versions(cable.get_static_data()) == {'1.0'}
+        assert not cable._static_data
+        cable.activated.set()
+        activate.join(5)
+        assert results == [cable.FIRMWARE_ACTIVATE_SUCCESS]
+
+        assert firmware_versions(cable.get_static_data()) == {'2.0'}
+        assert cable._static_data
+
+    def test_firmware_operation_failure(self):
+        cable = FakeCable()
+        cable.get_static_data()
+        try:
+            cable.rollback_firmware()
+            assert False
+        except RuntimeError:
+            pass
+        # the cache was dropped and the operation count restored
+        assert not cable._static_data
+        assert cable._firmware_operations == 0
+        cable.get_static_data()
+        assert cable._static_data
+
+    def test_vendor_cached_versions(self):
+        cable = FakeCable()
+        cable.get_firmware_version = lambda target: {'version_active': '1.0', 'version_inactive': None,
+                                                     'version_next': '1.0', 'cached': True}
+        assert firmware_versions(cable.get_static_data()) == {'1.0'}
+        # the versions the vendor returned from its own cache are not kept
+        assert cable._static_data
+        assert not any(isinstance(key, tuple) for key in cable._static_data)
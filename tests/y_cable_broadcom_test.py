@@ -0,0 +1,165 @@
+import array
+import struct
+import sys
+import threading
+
+if sys.version_info.major == 3:
+    from unittest import mock
+else:
+    import mock
+
+import pytest
+
+from sonic_y_cable import y_cable_trace
+from sonic_y_cable.broadcom.y_cable_broadcom import YCable, cable_upgrade_head_s
+
+
+def build_fw_image(compressed=(2,)):
+    """
+    Firmware file holding TOR bank 1, TOR bank 2, NIC bank 1, NIC bank 2 and MUX chip images,
+    each preceded by a 0x28 bytes header. Image i has firmware version i.(10 + i) and 8 + i words.
+    """
+    images = []
+    for i in range(5):
+        body = struct.pack('<{}I'.format(8 + i), *[(i << 16) | word for word in range(8 + i)])
+        size = len(body)
+        compressed_size = 0
+        if i in compressed:
+            body = body[:len(body) // 2]
+            compressed_size = len(body)
+        header = struct.pack('<I4HI6I', size, 10 + i, i, 1, 2, 0xc0de0000 + i,
+                             1 if i in compressed else 0, compressed_size, 0, 0, 0, 0)
+        images.append(header + body)
+    return b''.join(images)
+
+
+@pytest.fixture
+def cable():
+    return YCable(1, mock.MagicMock())
+
+
+def set_current_bank(cable, bank):
+    def cable_fw_get_status(upgrade_info, crc_check_version=False):
+        upgrade_info.status_info.current_bank = bank
+        return YCable.RR_SUCCESS
+    cable.cable_fw_get_status = cable_fw_get_status
+
+
+class TestBroadcomImageParse(object):
+    @pytest.mark.parametrize('bank, tor_image, nic_image', [(1, 1, 3), (2, 0, 2)])
+    def test_parse_image(self, cable, tmp_path, bank, tor_image, nic_image):
+        fwfile = tmp_path / 'fw.bin'
+        fwfile.write_bytes(build_fw_image())
+        set_current_bank(cable, bank)
+
+        # the image of the bank not running is selected
+        for destination, image in ((YCable.TOR_MCU_SELF, tor_image), (YCable.TOR_MCU_PEER, tor_image),
+                                   (YCable.NIC_MCU, nic_image), (YCable.MUX_CHIP, 4)):
+            upgrade_head = cable_upgrade_head_s()
+            assert cable.parse_image(upgrade_head, destination, str(fwfile)) == YCable.RR_SUCCESS
+            image_info = upgrade_head.cable_up_info.image_info
+            assert upgrade_head.cable_up_info.destination == destination
+            assert image_info.image_size == 4 * (8 + image)
+            assert image_info.image_fw_version.image_version_major == image
+            assert image_info.image_fw_version.image_version_minor == 10 + image
+            assert image_info.image_api_version.image_version_major == 2
+            assert image_info.image_api_version.image_version_minor == 1
+            assert image_info.image_crc32 == 0xc0de0000 + image
+            assert upgrade_head.compression == (1 if image == 2 else 0)
+            assert len(image_info.image_ptr) == YCable.MUX_FW_IMG_SIZE
+            assert list(image_info.image_ptr[:3]) == [image << 16, (image << 16) | 1, (image << 16) | 2]
+
+    def test_parse_image_from_buffer(self, cable):
+        fwdata = build_fw_image(compressed=())
+        set_current_bank(cable, 2)
+        upgrade_head = cable_upgrade_head_s()
+        with mock.patch('builtins.open') as mock_open:
+            assert cable.parse_image(upgrade_head, YCable.MUX_CHIP, 'fw.bin', fwdata) == YCable.RR_SUCCESS
+        mock_open.assert_not_called()
+        image_ptr = upgrade_head.cable_up_info.image_info.image_ptr
+        # the buffer is zeroed past the end of the file
+        assert image_ptr[:13] == array.array('I', [(4 << 16) | word for word in range(12)] + [0])
+
+    def test_parse_image_errors(self, cable, tmp_path):
+        set_current_bank(cable, 1)
+        fwfile = tmp_path / 'fw.bin'
+        assert cable.parse_image(cable_upgrade_head_s(), YCable.NIC_MCU, str(fwfile)) == YCable.RR_ERROR
+        fwfile.write_bytes(build_fw_image()[:200])
+        assert cable.parse_image(cable_upgrade_head_s(), YCable.MUX_CHIP, str(fwfile)) == YCable.RR_ERROR
+        assert cable.parse_image(cable_upgrade_head_s(), 0xff, str(fwfile)) == YCable.RR_ERROR
+
+
+class TestBroadcomCmdStats(object):
+    def test_cable_cmd_stats(self, cable):
+        with mock.patch.object(y_cable_trace, 'y_cable_trace_stats', {}):
+            y_cable_trace.record(cable.port, y_cable_trace.TRACE_MCU_CMD, 'cable_cmd_17', 0.5)
+            y_cable_trace.record(cable.port, y_cable_trace.TRACE_MCU_CMD, 'cable_cmd_17', 1.5, error=True)
+            y_cable_trace.record(cable.port, y_cable_trace.TRACE_EEPROM_READ, 'read_eeprom', 0.1)
+            y_cable_trace.record(2, y_cable_trace.TRACE_MCU_CMD, 'cable_cmd_3', 0.5)
+
+            # the command latencies are those recorded by the trace module, by command id
+            stats = cable.get_cable_cmd_stats(reset=True)
+            assert list(stats) == [17]
+            assert stats[17]['count'] == 2
+            assert stats[17]['errors'] == 1
+            assert stats[17]['max_time'] == 1.5
+            assert stats[17]['avg_time'] == 1.0
+            assert cable.get_cable_cmd_stats() == {}
+            assert y_cable_trace.get_trace_stats(2)
+
+
+class TestBroadcomFirmwareVersion(object):
+    @pytest.fixture
+    def cable(self, cable):
+        cable.platform_chassis = mock.MagicMock()
+        cable.get_read_side = lambda: 1
+        cable.minor = 1
+
+        def cable_fw_get_status(upgrade_info, crc_check_version=False):
+            status_info = upgrade_info.status_info
+            status_info.current_bank = status_info.next_bank = 1
+            status_info.bank1_info.image_fw_version.image_version_major = 1
+            status_info.bank1_info.image_fw_version.image_version_minor = cable.minor
+            return YCable.RR_SUCCESS
+        cable.cable_fw_get_status = cable_fw_get_status
+        return cable
+
+    def test_version_during_firmware_operation(self, cable):
+        assert cable.get_firmware_version(YCable.TARGET_TOR_A) == {
+            'version_active': '1.1', 'version_inactive': '0.0', 'version_next': '1.1'}
+
+        holding = threading.Event()
+        release = threading.Event()
+
+        def hold_dl_lock():
+            with cable.dl_lock.acquire_timeout(1):
+                holding.set()
+                release.wait(5)
+
+        holder = threading.Thread(target=hold_dl_lock)
+        holder.start()
+        try:
+            assert holding.wait(5)
+            cable.minor = 2
+            # the versions read last are returned at once, marked as such
+            assert cable.get_firmware_version(YCable.TARGET_TOR_A) == {
+                'version_active': '1.1', 'version_inactive': '0.0', 'version_next': '1.1', 'cached': True}
+            assert cable.get_static_data(targets=(YCable.TARGET_TOR_A,))['firmware_version'][
+                YCable.TARGET_TOR_A]['cached']
+            assert ('firmware_version', YCable.TARGET_TOR_A) not in cable._static_data
+
+            # kept while a firmware operation invalidates the static data
+            cable._firmware_operations = 1
+            cable.invalidate_static_data()
+            assert cable.get_firmware_version(YCable.TARGET_TOR_A)['cached']
+            cable._firmware_operations = 0
+
+            # but not after a cable swap
+            cable.invalidate_static_data()
+            assert cable.get_firmware_version(YCable.TARGET_TOR_A) is None
+        finally:
+            release.set()
+            holder.join(5)
+
+        assert cable.get_firmware_version(YCable.TARGET_TOR_A) == {
+            'version_active': '1.2', 'version_inactive': '0.0', 'version_next': '1.2'}
@@ -0,0 +1,126 @@
+import struct
+import sys
+from contextlib import contextmanager
+
+if sys.version_info.major == 3:
+    from unittest import mock
+else:
+    import mock
+
+import pytest
+
+from sonic_y_cable.credo import y_cable_credo
+from sonic_y_cable.credo.y_cable_credo import YCable
+
+VSC_BASE = YCable.MIS_PAGE_VSC * 128
+
+
+class FakeVscSfp(object):
+    """
+    EEPROM of a Credo cable whose MCU completes a VSC command after busy_polls reads of the opcode
+    """
+    def __init__(self, busy_polls=2):
+        self.eeprom = bytearray(0x100 * 128)
+        self.busy_polls = busy_polls
+        self.polls = 0
+        self.writes = []
+        self.reads = []
+        self.commands = []
+
+    def write_eeprom(self, offset, num_bytes, write_buffer):
+        assert len(write_buffer) == num_bytes
+        self.writes.append((offset - VSC_BASE, bytes(write_buffer)))
+        self.eeprom[offset:offset + num_bytes] = write_buffer
+        if offset == VSC_BASE + YCable.VSC_BYTE_OPCODE:
+            self.commands.append(bytes(self.eeprom[VSC_BASE + 128:VSC_BASE + 128 + YCable.VSC_CMD_ATTRIBUTE_LENGTH]))
+            self.polls = 0
+        return True
+
+    def read_eeprom(self, offset, num_bytes):
+        self.reads.append((offset - VSC_BASE, num_bytes))
+        if offset == VSC_BASE + YCable.VSC_BYTE_OPCODE and self.eeprom[offset] != 0:
+            self.polls += 1
+            if self.polls > self.busy_polls:
+                self.complete(self.commands[-1])
+        return bytearray(self.eeprom[offset:offset + num_bytes])
+
+    def complete(self, command):
+        # reads return the address plus one as data, with a no error status
+        addr = struct.unpack_from('<I', command, 130 - 128)[0]
+        self.eeprom[VSC_BASE + 134:VSC_BASE + 138] = struct.pack('<I', addr + 1)
+        self.eeprom[VSC_BASE + YCable.VSC_BYTE_STATUS] = YCable.MCU_EC_NO_ERROR
+        self.eeprom[VSC_BASE + YCable.VSC_BYTE_OPCODE] = 0
+
+
+@pytest.fixture
+def sfp():
+    return FakeVscSfp()
+
+
+@pytest.fixture
+def cable(sfp):
+    cable = YCable(1, mock.MagicMock())
+    cable.platform_chassis = mock.MagicMock()
+    cable.platform_chassis.get_sfp.return_value = sfp
+    return cable
+
+
+class TestCredoVsc(object):
+    def test_send_vsc_write_coalescing(self, cable, sfp):
+        vsc_req_form = [None] * YCable.VSC_CMD_ATTRIBUTE_LENGTH
+        vsc_req_form[YCable.VSC_BYTE_OPCODE] = YCable.VSC_OPCODE_TCM_READ
+        vsc_req_form[130:134] = struct.pack('<I', 0x12345678)
+        vsc_req_form[136] = 0x5A
+        vsc_req_form[YCable.VSC_BYTE_OPTION] = 0x01
+
+        assert cable.send_vsc(vsc_req_form) == YCable.MCU_EC_NO_ERROR
+        # one write per run of request bytes, the opcode last
+        assert sfp.writes == [(130, b'\x78\x56\x34\x12'), (136, b'\x5a'), (YCable.VSC_BYTE_OPTION, b'\x01'),
+                              (YCable.VSC_BYTE_OPCODE, bytes([YCable.VSC_OPCODE_TCM_READ]))]
+        # the opcode is polled until the MCU clears it, then status and response are read at once
+        assert sfp.reads == [(YCable.VSC_BYTE_OPCODE, 1)] * 3 + [(YCable.VSC_BYTE_STATUS, 12)]
+        assert struct.unpack_from('<I', cable.vsc_response, 134)[0] == 0x12345679
+
+    def test_send_vsc_timeout(self, cable, sfp):
+        sfp.busy_polls = float('inf')
+        clock = [100.0]
+        sleeps = []
+
+        def sleep(seconds):
+            sleeps.append(seconds)
+            clock[0] += seconds
+
+        fake_time = mock.MagicMock()
+        fake_time.monotonic.side_effect = lambda: clock[0]
+        fake_time.sleep.side_effect = sleep
+
+        vsc_req_form = [None] * YCable.VSC_CMD_ATTRIBUTE_LENGTH
+        vsc_req_form[YCable.VSC_BYTE_OPCODE] = YCable.VSC_OPCODE_REG_READ
+        with mock.patch.object(y_cable_credo, 'time', fake_time):
+            assert cable.send_vsc(vsc_req_form, timeout=10) == YCable.MCU_EC_WAIT_VSC_STATUS_TIMEOUT
+
+        # the poll interval backs off exponentially up to the 5ms interval
+        assert sleeps[:5] == [0.0005, 0.001, 0.002, 0.004, 0.005]
+        assert all(seconds == YCable.VSC_POLL_INTERVAL for seconds in sleeps[4:])
+        # the timeout is still counted in 5ms units
+        assert 10 * YCable.VSC_POLL_INTERVAL <= sum(sleeps) < 11 * YCable.VSC_POLL_INTERVAL
+        assert (YCable.VSC_BYTE_STATUS, 12) not in sfp.reads
+
+    def test_read_many(self, cable, sfp):
+        assert cable.tcm_read_many([0x10, 0x20]) == [0x11, 0x21]
+        assert cable.reg_read_many(addr for addr in (0x30, 0x40)) == [0x31, 0x41]
+        assert len(sfp.commands) == 4
+
+    def test_read_many_lock_timeout(self, cable, sfp):
+        @contextmanager
+        def acquire_timeout(timeout):
+            yield False
+
+        with mock.patch.object(cable.rlock, 'acquire_timeout', acquire_timeout):
+            # the callers zip or index the result, so it always has one entry per address
+            assert cable.tcm_read_many([0x10, 0x20, 0x30]) == [YCable.EEPROM_ERROR] * 3
+            assert cable.reg_read_many(iter([0x10, 0x20])) == [YCable.EEPROM_ERROR] * 2
+        assert not sfp.commands
+
+        cable.platform_chassis = None
+        assert cable.tcm_read_many([0x10]) == [YCable.EEPROM_ERROR]
@@ -0,0 +1,172 @@
+import http.server
+import json
+import sys
+import threading
+
+if sys.version_info.major == 3:
+    from unittest import mock
+else:
+    import mock
+
+import pytest
+
+from sonic_y_cable.microsoft.y_cable_simulated import MuxSimulatorSession, YCable
+
+
+class MuxSimulatorHandler(http.server.BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, format, *args):
+        pass
+
+    def setup(self):
+        http.server.BaseHTTPRequestHandler.setup(self)
+        self.server.connections += 1
+
+    def _reply(self, data):
+        body = json.dumps(data).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+        if self.server.close_after_reply:
+            # the client is not told, it finds the connection closed on its next request
+            self.close_connection = True
+
+    def do_GET(self):
+        self.server.requests.append(('GET', self.path))
+        parts = self.path.strip('/').split('/')
+        if len(parts) == 2:
+            self._reply(self.server.mux_status)
+        else:
+            self._reply(self.server.mux_status[parts[2]])
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+        self.server.requests.append(('POST', self.path))
+        status = self.server.mux_status[self.path.strip('/').split('/')[2]]
+        status['active_side'] = body['active_side']
+        self._reply(status)
+
+
+@pytest.fixture
+def mux_simulator(tmp_path):
+    server = http.server.ThreadingHTTPServer(('127.0.0.1', 0), MuxSimulatorHandler)
+    server.daemon_threads = True
+    server.connections = 0
+    server.close_after_reply = False
+    server.requests = []
+    server.mux_status = {str(index): {'active_side': YCable.UPPER_TOR, 'flap_counter': index} for index in range(4)}
+    thread = threading.Thread(target=server.serve_forever, kwargs={'poll_interval': 0.05})
+    thread.daemon = True
+    thread.start()
+
+    config_file = tmp_path / 'mux_simulator.json'
+    config_file.write_text(json.dumps({'server_ip': '127.0.0.1', 'server_port': server.server_address[1],
+                                       'vm_set': 'vms1', 'side': YCable.UPPER_TOR}))
+    port_index_map = {port: (port - 1, 100000) for port in range(1, 5)}
+    with mock.patch.object(YCable, 'MUX_SIMULATOR_CONFIG_FILE', str(config_file)), \
+            mock.patch.object(YCable, '_port_index_map', port_index_map), \
+            mock.patch.object(YCable, '_vmset_status', {}), \
+            mock.patch.object(YCable, '_vmset_status_fetching', {}), \
+            mock.patch.object(YCable, '_vmset_status_generation', {}), \
+            mock.patch.object(MuxSimulatorSession, '_sessions', {}):
+        yield server
+    server.shutdown()
+    server.server_close()
+
+
+class TestYCableSimulated(object):
+    def test_batched_status(self, mux_simulator):
+        cables = [YCable(port, mock.MagicMock()) for port in range(1, 5)]
+        assert [cable.get_mux_direction() for cable in cables] == [YCable.TARGET_TOR_A] * 4
+        assert [cable.get_switch_count_total(YCable.SWITCH_COUNT_MANUAL) for cable in cables] == [0, 1, 2, 3]
+        # one GET of the vm_set served every cable, on one kept-alive connection
+        assert mux_simulator.requests == [('GET', '/mux/vms1')]
+        assert mux_simulator.connections == 1
+
+    def test_invalidate_after_post(self, mux_simulator):
+        cable = YCable(1, mock.MagicMock())
+        assert cable.get_mux_direction() == YCable.TARGET_TOR_A
+        assert cable.toggle_mux_to_tor_b()
+        assert cable.get_mux_direction() == YCable.TARGET_TOR_B
+        assert mux_simulator.requests == [('GET', '/mux/vms1'), ('POST', '/mux/vms1/0'), ('GET', '/mux/vms1')]
+        assert mux_simulator.connections == 1
+
+    def test_ttl(self, mux_simulator):
+        cable = YCable(1, mock.MagicMock())
+        with mock.patch('sonic_y_cable.microsoft.y_cable_simulated.time.monotonic') as mock_monotonic:
+            mock_monotonic.return_value = 1000
+            cable.get_mux_direction()
+            mock_monotonic.return_value = 1000 + YCable.MUX_STATUS_CACHE_TTL / 2.0
+            cable.get_mux_direction()
+            assert len(mux_simulator.requests) == 1
+            mock_monotonic.return_value = 1000 + YCable.MUX_STATUS_CACHE_TTL
+            cable.get_mux_direction()
+        assert mux_simulator.requests == [('GET', '/mux/vms1')] * 2
+
+    def test_reconnect(self, mux_simulator):
+        cable = YCable(1, mock.MagicMock())
+        cable.log_warning = mock.MagicMock()
+        mux_simulator.close_after_reply = True
+        assert cable.get_mux_direction() == YCable.TARGET_TOR_A
+        assert cable.toggle_mux_to_tor_b()
+        assert cable.get_mux_direction() == YCable.TARGET_TOR_B
+        # each request after a close went out again on a new connection
+        assert len(mux_simulator.requests) == 3
+        assert mux_simulator.connections == 3
+        # without going through the retries of failed requests
+        assert not cable.log_warning.called
+
+    def test_failed_fetch_fallback(self, mux_simulator):
+        cables = [YCable(port, mock.MagicMock()) for port in range(1, 3)]
+        original_get = YCable._get
+
+        def get(self, url=None):
+            if url == self._vmset_url:
+                return None
+            return original_get(self, url)
+
+        with mock.patch.object(YCable, '_get', get):
+            # the failed vm_set fetch is not cached, each cable asks for its port alone
+            assert [cable.get_mux_direction() for cable in cables] == [YCable.TARGET_TOR_A] * 2
+        assert mux_simulator.requests == [('GET', '/mux/vms1/0'), ('GET', '/mux/vms1/1')]
+        assert not YCable._vmset_status
+        assert not YCable._vmset_status_fetching
+
+        assert cables[0].get_mux_direction() == YCable.TARGET_TOR_A
+        assert mux_simulator.requests[-1] == ('GET', '/mux/vms1')
+
+    def test_fetch_outside_lock(self, mux_simulator):
+        cables = [YCable(port, mock.MagicMock()) for port in range(1, 4)]
+        fetching = threading.Event()
+        release = threading.Event()
+        original_get = YCable._get
+
+        def get(self, url=None):
+            if url == self._vmset_url:
+                fetching.set()
+                assert release.wait(5)
+            return original_get(self, url)
+
+        results = {}
+
+        def get_mux_direction(cable):
+            results[cable.port] = cable.get_mux_direction()
+
+        with mock.patch.object(YCable, '_get', get):
+            fetcher = threading.Thread(target=get_mux_direction, args=(cables[0],))
+            fetcher.start()
+            assert fetching.wait(5)
+            # a POST is not blocked by the fetch in progress
+            assert cables[2].toggle_mux_to_tor_b()
+            waiter = threading.Thread(target=get_mux_direction, args=(cables[1],))
+            waiter.start()
+            release.set()
+            fetcher.join(5)
+            waiter.join(5)
+
+        assert results == {1: YCable.TARGET_TOR_A, 2: YCable.TARGET_TOR_A}
+        # the fetch overtaken by the POST was not cached
+        assert cables[2].get_mux_direction() == YCable.TARGET_TOR_B
@@ -0,0 +1,77 @@
+import threading
+import time
+
+from sonic_y_cable.y_cable_base import YCableBase
+from sonic_y_cable.y_cable_sweep import sweep_cable_mux_state, sweep_mux_state
+
+
+class FakeCable(object):
+    def __init__(self, port, bus, log, delay=0.05):
+        self.port = port
+        self.bus = bus
+        self.log = log
+        self.delay = delay
+
+    def _query(self, name):
+        self.log.append(('start', self.bus, self.port, name))
+        time.sleep(self.delay)
+        self.log.append(('end', self.bus, self.port, name))
+
+    def get_mux_direction(self):
+        self._query('mux_direction')
+        return YCableBase.TARGET_TOR_A
+
+    def get_active_linked_tor_side(self):
+        self._query('active_linked_tor_side')
+        return YCableBase.TARGET_TOR_B
+
+    def is_link_active(self, target):
+        if target == YCableBase.TARGET_NIC:
+            raise RuntimeError('i2c')
+        self._query('link_active')
+        return True
+
+
+class TestYCableSweep(object):
+    def test_sweep_cable_mux_state(self):
+        state = sweep_cable_mux_state(FakeCable(1, 0, [], delay=0))
+        assert state['mux_direction'] == YCableBase.TARGET_TOR_A
+        assert state['active_linked_tor_side'] == YCableBase.TARGET_TOR_B
+        assert state['link_active'] == {YCableBase.TARGET_TOR_A: True, YCableBase.TARGET_TOR_B: True}
+        assert state['errors'] == {'link_active_{}'.format(YCableBase.TARGET_NIC): "RuntimeError('i2c')"}
+
+    def test_sweep_mux_state_per_bus(self):
+        log = []
+        cables = [FakeCable(port, port % 2, log) for port in range(1, 7)]
+        # a duplicate port is only swept once
+        cables.append(FakeCable(3, 1, log))
+
+        table = sweep_mux_state(cables, lambda cable: cable.bus, max_workers=4)
+        assert sorted(table) == [1, 2, 3, 4, 5, 6]
+        assert all(state['mux_direction'] == YCableBase.TARGET_TOR_A for state in table.values())
+
+        for bus in (0, 1):
+            events = [event for event in log if event[1] == bus]
+            # cables of one bus are queried one at a time, in the order they were given
+            assert all(events[i][0] == 'start' and events[i + 1][0] == 'end' and events[i][2:] == events[i + 1][2:]
+                       for i in range(0, len(events), 2))
+            ports = []
+            for event in events:
+                if not ports or ports[-1] != event[2]:
+                    ports.append(event[2])
+            assert ports == [port for port in range(1, 7) if port % 2 == bus]
+        # the two buses are swept concurrently
+        starts = [i for i, event in enumerate(log) if event[0] == 'start']
+        assert any(log[i + 1][0] == 'start' for i in starts if i + 1 < len(log))
+
+    def test_sweep_mux_state_serial(self):
+        log = []
+        cables = [FakeCable(port, port, log, delay=0) for port in range(1, 4)]
+        threads = set()
+        for cable in cables:
+            cable.get_mux_direction = lambda: threads.add(threading.current_thread().name)
+
+        assert sorted(sweep_mux_state(cables, lambda cable: cable.bus, max_workers=1)) == [1, 2, 3]
+        # a single worker sweeps the buses in the calling thread
+        assert threads == {threading.current_thread().name}
+        assert sweep_mux_state([], lambda cable: cable.bus) == {}
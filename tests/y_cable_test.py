@@ -0,0 +1,98 @@
+import sys
+import threading
+import time
+import types
+
+if sys.version_info.major == 3:
+    from unittest import mock
+else:
+    import mock
+
+import pytest
+
+from sonic_y_cable import y_cable
+
+
+@pytest.fixture(autouse=True)
+def reset_hooks():
+    y_cable.y_cable_hooks.clear()
+    y_cable.y_cable_hooks_loaded = False
+    yield
+    y_cable.y_cable_hooks.clear()
+    y_cable.y_cable_hooks_loaded = False
+
+
+def simulator_client(**funcs):
+    module = types.ModuleType('y_cable_simulator_client')
+    for name, func in funcs.items():
+        setattr(module, name, func)
+    return module
+
+
+class TestYCableHooks(object):
+    def test_lazy_load(self):
+        toggle = mock.MagicMock(return_value='simulated')
+        with mock.patch.dict(sys.modules, {'y_cable_simulator_client': simulator_client(toggle_mux_to_torA=toggle)}):
+            assert not y_cable.y_cable_hooks_loaded
+            assert y_cable.toggle_mux_to_torA(1) == 'simulated'
+            toggle.assert_called_once_with(1)
+            assert y_cable.y_cable_hooks_loaded
+            assert list(y_cable.y_cable_hooks) == ['toggle_mux_to_torA']
+
+    def test_no_simulator(self):
+        # a None entry makes the import fail
+        with mock.patch.dict(sys.modules, {'y_cable_simulator_client': None}):
+            # no chassis is loaded here, the driver function fails
+            assert y_cable.toggle_mux_to_torA(1) is False
+            assert y_cable.y_cable_hooks_loaded
+
+        # the failed import is not retried by the driver functions, only by an explicit reload
+        toggle = mock.MagicMock(return_value='simulated')
+        with mock.patch.dict(sys.modules, {'y_cable_simulator_client': simulator_client(toggle_mux_to_torA=toggle)}):
+            assert y_cable.toggle_mux_to_torA(1) is False
+            assert y_cable.load_y_cable_simulator_hooks()
+            assert y_cable.toggle_mux_to_torA(1) == 'simulated'
+
+    def test_register_y_cable_hook(self):
+        simulated = mock.MagicMock(return_value='simulated')
+        registered = mock.MagicMock(return_value='registered')
+        with mock.patch.dict(sys.modules, {'y_cable_simulator_client': simulator_client(toggle_mux_to_torA=simulated)}):
+            with pytest.raises(ValueError):
+                y_cable.register_y_cable_hook('not_a_y_cable_function', registered)
+
+            # registering loads the simulator first so that it does not replace the hook later
+            y_cable.register_y_cable_hook('toggle_mux_to_torA', registered)
+            y_cable.register_y_cable_hook('toggle_mux_to_torB', registered)
+            assert y_cable.toggle_mux_to_torA(1) == 'registered'
+            assert y_cable.toggle_mux_to_torB(1) == 'registered'
+            simulated.assert_not_called()
+
+            y_cable.unregister_y_cable_hook('toggle_mux_to_torA')
+            assert y_cable.toggle_mux_to_torA(1) is False
+            assert y_cable.toggle_mux_to_torB(1) == 'registered'
+            y_cable.unregister_y_cable_hook()
+            assert not y_cable.y_cable_hooks
+
+    def test_concurrent_first_call(self):
+        loading = threading.Event()
+
+        class SlowSimulatorClient(types.ModuleType):
+            @property
+            def toggle_mux_to_torA(self):
+                loading.set()
+                time.sleep(0.2)
+                return lambda physical_port: 'simulated'
+
+        results = []
+
+        def call():
+            results.append(y_cable.toggle_mux_to_torA(1))
+
+        with mock.patch.dict(sys.modules, {'y_cable_simulator_client': SlowSimulatorClient('y_cable_simulator_client')}):
+            first = threading.Thread(target=call)
+            first.start()
+            assert loading.wait(5)
+            # the second caller waits for the hooks instead of calling the driver function
+            call()
+            first.join()
+        assert results == ['simulated', 'simulated']
@@ -0,0 +1,148 @@
+import sys
+import threading
+
+if sys.version_info.major == 3:
+    from unittest import mock
+else:
+    import mock
+
+import pytest
+
+from sonic_y_cable import y_cable_trace
+from sonic_y_cable.y_cable_trace import (TRACE_API, TRACE_EEPROM_READ, TRACE_EEPROM_WRITE, TRACE_LOCK_HOLD,
+                                         TRACE_LOCK_WAIT, TRACE_MCU_CMD, TracedSfp, get_trace_stats, record,
+                                         reset_trace_stats, trace_chassis, trace_y_cable_apis)
+
+
+@pytest.fixture(autouse=True)
+def trace_stats():
+    with mock.patch.object(y_cable_trace, 'y_cable_trace_stats', {}):
+        yield
+
+
+@trace_y_cable_apis
+class FakeCable(object):
+    def __init__(self, port):
+        self.port = port
+
+    def get_mux_direction(self):
+        record(self.port, TRACE_LOCK_WAIT, 'lock', 0.5)
+        record(self.port, TRACE_LOCK_HOLD, 'lock', 2.0)
+        return self.get_read_side()
+
+    def get_read_side(self):
+        record(self.port, TRACE_MCU_CMD, 'cable_cmd_1', 1.0)
+        record(self.port, TRACE_EEPROM_READ, 'read_eeprom', 0.25, size=4)
+        return 1
+
+    def reset(self, target):
+        raise RuntimeError('i2c')
+
+    def not_traced(self):
+        record(self.port, TRACE_EEPROM_READ, 'read_eeprom', 0.25)
+
+
+class TestYCableTrace(object):
+    def test_decorator(self):
+        assert FakeCable.get_mux_direction.__name__ == 'get_mux_direction'
+        assert not hasattr(FakeCable.not_traced, '__wrapped__')
+        cable = FakeCable(1)
+        cable.not_traced()
+        with pytest.raises(RuntimeError):
+            cable.reset(0)
+        stats = get_trace_stats(1)[1]
+        assert set(stats[TRACE_API]) == {'reset'}
+        assert stats[TRACE_API]['reset']['errors'] == 1
+        assert stats[TRACE_API]['reset']['last_breakdown'] == {}
+
+    def test_breakdown_nesting(self):
+        cable = FakeCable(1)
+        assert cable.get_mux_direction() == 1
+        assert cable.get_read_side() == 1
+
+        apis = get_trace_stats(1)[1][TRACE_API]
+        # the inner call adds to the breakdown of the outer one, the lock hold and API times do not
+        assert apis['get_mux_direction']['last_breakdown'] == {TRACE_LOCK_WAIT: 0.5, TRACE_MCU_CMD: 1.0,
+                                                              TRACE_EEPROM_READ: 0.25}
+        assert apis['get_read_side']['count'] == 2
+        assert apis['get_read_side']['breakdown'] == {TRACE_MCU_CMD: 2.0, TRACE_EEPROM_READ: 0.5}
+        assert apis['get_read_side']['last_breakdown'] == {TRACE_MCU_CMD: 1.0, TRACE_EEPROM_READ: 0.25}
+
+        reads = get_trace_stats(1, categories=(TRACE_EEPROM_READ,))[1]
+        assert list(reads) == [TRACE_EEPROM_READ]
+        assert reads[TRACE_EEPROM_READ]['read_eeprom']['bytes'] == 8
+        assert reads[TRACE_EEPROM_READ]['read_eeprom']['avg_time'] == 0.25
+
+        # outside of an API call nothing is accounted to a breakdown
+        record(1, TRACE_EEPROM_READ, 'read_eeprom', 1.0)
+        assert get_trace_stats(1)[1][TRACE_API]['get_read_side']['breakdown'][TRACE_EEPROM_READ] == 0.5
+
+    def test_reset(self):
+        cables = [FakeCable(1), FakeCable(2)]
+        for cable in cables:
+            cable.get_read_side()
+
+        stats = get_trace_stats(1, reset=True, categories=(TRACE_MCU_CMD,))
+        assert stats[1][TRACE_MCU_CMD]['cable_cmd_1']['count'] == 1
+        assert get_trace_stats(1, categories=(TRACE_MCU_CMD,)) == {}
+        # the other categories and ports are kept
+        assert TRACE_EEPROM_READ in get_trace_stats(1)[1]
+        assert set(get_trace_stats()) == {1, 2}
+
+        reset_trace_stats(1)
+        assert set(get_trace_stats()) == {2}
+        reset_trace_stats()
+        assert get_trace_stats() == {}
+        assert get_trace_stats(3) == {}
+
+    def test_concurrent_ports(self):
+        def run(port):
+            for _ in range(200):
+                record(port, TRACE_EEPROM_READ, 'read_eeprom', 0.001, size=1)
+
+        threads = [threading.Thread(target=run, args=(port,)) for port in range(4) for _ in range(2)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(5)
+        stats = get_trace_stats()
+        assert sorted(stats) == [0, 1, 2, 3]
+        assert all(stats[port][TRACE_EEPROM_READ]['read_eeprom']['count'] == 400 for port in stats)
+
+    def test_disabled(self):
+        y_cable_trace.set_tracing_enabled(False)
+        try:
+            FakeCable(1).get_mux_direction()
+        finally:
+            y_cable_trace.set_tracing_enabled(True)
+        assert get_trace_stats() == {}
+
+    def test_traced_chassis(self):
+        chassis = mock.MagicMock()
+        sfp = mock.MagicMock()
+        sfp.read_eeprom.return_value = bytearray(2)
+        sfp.write_eeprom.return_value = False
+        chassis.get_sfp.return_value = sfp
+
+        traced = trace_chassis(chassis)
+        assert trace_chassis(traced) is traced
+        assert trace_chassis(None) is None
+        traced_sfp = traced.get_sfp(1)
+        assert isinstance(traced_sfp, TracedSfp)
+        assert traced.get_sfp(1) is traced_sfp
+        assert traced_sfp.read_eeprom(0, 2) == bytearray(2)
+        assert traced_sfp.write_eeprom(0, 1, bytearray(1)) is False
+        assert traced_sfp.get_presence is sfp.get_presence
+
+        stats = get_trace_stats(1)[1]
+        assert stats[TRACE_EEPROM_READ]['read_eeprom']['bytes'] == 2
+        assert stats[TRACE_EEPROM_WRITE]['write_eeprom']['errors'] == 1
+
+        # a new sfp object, e.g. after a transceiver change, is wrapped again
+        new_sfp = mock.MagicMock()
+        chassis.get_sfp.return_value = new_sfp
+        assert traced.get_sfp(1)._sfp is new_sfp
+        chassis.get_sfp.return_value = None
+        assert traced.get_sfp(1) is None
+        chassis.get_sfp.return_value = new_sfp
+        assert traced.get_sfp(1)._sfp is new_sfp
@@ -0,0 +1,82 @@
+import sys
+import threading
+import time
+
+if sys.version_info.major == 3:
+    from unittest import mock
+else:
+    import mock
+
+from sonic_y_cable.y_cable_base import YCableBase
+from sonic_y_cable.y_cable_upgrade import download_firmware_parallel, get_download_firmware_progress
+
+
+class FakeCable(object):
+    def __init__(self, port, error=None):
+        self.port = port
+        self.error = error
+        self.download_firmware_status = YCableBase.FIRMWARE_DOWNLOAD_STATUS_NOT_INITIATED_OR_FINISHED
+        self.download_firmware_progress = 0
+        self.fwfiles = []
+        self.threads = set()
+        self.log_error = mock.MagicMock()
+
+    def download_firmware(self, fwfile):
+        self.fwfiles.append(fwfile)
+        self.threads.add(threading.current_thread().name)
+        self.download_firmware_status = YCableBase.FIRMWARE_DOWNLOAD_STATUS_INPROGRESS
+        for progress in (25, 50, 75):
+            time.sleep(0.05)
+            if self.error is not None and progress == 50:
+                raise self.error
+            self.download_firmware_progress = progress
+        self.download_firmware_progress = 100
+        self.download_firmware_status = YCableBase.FIRMWARE_DOWNLOAD_STATUS_NOT_INITIATED_OR_FINISHED
+        return YCableBase.FIRMWARE_DOWNLOAD_SUCCESS
+
+
+class TestDownloadFirmwareParallel(object):
+    def test_progress_and_errors(self):
+        cables = [FakeCable(1), FakeCable(2, RuntimeError('i2c')), FakeCable(3)]
+        reports = []
+
+        results = download_firmware_parallel(cables, 'fw.bin', progress_callback=reports.append,
+                                             progress_interval=0.04)
+        assert results == {1: YCableBase.FIRMWARE_DOWNLOAD_SUCCESS,
+                           2: YCableBase.FIRMWARE_DOWNLOAD_FAILURE,
+                           3: YCableBase.FIRMWARE_DOWNLOAD_SUCCESS}
+        assert all(cable.fwfiles == ['fw.bin'] for cable in cables)
+        # the cables are upgraded concurrently, a failure does not stop the others
+        assert len(set.union(*(cable.threads for cable in cables))) == 3
+        cables[1].log_error.assert_called_once()
+        assert 'i2c' in cables[1].log_error.call_args[0][0]
+
+        # intermediate progress was reported, and the final state once all downloads ended
+        assert len(reports) > 1
+        assert any(0 < report[1][1] < 100 for report in reports[:-1])
+        assert reports[-1] == {1: (YCableBase.FIRMWARE_DOWNLOAD_STATUS_NOT_INITIATED_OR_FINISHED, 100),
+                               2: (YCableBase.FIRMWARE_DOWNLOAD_STATUS_INPROGRESS, 25),
+                               3: (YCableBase.FIRMWARE_DOWNLOAD_STATUS_NOT_INITIATED_OR_FINISHED, 100)}
+        assert reports[-1] == get_download_firmware_progress(cables)
+
+    def test_max_workers(self):
+        cables = [FakeCable(port) for port in range(4)]
+        active = []
+        lock = threading.Lock()
+        peak = [0]
+
+        def download_firmware(cable, fwfile):
+            with lock:
+                active.append(cable.port)
+                peak[0] = max(peak[0], len(active))
+            time.sleep(0.05)
+            with lock:
+                active.remove(cable.port)
+            return YCableBase.FIRMWARE_DOWNLOAD_SUCCESS
+
+        for cable in cables:
+            cable.download_firmware = lambda fwfile, cable=cable: download_firmware(cable, fwfile)
+        results = download_firmware_parallel(cables, 'fw.bin', max_workers=2)
+        assert sorted(results) == [0, 1, 2, 3]
+        assert peak[0] == 2
+        assert download_firmware_parallel([], 'fw.bin') == {}